@@ -0,0 +1,86 @@
+"""
+Agent Registry for EduAI Platform
+Imports and builds each agent on first use, so the server starts without compiling every workflow
+"""
+import time
+import asyncio
+import importlib
+import threading
+from typing import Dict, List, Any, Iterator, Optional
+from .metrics import record_agent_load
+
+class AgentRegistry:
+    """Lazy mapping of agent type to agent instance, built from "module:Class" specs"""
+
+    def __init__(self, specs: Dict[str, str]):
+        self.specs = dict(specs)
+        self._agents: Dict[str, Any] = {}
+        self._locks = {name: threading.Lock() for name in self.specs}
+        self._profile: Dict[str, Dict[str, float]] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def keys(self) -> List[str]:
+        return list(self.specs)
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the agent, importing and building it in the calling thread if needed"""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        if name not in self.specs:
+            raise KeyError(name)
+
+        with self._locks[name]:
+            if name not in self._agents:
+                self._agents[name] = self._build(name)
+        return self._agents[name]
+
+    async def load(self, name: str) -> Any:
+        """Return the agent, building it off the event loop the first time"""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        return await asyncio.to_thread(self.__getitem__, name)
+
+    def _build(self, name: str) -> Any:
+        module_path, class_name = self.specs[name].split(":")
+
+        # The first agent loaded also pays for the shared langchain/langgraph imports
+        started = time.perf_counter()
+        agent_class = getattr(importlib.import_module(module_path), class_name)
+        imported = time.perf_counter()
+        agent = agent_class()
+        built = time.perf_counter()
+
+        self._profile[name] = {
+            "import_ms": round((imported - started) * 1000, 2),
+            "build_ms": round((built - imported) * 1000, 2)
+        }
+        record_agent_load(name, imported - started, built - imported)
+        print(f"🧩 Loaded {name} agent: import {self._profile[name]['import_ms']:.0f} ms, "
+              f"build {self._profile[name]['build_ms']:.0f} ms")
+        return agent
+
+    async def prewarm(self, names: Optional[List[str]] = None) -> int:
+        """Build agents one at a time in a worker thread so requests keep being served"""
+        loaded = 0
+        for name in names or self.keys():
+            if name not in self._agents:
+                await self.load(name)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registered": len(self.specs),
+            "loaded": sorted(self._agents),
+            "load_profile": dict(self._profile)
+        }
@@ -5,11 +5,21 @@ Creates augmented reality learning experiences and 3D educational content
 from typing import Dict, List, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from .base_agent import BaseEducationalAgent, AgentState
+from .base_agent import BaseEducationalAgent, FusedExecutionMixin, AgentState
+from .llm_registry import LIGHT_PROFILE
 
-class ARIntegrationAgent(BaseEducationalAgent):
+class ARIntegrationAgent(FusedExecutionMixin, BaseEducationalAgent):
     """Agent for creating AR learning experiences and 3D educational content"""
     
+    # Sections produced in one call when execution_mode is "fast"
+    fused_sections = [
+        ("ar_potential_assessment", "AR learning potential: concepts benefiting from 3D visualization, spatial learning and interactive manipulation opportunities, engagement and technical feasibility"),
+        ("ar_experience_design", "AR experience design: learning journey, scenes, narrative, multi-grade adaptations and cultural context"),
+        ("model_specifications", "3D models and assets: model list, level of detail, annotations, animations and performance constraints for low-end devices"),
+        ("interaction_design", "User interaction design: gestures, controls, guided exploration, feedback and accessibility alternatives"),
+        ("implementation_strategy", "Implementation strategy: platform and device requirements, phases, testing, teacher training, student onboarding and maintenance")
+    ]
+    
     def __init__(self):
         super().__init__("AR Integration & 3D Learning")
 
@@ -31,12 +41,12 @@ class ARIntegrationAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the AR integration workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
         workflow.add_node("analyze_context", self._analyze_context)
-        workflow.add_node("assess_ar_potential", self._assess_ar_potential)
+        workflow.add_node("assess_ar_potential", self._assess_ar_potential, profile=LIGHT_PROFILE)
         workflow.add_node("design_ar_experience", self._design_ar_experience)
         workflow.add_node("specify_3d_models", self._specify_3d_models)
         workflow.add_node("create_interaction_design", self._create_interaction_design)
@@ -46,7 +56,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
         workflow.set_entry_point("initialize")
         workflow.add_edge("initialize", "validate")
         workflow.add_edge("validate", "analyze_context")
-        workflow.add_edge("analyze_context", "assess_ar_potential")
+        self._add_execution_modes(workflow, first_step="assess_ar_potential")
         workflow.add_edge("assess_ar_potential", "design_ar_experience")
         workflow.add_edge("design_ar_experience", "specify_3d_models")
         workflow.add_edge("specify_3d_models", "create_interaction_design")
@@ -56,7 +66,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _assess_ar_potential(self, state: AgentState) -> AgentState:
+    async def _assess_ar_potential(self, state: AgentState) -> AgentState:
         """Assess AR learning potential for the content"""
         ar_assessment_prompt = f"""
         Assess AR learning potential:
@@ -80,7 +90,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
             HumanMessage(content=ar_assessment_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["ar_potential_assessment"] = response.content
         
         state.workflow_steps.append({
@@ -91,11 +101,11 @@ class ARIntegrationAgent(BaseEducationalAgent):
         
         return state
 
-    def _design_ar_experience(self, state: AgentState) -> AgentState:
+    async def _design_ar_experience(self, state: AgentState) -> AgentState:
         """Design comprehensive AR learning experience"""
         ar_design_prompt = f"""
         Design AR learning experience:
-        AR Assessment: {state.metadata.get('ar_potential_assessment', '')}
+        AR Assessment: {self._context(state, 'ar_potential_assessment')}
         Educational Content: {state.prompt}
         Target Grades: {state.grades}
         
@@ -115,7 +125,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
             HumanMessage(content=ar_design_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["ar_experience_design"] = response.content
         
         state.workflow_steps.append({
@@ -126,11 +136,11 @@ class ARIntegrationAgent(BaseEducationalAgent):
         
         return state
 
-    def _specify_3d_models(self, state: AgentState) -> AgentState:
+    async def _specify_3d_models(self, state: AgentState) -> AgentState:
         """Specify 3D models and assets requirements"""
         model_specification_prompt = f"""
         Specify 3D models and assets:
-        AR Experience Design: {state.metadata.get('ar_experience_design', '')}
+        AR Experience Design: {self._context(state, 'ar_experience_design')}
         Educational Content: {state.prompt}
         
         3D Model Specifications:
@@ -149,7 +159,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
             HumanMessage(content=model_specification_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["model_specifications"] = response.content
         
         state.workflow_steps.append({
@@ -160,12 +170,12 @@ class ARIntegrationAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_interaction_design(self, state: AgentState) -> AgentState:
+    async def _create_interaction_design(self, state: AgentState) -> AgentState:
         """Create user interaction design for AR experience"""
         interaction_design_prompt = f"""
         Create interaction design:
-        AR Experience: {state.metadata.get('ar_experience_design', '')}
-        3D Models: {state.metadata.get('model_specifications', '')}
+        AR Experience: {self._context(state, 'ar_experience_design')}
+        3D Models: {self._context(state, 'model_specifications')}
         Target Grades: {state.grades}
         
         Interaction Design:
@@ -184,7 +194,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
             HumanMessage(content=interaction_design_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["interaction_design"] = response.content
         
         state.workflow_steps.append({
@@ -195,12 +205,12 @@ class ARIntegrationAgent(BaseEducationalAgent):
         
         return state
 
-    def _plan_implementation(self, state: AgentState) -> AgentState:
+    async def _plan_implementation(self, state: AgentState) -> AgentState:
         """Plan implementation strategy and technical requirements"""
         implementation_prompt = f"""
         Plan AR implementation strategy:
-        Complete AR Design: {state.metadata.get('ar_experience_design', '')}
-        Interaction Design: {state.metadata.get('interaction_design', '')}
+        Complete AR Design: {self._context(state, 'ar_experience_design')}
+        Interaction Design: {self._context(state, 'interaction_design')}
         Target Grades: {state.grades}
         
         Implementation Planning:
@@ -219,8 +229,19 @@ class ARIntegrationAgent(BaseEducationalAgent):
             HumanMessage(content=implementation_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
+        self._compile_result(state, response.content)
+        
+        state.workflow_steps.append({
+            "step": "implementation_planning",
+            "status": "completed",
+            "message": "Complete AR learning system with implementation plan created"
+        })
         
+        return state
+
+    def _compile_result(self, state: AgentState, final_section: str) -> None:
+        """Assemble the final package from the earlier sections and the last one"""
         # Compile comprehensive AR learning system
         final_ar_system = f"""
         AUGMENTED REALITY LEARNING SYSTEM
@@ -242,7 +263,7 @@ class ARIntegrationAgent(BaseEducationalAgent):
         {state.metadata.get('interaction_design', '')}
         
         IMPLEMENTATION STRATEGY:
-        {response.content}
+        {final_section}
         
         EDUCATIONAL INTEGRATION GUIDELINES:
         1. Align AR experiences with curriculum objectives
@@ -279,11 +300,3 @@ class ARIntegrationAgent(BaseEducationalAgent):
                 "accessibility_considered": True
             }
         }
-        
-        state.workflow_steps.append({
-            "step": "implementation_planning",
-            "status": "completed",
-            "message": "Complete AR learning system with implementation plan created"
-        })
-        
-        return state
\ No newline at end of file
@@ -5,11 +5,19 @@ Evaluates reading and speaking skills through voice analysis
 from typing import Dict, List, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from .base_agent import BaseEducationalAgent, AgentState
+from .base_agent import BaseEducationalAgent, FusedExecutionMixin, AgentState
 
-class AudioAssessmentAgent(BaseEducationalAgent):
+class AudioAssessmentAgent(FusedExecutionMixin, BaseEducationalAgent):
     """Agent for audio-based reading and speaking assessment"""
     
+    # Sections produced in one call when execution_mode is "fast"
+    fused_sections = [
+        ("assessment_criteria", "Assessment criteria and standards: fluency, accuracy, pronunciation, expression and comprehension benchmarks for each grade and language"),
+        ("audio_requirements", "Technical and pedagogical requirements: recording setup, audio quality, reading passages, and language-specific pronunciation considerations"),
+        ("assessment_rubric", "Comprehensive assessment rubric: scoring levels, descriptors and grade-wise expectations for each criterion"),
+        ("feedback_framework", "Personalized feedback framework: feedback templates, strength recognition, improvement areas, next steps, parent communication and student self-assessment tools")
+    ]
+    
     def __init__(self):
         super().__init__("Audio Reading Assessment")
 
@@ -31,13 +39,15 @@ class AudioAssessmentAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the audio assessment workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
         workflow.add_node("analyze_context", self._analyze_context)
-        workflow.add_node("setup_assessment_criteria", self._setup_assessment_criteria)
-        workflow.add_node("analyze_audio_requirements", self._analyze_audio_requirements)
+        workflow.add_node("setup_assessment_criteria", self._setup_assessment_criteria,
+                          memo_key=("prompt", "grades", "languages"))
+        workflow.add_node("analyze_audio_requirements", self._analyze_audio_requirements,
+                          memo_key=("metadata.assessment_criteria", "grades", "languages"))
         workflow.add_node("create_assessment_rubric", self._create_assessment_rubric)
         workflow.add_node("generate_feedback_framework", self._generate_feedback_framework)
         workflow.add_node("finalize", self._finalize_result)
@@ -45,7 +55,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         workflow.set_entry_point("initialize")
         workflow.add_edge("initialize", "validate")
         workflow.add_edge("validate", "analyze_context")
-        workflow.add_edge("analyze_context", "setup_assessment_criteria")
+        self._add_execution_modes(workflow, first_step="setup_assessment_criteria")
         workflow.add_edge("setup_assessment_criteria", "analyze_audio_requirements")
         workflow.add_edge("analyze_audio_requirements", "create_assessment_rubric")
         workflow.add_edge("create_assessment_rubric", "generate_feedback_framework")
@@ -54,7 +64,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _setup_assessment_criteria(self, state: AgentState) -> AgentState:
+    async def _setup_assessment_criteria(self, state: AgentState) -> AgentState:
         """Setup assessment criteria for audio evaluation"""
         criteria_prompt = f"""
         Setup audio assessment criteria:
@@ -78,7 +88,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
             HumanMessage(content=criteria_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["assessment_criteria"] = response.content
         
         state.workflow_steps.append({
@@ -89,11 +99,11 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         
         return state
 
-    def _analyze_audio_requirements(self, state: AgentState) -> AgentState:
+    async def _analyze_audio_requirements(self, state: AgentState) -> AgentState:
         """Analyze technical and pedagogical audio requirements"""
         audio_analysis_prompt = f"""
         Analyze audio assessment requirements:
-        Assessment Criteria: {state.metadata.get('assessment_criteria', '')}
+        Assessment Criteria: {self._context(state, 'assessment_criteria')}
         Grades: {state.grades}
         Languages: {state.languages}
         
@@ -113,7 +123,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
             HumanMessage(content=audio_analysis_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["audio_requirements"] = response.content
         
         state.workflow_steps.append({
@@ -124,12 +134,12 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_assessment_rubric(self, state: AgentState) -> AgentState:
+    async def _create_assessment_rubric(self, state: AgentState) -> AgentState:
         """Create detailed assessment rubric"""
         rubric_prompt = f"""
         Create comprehensive assessment rubric:
-        Assessment Criteria: {state.metadata.get('assessment_criteria', '')}
-        Audio Requirements: {state.metadata.get('audio_requirements', '')}
+        Assessment Criteria: {self._context(state, 'assessment_criteria')}
+        Audio Requirements: {self._context(state, 'audio_requirements')}
         Target Grades: {state.grades}
         
         Rubric Creation:
@@ -148,7 +158,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
             HumanMessage(content=rubric_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["assessment_rubric"] = response.content
         
         state.workflow_steps.append({
@@ -159,11 +169,11 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         
         return state
 
-    def _generate_feedback_framework(self, state: AgentState) -> AgentState:
+    async def _generate_feedback_framework(self, state: AgentState) -> AgentState:
         """Generate personalized feedback framework"""
         feedback_prompt = f"""
         Generate personalized feedback framework:
-        Assessment Rubric: {state.metadata.get('assessment_rubric', '')}
+        Assessment Rubric: {self._context(state, 'assessment_rubric')}
         Target Grades: {state.grades}
         Languages: {state.languages}
         
@@ -183,8 +193,19 @@ class AudioAssessmentAgent(BaseEducationalAgent):
             HumanMessage(content=feedback_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
+        self._compile_result(state, response.content)
+        
+        state.workflow_steps.append({
+            "step": "feedback_framework_generation",
+            "status": "completed",
+            "message": "Complete audio assessment system with feedback framework created"
+        })
         
+        return state
+
+    def _compile_result(self, state: AgentState, final_section: str) -> None:
+        """Assemble the final package from the earlier sections and the last one"""
         # Compile comprehensive audio assessment system
         final_assessment_system = f"""
         AUDIO READING ASSESSMENT SYSTEM
@@ -203,7 +224,7 @@ class AudioAssessmentAgent(BaseEducationalAgent):
         {state.metadata.get('assessment_rubric', '')}
         
         PERSONALIZED FEEDBACK FRAMEWORK:
-        {response.content}
+        {final_section}
         
         IMPLEMENTATION GUIDELINES:
         1. Ensure quiet recording environment
@@ -232,11 +253,3 @@ class AudioAssessmentAgent(BaseEducationalAgent):
                 "multilingual_capable": True
             }
         }
-        
-        state.workflow_steps.append({
-            "step": "feedback_framework_generation",
-            "status": "completed",
-            "message": "Complete audio assessment system with feedback framework created"
-        })
-        
-        return state
\ No newline at end of file
@@ -3,43 +3,126 @@ Base Agent Class for EduAI Platform
 Common functionality and interfaces for all educational agents
 """
 import os
-from typing import Dict, List, Any, Optional
+import re
+import json
+import time
+import uuid
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Callable, Awaitable, AsyncIterator, Annotated, Tuple, Sequence
 from .ncert_integration import get_ncert_context, validate_content_alignment
 from abc import ABC, abstractmethod
-from langchain_google_genai import ChatGoogleGenerativeAI
+from .llm_registry import (
+    get_llm, ModelProfile, current_model_profile, DEFAULT_MODEL, DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS
+)
+from .response_cache import get_response_cache, make_cache_key, get_node_memo, make_node_memo_key
+from .llm_store import get_llm_store, make_store_key, bypass_llm_store
+from .metrics import (
+    NodeStats, current_node_stats, estimate_tokens, record_llm_call, record_node_metrics, record_cache_lookup,
+    record_context_compaction
+)
+from .context_compaction import (
+    DEFAULT_CONTEXT_TOKENS, current_context_budget, compact_text, compact_sections, render_value
+)
+from .llm_scheduler import get_llm_scheduler
+from .llm_resilience import get_llm_call_policy
+from .checkpointing import get_checkpointer
+from .shared_state import get_shared_backend
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, END
-from langgraph.graph.message import MessagesState
-from pydantic import BaseModel
+from langgraph.graph.message import add_messages
+from pydantic import BaseModel, Field
 
-class AgentState(MessagesState):
+def merge_metadata(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge metadata written by parallel workflow branches"""
+    return {**(left or {}), **(right or {})}
+
+def merge_workflow_steps(left: List[Dict[str, Any]], right: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Append workflow steps from parallel branches without repeating shared history
+    
+    Each branch hands back the history it started from plus its own steps. Steps are matched
+    on their id (node name and position), so identical steps from two branches both survive.
+    """
+    left = left or []
+    seen = {step["id"] for step in left if "id" in step}
+    return left + [step for step in (right or []) if "id" not in step or step["id"] not in seen]
+
+class AgentState(BaseModel):
     """State model for all agents"""
+    messages: Annotated[List[AnyMessage], add_messages] = Field(default_factory=list)
     prompt: str
     grades: List[int]
     languages: List[str]
     content_source: str
-    metadata: Dict[str, Any]
+    metadata: Annotated[Dict[str, Any], merge_metadata]
     result: Optional[Dict[str, Any]] = None
-    workflow_steps: List[Dict[str, str]] = []
+    workflow_steps: Annotated[List[Dict[str, Any]], merge_workflow_steps] = Field(default_factory=list)
     current_step: int = 0
+    # Metadata keys supplied with the request, as opposed to outputs written by nodes
+    input_keys: List[str] = Field(default_factory=list)
+
+    def __getitem__(self, key: str) -> Any:
+        """Allow the dict-style access used by some workflows"""
+        return getattr(self, key)
+
+class AgentWorkflow(StateGraph):
+    """StateGraph that instruments every node registered on it"""
+
+    def __init__(self, agent: "BaseEducationalAgent"):
+        super().__init__(AgentState)
+        self.agent = agent
+
+    def add_node(self, node: Any, action: Any = None, profile: Optional[ModelProfile] = None,
+                 memo_key: Optional[Sequence[str]] = None, **kwargs: Any) -> Any:
+        """Register a node; profile picks the model and limits for its LLM calls
+        
+        memo_key names the only inputs the node's output depends on: state fields such as
+        "prompt" or "grades", or "metadata.<key>" for an upstream node's output. The node's
+        output is then memoized across requests that agree on those inputs.
+        """
+        if isinstance(node, str) and action is not None:
+            action = self.agent._instrument_node(node, action, profile, memo_key)
+        return super().add_node(node, action, **kwargs)
+
+    def compile(self, *args: Any, **kwargs: Any) -> Any:
+        """Compile with the shared checkpointer so failed runs can resume"""
+        if not args:
+            kwargs.setdefault("checkpointer", get_checkpointer())
+        return super().compile(*args, **kwargs)
 
 class BaseEducationalAgent(ABC):
     """Base class for all educational agents in the EduAI platform"""
     
-    def __init__(self, agent_name: str):
+    # Per-agent generation overrides layered on the shared client
+    model: str = DEFAULT_MODEL
+    temperature: float = DEFAULT_TEMPERATURE
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    
+    # Upper bound on concurrent LLM calls within a single fan-out node
+    fanout_concurrency: int = int(os.getenv("AGENT_FANOUT_CONCURRENCY", "4"))
+    
+    # Per-node overrides of the token budget for each upstream output pasted into a prompt
+    context_budgets: Dict[str, int] = {}
+    
+    # How long a run holds its checkpoint thread before a crashed worker's thread can be resumed
+    checkpoint_lease_seconds: float = float(os.getenv("AGENT_CHECKPOINT_LEASE_SECONDS", "900"))
+    
+    def __init__(self, agent_name: str, temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None):
         self.agent_name = agent_name
+        if temperature is not None:
+            self.temperature = temperature
+        if max_tokens is not None:
+            self.max_tokens = max_tokens
         self.supported_languages = [
             "English", "Hindi", "Tamil", "Telugu", "Marathi", 
             "Bengali", "Gujarati", "Kannada", "Odia", "Punjabi"
         ]
         self.supported_grades = list(range(1, 13))  # Grades 1-12
         
-        # Initialize Gemini model
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=os.getenv("GEMINI_API_KEY"),
-            temperature=0.7,
-            max_tokens=4000
-        )
+        # Use the shared, pooled Gemini client
+        self.llm = get_llm(self.model, self.temperature, self.max_tokens)
         
         # Build the graph
         self.graph = self._build_graph()
@@ -54,6 +137,217 @@ class BaseEducationalAgent(ABC):
         """Build the LangGraph workflow for this agent"""
         pass
 
+    def _create_workflow(self) -> AgentWorkflow:
+        """Create a workflow graph whose nodes record timing and LLM usage"""
+        return AgentWorkflow(self)
+
+    def _instrument_node(self, name: str, node: Callable, profile: Optional[ModelProfile] = None,
+                         memo_key: Optional[Sequence[str]] = None) -> Callable:
+        """Wrap a node with its model profile and timing, token and cache instrumentation"""
+        if memo_key:
+            node = self._memoize_node(name, node, memo_key)
+        
+        async def run(state: AgentState) -> Any:
+            stats = NodeStats()
+            stats_token = current_node_stats.set(stats)
+            profile_token = current_model_profile.set(profile)
+            budget_token = current_context_budget.set(self.context_budgets.get(name))
+            steps_before = len(state.workflow_steps)
+            started = time.perf_counter()
+            status = "failed"
+            try:
+                result = node(state)
+                if inspect.isawaitable(result):
+                    result = await result
+                status = "completed"
+            except asyncio.CancelledError:
+                # The client went away; the node's LLM calls are cancelled with it
+                status = "cancelled"
+                raise
+            finally:
+                duration = time.perf_counter() - started
+                current_node_stats.reset(stats_token)
+                current_model_profile.reset(profile_token)
+                current_context_budget.reset(budget_token)
+                record_node_metrics(self.agent_name, name, duration, stats, status)
+            
+            # Annotate the steps this node appended, or add one if it appended none
+            new_steps = state.workflow_steps[steps_before:]
+            if not new_steps:
+                state.workflow_steps.append({"step": name, "status": status})
+                new_steps = state.workflow_steps[steps_before:]
+            fields = stats.as_step_fields(duration)
+            if stats.llm_calls:
+                fields["model"] = (profile or self._default_profile()).model
+            for position, step in enumerate(new_steps, start=steps_before):
+                step.update(fields, id=f"{name}:{position}")
+            return result
+        
+        return run
+
+    def _memoize_node(self, name: str, node: Callable, memo_key: Sequence[str]) -> Callable:
+        """Wrap a state-mutating node so its metadata, steps and result are replayed on a memo hit"""
+        memo = get_node_memo()
+        
+        async def run(state: AgentState) -> Any:
+            inputs = {
+                field: state.metadata.get(field[len("metadata."):]) if field.startswith("metadata.")
+                else getattr(state, field)
+                for field in memo_key
+            }
+            key = make_node_memo_key(self.agent_name, name, inputs)
+            
+            # A bypassed request recomputes the node but still refreshes the memo
+            if not bypass_llm_store.get():
+                cached = await memo.aget(key)
+                record_cache_lookup("node_memo", self.agent_name, cached is not None)
+                if cached is not None:
+                    state.metadata.update(cached["metadata"])
+                    state.workflow_steps.extend({**step, "memoized": True} for step in cached["workflow_steps"])
+                    if cached["result"] is not None:
+                        state.result = cached["result"]
+                    return state
+            
+            metadata_before = dict(state.metadata)
+            steps_before = len(state.workflow_steps)
+            result_before = state.result
+            result = node(state)
+            if inspect.isawaitable(result):
+                result = await result
+            
+            await memo.aset(key, {
+                # Nodes store new values rather than mutating old ones, so identity marks output
+                "metadata": {k: v for k, v in state.metadata.items() if metadata_before.get(k) is not v},
+                "workflow_steps": [dict(step) for step in state.workflow_steps[steps_before:]],
+                "result": state.result if state.result is not result_before else None
+            })
+            return result
+        
+        return run
+
+    def _add_dependency_graph(self, workflow: StateGraph, nodes: Dict[str, Callable],
+                              dependencies: Dict[str, List[str]], start: str, end: str) -> None:
+        """Wire nodes from declared dependencies so independent nodes run as parallel branches
+        
+        Nodes without declared dependencies run right after `start`; nodes that nothing
+        depends on join into `end`. A node with several dependencies waits for all of them.
+        """
+        unknown = {dep for deps in dependencies.values() for dep in deps} - set(nodes)
+        if unknown:
+            raise ValueError(f"Unknown node dependencies: {sorted(unknown)}")
+        
+        for name, node in nodes.items():
+            workflow.add_node(name, self._branch_node(node))
+        
+        for name in nodes:
+            upstream = dependencies.get(name) or [start]
+            workflow.add_edge(upstream[0] if len(upstream) == 1 else upstream, name)
+        
+        required = {dep for deps in dependencies.values() for dep in deps}
+        terminal = [name for name in nodes if name not in required]
+        workflow.add_edge(terminal[0] if len(terminal) == 1 else terminal, end)
+
+    def _branch_node(self, node: Callable) -> Callable:
+        """Wrap a node so it only emits the state keys parallel branches can merge"""
+        async def run(state: AgentState) -> Dict[str, Any]:
+            result = node(state)
+            if inspect.isawaitable(result):
+                result = await result
+            
+            update = {"metadata": result.metadata, "workflow_steps": result.workflow_steps}
+            if result.result:
+                update["result"] = result.result
+            return update
+        
+        return run
+
+    def _context(self, state: AgentState, key: Optional[str] = None, default: Any = "") -> str:
+        """Return an upstream output for a prompt, compacted to the current node's token budget
+        
+        Without a key, every node output in metadata is rendered as labelled sections sharing
+        the budget; the request's own input is left to _request_input.
+        """
+        budget = current_context_budget.get()
+        if budget is None:
+            budget = DEFAULT_CONTEXT_TOKENS
+        
+        if key is None:
+            outputs = {k: v for k, v in state.metadata.items() if k not in state.input_keys}
+            original = render_value(outputs)
+            compacted = compact_sections(outputs, budget, exclude=["execution_mode"])
+        else:
+            original = render_value(state.metadata.get(key, default))
+            compacted = compact_text(original, budget)
+        record_context_compaction(estimate_tokens(original) - estimate_tokens(compacted))
+        return compacted
+
+    def _request_input(self, state: AgentState, exclude: Sequence[str] = ()) -> str:
+        """Render the metadata supplied with the request in full, never compacted"""
+        return "\n".join(
+            f"{key}: {render_value(state.metadata[key])}" for key in state.input_keys
+            if key in state.metadata and key not in exclude and key != "execution_mode"
+        )
+
+    def _default_profile(self) -> ModelProfile:
+        return ModelProfile(model=self.model, max_tokens=self.max_tokens, temperature=self.temperature)
+
+    async def _invoke_llm(self, messages: List[Any]) -> Any:
+        """Run an LLM call without blocking the event loop"""
+        # Nodes declared with a profile run on its model; all others use the agent's settings
+        profile = current_model_profile.get()
+        llm = self.llm
+        if profile is None:
+            profile = self._default_profile()
+        else:
+            llm = get_llm(profile.model, profile.temperature, profile.max_tokens)
+        
+        # Reuse completions persisted by earlier runs or sibling workers
+        store = get_llm_store()
+        store_key = None
+        if store is not None:
+            store_key = make_store_key(profile.model, profile.temperature, profile.max_tokens, messages)
+            if not bypass_llm_store.get():
+                completion = await store.aget(store_key)
+                if completion is not None:
+                    response = AIMessage(content=completion)
+                    record_llm_call(messages, response, cache_hit=True)
+                    return response
+        
+        # Budget the prompt plus a quarter of the completion limit until real usage is known
+        estimated_tokens = sum(estimate_tokens(str(getattr(message, "content", message))) for message in messages)
+        estimated_tokens += profile.max_tokens // 4
+        # Each retry or hedge is admitted by the scheduler separately, so it counts against the budgets;
+        # the policy times and hedges only the Gemini call that runs once a slot is granted
+        scheduler = get_llm_scheduler()
+        response = await get_llm_call_policy().call(
+            lambda: llm.ainvoke(messages), profile.model,
+            admit=lambda upstream: scheduler.run(upstream, estimated_tokens)
+        )
+        record_llm_call(messages, response, cache_hit=False if store is not None else None)
+        
+        if store is not None and isinstance(response.content, str):
+            await store.aput(store_key, profile.model, response.content)
+        return response
+
+    async def _gather_bounded(self, items: List[Any],
+                              worker: Callable[[Any], Awaitable[Any]]) -> List[Any]:
+        """Run worker over items with bounded concurrency, keeping input order"""
+        semaphore = asyncio.Semaphore(max(1, self.fanout_concurrency))
+        
+        async def run(item: Any) -> Any:
+            async with semaphore:
+                return await worker(item)
+        
+        tasks = [asyncio.ensure_future(run(item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed item fails the node, so stop the sibling LLM calls instead of paying for them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     def _initialize_state(self, state: AgentState) -> AgentState:
         """Initialize the agent state with common setup"""
         state.workflow_steps.append({
@@ -116,11 +410,10 @@ class BaseEducationalAgent(ABC):
         
         return state
 
-    async def process(self, prompt: str, grades: List[int], languages: List[str] = ["English"], 
-                     content_source: str = "prebook", metadata: Dict[str, Any] = {}) -> Dict[str, Any]:
-        """Process the request through the agent's workflow"""
-        
-        initial_state = AgentState(
+    def _build_initial_state(self, prompt: str, grades: List[int], languages: List[str],
+                             content_source: str, metadata: Dict[str, Any]) -> AgentState:
+        """Create the starting state for a workflow run"""
+        return AgentState(
             messages=[],
             prompt=prompt,
             grades=grades,
@@ -128,12 +421,13 @@ class BaseEducationalAgent(ABC):
             content_source=content_source,
             metadata=metadata,
             workflow_steps=[],
-            current_step=0
+            current_step=0,
+            input_keys=list(metadata)
         )
-        
-        # Execute the graph
-        final_state = await self.graph.ainvoke(initial_state)
-        
+
+    def _format_response(self, final_state: AgentState, grades: List[int], languages: List[str],
+                         content_source: str) -> Dict[str, Any]:
+        """Shape the final workflow state into the agent response"""
         return {
             "content": final_state.result["content"] if final_state.result else "",
             "metadata": {
@@ -146,6 +440,157 @@ class BaseEducationalAgent(ABC):
             "workflow_steps": final_state.workflow_steps
         }
 
+    async def process(self, prompt: str, grades: List[int], languages: List[str] = ["English"], 
+                     content_source: str = "prebook", metadata: Dict[str, Any] = {},
+                     bypass_cache: bool = False) -> Dict[str, Any]:
+        """Process the request through the agent's workflow"""
+        # Nodes write into metadata, so never share the caller's (or the default) dict
+        metadata = dict(metadata or {})
+        
+        # Serve repeated requests from the response cache
+        cache = get_response_cache()
+        cache_key = make_cache_key(self.agent_name, prompt, grades, languages, content_source, metadata)
+        if not bypass_cache:
+            cached = await cache.aget(cache_key)
+            record_cache_lookup("response", self.agent_name, cached is not None)
+            if cached is not None:
+                return cached
+        
+        initial_state = self._build_initial_state(prompt, grades, languages, content_source, metadata)
+        
+        # Execute the graph
+        bypass_token = bypass_llm_store.set(bypass_cache)
+        try:
+            final_state = await self._run_graph(initial_state, resume=not bypass_cache)
+        finally:
+            bypass_llm_store.reset(bypass_token)
+        
+        response = self._format_response(final_state, grades, languages, content_source)
+        
+        # A bypassed request still refreshes the cached entry
+        await cache.aset(cache_key, response)
+        return response
+
+    async def stream_process(self, prompt: str, grades: List[int], languages: List[str] = ["English"],
+                             content_source: str = "prebook", metadata: Dict[str, Any] = {},
+                             bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Stream workflow steps, partial content and tokens, ending with the full response"""
+        metadata = dict(metadata or {})
+        
+        cache = get_response_cache()
+        cache_key = make_cache_key(self.agent_name, prompt, grades, languages, content_source, metadata)
+        if not bypass_cache:
+            cached = await cache.aget(cache_key)
+            record_cache_lookup("response", self.agent_name, cached is not None)
+            if cached is not None:
+                yield {"event": "result", "data": cached}
+                return
+        
+        initial_state = self._build_initial_state(prompt, grades, languages, content_source, metadata)
+        
+        final_state = None
+        bypass_token = bypass_llm_store.set(bypass_cache)
+        try:
+            async for event in self._stream_graph(initial_state, resume=not bypass_cache):
+                if event["event"] == "final_state":
+                    final_state = event["data"]
+                else:
+                    yield event
+        finally:
+            bypass_llm_store.reset(bypass_token)
+        
+        response = self._format_response(final_state, grades, languages, content_source)
+        await cache.aset(cache_key, response)
+        yield {"event": "result", "data": response}
+
+    @asynccontextmanager
+    async def _checkpoint_thread(self, initial_state: AgentState,
+                                 resume: bool = True) -> AsyncIterator[Tuple[Optional[AgentState], Dict[str, Any]]]:
+        """Yield the graph input and config, resuming an earlier failed run of the same request"""
+        checkpointer = self.graph.checkpointer
+        if checkpointer is None:
+            yield initial_state, {}
+            return
+        
+        # Identical requests share a thread, so a retry picks up the failed run's checkpoints
+        thread_id = make_cache_key(self.agent_name, initial_state.prompt, initial_state.grades,
+                                   initial_state.languages, initial_state.content_source, initial_state.metadata)
+        # The lease lives in the shared backend so a run in another worker cannot resume or delete this thread
+        backend = get_shared_backend()
+        lease_key = f"checkpoint_lease:{thread_id}"
+        leased = await asyncio.to_thread(backend.incr, lease_key, 1, self.checkpoint_lease_seconds) == 1
+        if not leased:
+            # The same request is running elsewhere; this run checkpoints privately
+            thread_id = f"{thread_id}:{uuid.uuid4().hex}"
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            graph_input: Optional[AgentState] = initial_state
+            snapshot = await self.graph.aget_state(config)
+            if resume and snapshot.next:
+                # Input None continues from the saved state; completed nodes are not re-run
+                graph_input = None
+                print(f"♻️ Resuming {self.agent_name} at {', '.join(snapshot.next)}")
+            elif snapshot.values:
+                await checkpointer.adelete_thread(thread_id)
+            
+            yield graph_input, config
+            # Finished runs have nothing to resume
+            await checkpointer.adelete_thread(thread_id)
+        finally:
+            if leased:
+                await asyncio.to_thread(backend.delete, lease_key)
+
+    async def _run_graph(self, initial_state: AgentState, resume: bool = True) -> AgentState:
+        """Run the graph to completion under a checkpoint thread"""
+        async with self._checkpoint_thread(initial_state, resume) as (graph_input, config):
+            return AgentState(**await self.graph.ainvoke(graph_input, config))
+
+    async def _stream_graph(self, initial_state: AgentState, resume: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """Run the graph, yielding step and token events and finally the end state"""
+        async with self._checkpoint_thread(initial_state, resume) as (graph_input, config):
+            async for event in self._stream_graph_events(initial_state, graph_input, config):
+                yield event
+
+    async def _stream_graph_events(self, initial_state: AgentState, graph_input: Optional[AgentState],
+                                   config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Translate graph stream chunks into step, token and final state events"""
+        emitted_steps: List[Any] = []
+        seen_metadata: Dict[str, Any] = dict(initial_state.metadata)
+        final_values: Dict[str, Any] = {}
+        
+        async for mode, chunk in self.graph.astream(graph_input, config, stream_mode=["updates", "messages", "values"]):
+            if mode == "values":
+                final_values = chunk
+            elif mode == "messages":
+                message, message_metadata = chunk
+                if message.content:
+                    yield {"event": "token", "data": {
+                        "node": message_metadata.get("langgraph_node"),
+                        "content": message.content
+                    }}
+            else:
+                for node, update in chunk.items():
+                    update = update or {}
+                    steps = update.get("workflow_steps") or []
+                    new_steps = [step for step in steps if step not in emitted_steps]
+                    emitted_steps.extend(new_steps)
+                    
+                    # Metadata values are replaced, never mutated, so identity marks new output
+                    partial_content = {
+                        key: value for key, value in (update.get("metadata") or {}).items()
+                        if seen_metadata.get(key) is not value
+                    }
+                    seen_metadata.update(partial_content)
+                    
+                    yield {"event": "step", "data": {
+                        "node": node,
+                        "workflow_steps": new_steps,
+                        "partial_content": partial_content
+                    }}
+        
+        yield {"event": "final_state", "data": AgentState(**final_values)}
+
     def get_indian_context_prompt(self, content_source: str) -> str:
         """Generate context-appropriate prompt for Indian education"""
         if content_source == "prebook":
@@ -169,4 +614,93 @@ class BaseEducationalAgent(ABC):
             - Modern educational technology integration
             - Contemporary research in education
             - Progressive teaching methodologies aligned with Indian values
-            """
\ No newline at end of file
+            """
+
+class FusedExecutionMixin(ABC):
+    """Adds a "fast" execution mode that writes every section of an agent in one LLM call"""
+    
+    # (metadata key, instructions) for each section produced by the fused "fast" mode;
+    # the last section is handed to _compile_result instead of being stored in metadata
+    fused_sections: List[Tuple[str, str]] = []
+    
+    def _add_execution_modes(self, workflow: StateGraph, first_step: str, join: str = "finalize") -> None:
+        """Branch after context analysis into the multi-step path or one fused LLM call"""
+        fused_profile = ModelProfile(
+            model=self.model,
+            # One call now writes every section, so give it the combined output allowance
+            max_tokens=self.max_tokens * len(self.fused_sections),
+            temperature=self.temperature
+        )
+        workflow.add_node("fused_generation", self._fused_generation, profile=fused_profile)
+        workflow.add_conditional_edges(
+            "analyze_context", self._select_execution_mode,
+            {"quality": first_step, "fast": "fused_generation"}
+        )
+        workflow.add_edge("fused_generation", join)
+
+    def _select_execution_mode(self, state: AgentState) -> str:
+        """Pick the workflow path from the request's execution_mode"""
+        return "fast" if state.metadata.get("execution_mode") == "fast" else "quality"
+
+    @abstractmethod
+    def _compile_result(self, state: AgentState, final_section: str) -> None:
+        """Assemble state.result from the metadata sections and the final section"""
+
+    def _parse_sections(self, text: str, keys: List[str]) -> Dict[str, str]:
+        """Split a fused completion into sections, accepting JSON or "## key" headed text"""
+        cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", (text or "").strip())
+        try:
+            data = json.loads(cleaned)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return {
+                key: data[key] if isinstance(data.get(key), str) else json.dumps(data.get(key, ""), indent=2)
+                for key in keys
+            }
+        
+        headings = list(re.finditer(r"^#+\s*(%s)\s*:?\s*$" % "|".join(map(re.escape, keys)), cleaned, re.M))
+        if not headings:
+            # Unstructured output still reaches the client through the final section
+            return {**{key: "" for key in keys}, keys[-1]: cleaned}
+        sections = {}
+        for index, heading in enumerate(headings):
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(cleaned)
+            sections[heading.group(1)] = cleaned[heading.end():end].strip()
+        return {key: sections.get(key, "") for key in keys}
+
+    async def _fused_generation(self, state: AgentState) -> AgentState:
+        """Produce every section in one structured call and split them into the usual metadata keys"""
+        keys = [key for key, _ in self.fused_sections]
+        section_list = "\n".join(f'        - "{key}": {instructions}' for key, instructions in self.fused_sections)
+        fused_prompt = f"""
+        Request: {state.prompt}
+        Grade Levels: {state.grades}
+        Languages: {state.languages}
+        {self._context(state, 'context_analysis')}
+        
+        Produce all of the following sections in a single response:
+{section_list}
+        
+        Respond with one JSON object whose keys are exactly {json.dumps(keys)}.
+        Each value must be a detailed markdown string. Later sections should build on earlier ones.
+        """
+        
+        messages = [
+            SystemMessage(content=self.get_indian_context_prompt(state.content_source)),
+            HumanMessage(content=fused_prompt)
+        ]
+        
+        response = await self._invoke_llm(messages)
+        sections = self._parse_sections(response.content, keys)
+        for key in keys[:-1]:
+            state.metadata[key] = sections[key]
+        self._compile_result(state, sections[keys[-1]])
+        
+        state.workflow_steps.append({
+            "step": "fused_generation",
+            "status": "completed",
+            "message": f"Generated {len(keys)} sections in a single call"
+        })
+        
+        return state
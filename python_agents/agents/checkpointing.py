@@ -0,0 +1,133 @@
+"""
+Workflow Checkpointing for EduAI Platform
+Persists graph state after every node so a retried request resumes from the node that failed
+"""
+import os
+import time
+import asyncio
+from typing import Dict, Any, Optional, AsyncIterator, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+try:
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+except ImportError:  # langgraph-checkpoint-sqlite is optional; workflows then run without checkpoints
+    aiosqlite = None
+    AsyncSqliteSaver = None
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "checkpoints.sqlite3"
+)
+
+class LazySqliteCheckpointer(BaseCheckpointSaver):
+    """SQLite checkpointer that opens its connection inside the event loop that first uses it"""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, ttl_seconds: float = 86400.0,
+                 purge_interval: float = 3600.0):
+        super().__init__()
+        self.path = path
+        # Threads untouched this long were abandoned by a run that never retried
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._saver: Optional[AsyncSqliteSaver] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_purge = 0.0
+
+    def _current(self) -> AsyncSqliteSaver:
+        """Return the saver bound to the running loop, opening one if needed"""
+        loop = asyncio.get_running_loop()
+        if self._saver is None or self._loop is not loop:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # The connection is started by the saver's own setup on first use; a daemon
+            # thread keeps a connection left open by a finished loop from blocking exit
+            connection = aiosqlite.connect(self.path)
+            connection.daemon = True
+            self._saver = AsyncSqliteSaver(connection, serde=self.serde)
+            self._loop = loop
+        return self._saver
+
+    async def _ready(self) -> AsyncSqliteSaver:
+        saver = self._current()
+        if not saver.is_setup:
+            await saver.setup()
+            async with saver.lock:
+                await saver.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoint_threads (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+                )
+                await saver.conn.commit()
+        return saver
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await (await self._ready()).aget_tuple(config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        saver = await self._ready()
+        async for checkpoint in saver.alist(config, filter=filter, before=before, limit=limit):
+            yield checkpoint
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        saver = await self._ready()
+        saved = await saver.aput(config, checkpoint, metadata, new_versions)
+        now = time.time()
+        async with saver.lock:
+            await saver.conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_threads (thread_id, updated_at) VALUES (?, ?)",
+                (config["configurable"]["thread_id"], now)
+            )
+            await saver.conn.commit()
+        if self.ttl_seconds and now - self._last_purge > self.purge_interval:
+            self._last_purge = now
+            await self.apurge()
+        return saved
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str) -> None:
+        await (await self._ready()).aput_writes(config, writes, task_id)
+
+    def get_next_version(self, current: Optional[str], channel: Any) -> str:
+        # Same monotonic string versions the SQLite saver writes
+        return AsyncSqliteSaver.get_next_version(self, current, channel)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Drop every checkpoint and pending write recorded for a thread"""
+        saver = await self._ready()
+        async with saver.lock:
+            await saver.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            await saver.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            await saver.conn.execute("DELETE FROM checkpoint_threads WHERE thread_id = ?", (thread_id,))
+            await saver.conn.commit()
+
+    async def apurge(self) -> int:
+        """Drop threads whose last checkpoint is older than the TTL and return how many were removed"""
+        saver = await self._ready()
+        cutoff = time.time() - self.ttl_seconds
+        async with saver.lock:
+            stale = "SELECT thread_id FROM checkpoint_threads WHERE updated_at < ?"
+            await saver.conn.execute(f"DELETE FROM checkpoints WHERE thread_id IN ({stale})", (cutoff,))
+            await saver.conn.execute(f"DELETE FROM writes WHERE thread_id IN ({stale})", (cutoff,))
+            cursor = await saver.conn.execute("DELETE FROM checkpoint_threads WHERE updated_at < ?", (cutoff,))
+            await saver.conn.commit()
+        return cursor.rowcount
+
+    async def aclose(self) -> None:
+        """Close the connection opened by the running loop"""
+        if self._saver is not None and self._loop is asyncio.get_running_loop():
+            if self._saver.conn.is_alive():
+                await self._saver.conn.close()
+            self._saver = None
+            self._loop = None
+
+# Global checkpointer instance (disabled with AGENT_CHECKPOINTS_ENABLED=false)
+checkpointer: Optional[LazySqliteCheckpointer] = None
+if AsyncSqliteSaver is not None and os.getenv("AGENT_CHECKPOINTS_ENABLED", "true").lower() not in ("0", "false", "no"):
+    checkpointer = LazySqliteCheckpointer(
+        os.getenv("AGENT_CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH),
+        ttl_seconds=float(os.getenv("AGENT_CHECKPOINT_TTL_HOURS", "24")) * 3600
+    )
+
+def get_checkpointer() -> Optional[LazySqliteCheckpointer]:
+    """Helper function to get the workflow checkpointer, if enabled"""
+    return checkpointer
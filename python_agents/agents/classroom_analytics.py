@@ -31,7 +31,7 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the classroom analytics workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -54,13 +54,14 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _process_performance_data(self, state: AgentState) -> AgentState:
+    async def _process_performance_data(self, state: AgentState) -> AgentState:
         """Process and analyze performance data"""
         data_processing_prompt = f"""
         Process classroom performance data:
         Analysis Request: {state.prompt}
         Grade Levels: {state.grades}
-        Context Data: {state.metadata}
+        Class Data: {self._request_input(state)}
+        Context Data: {self._context(state)}
         
         Data Processing Tasks:
         1. Identify key performance indicators
@@ -78,7 +79,7 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
             HumanMessage(content=data_processing_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["performance_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -89,11 +90,11 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
         
         return state
 
-    def _analyze_learning_patterns(self, state: AgentState) -> AgentState:
+    async def _analyze_learning_patterns(self, state: AgentState) -> AgentState:
         """Analyze learning patterns and trends"""
         pattern_analysis_prompt = f"""
         Analyze learning patterns:
-        Performance Analysis: {state.metadata.get('performance_analysis', '')}
+        Performance Analysis: {self._context(state, 'performance_analysis')}
         Request: {state.prompt}
         Grades: {state.grades}
         
@@ -113,7 +114,7 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
             HumanMessage(content=pattern_analysis_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["learning_patterns"] = response.content
         
         state.workflow_steps.append({
@@ -124,12 +125,12 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
         
         return state
 
-    def _generate_insights(self, state: AgentState) -> AgentState:
+    async def _generate_insights(self, state: AgentState) -> AgentState:
         """Generate actionable insights from analysis"""
         insights_prompt = f"""
         Generate actionable insights:
-        Performance Analysis: {state.metadata.get('performance_analysis', '')}
-        Learning Patterns: {state.metadata.get('learning_patterns', '')}
+        Performance Analysis: {self._context(state, 'performance_analysis')}
+        Learning Patterns: {self._context(state, 'learning_patterns')}
         
         Insight Generation:
         1. Key findings about class performance
@@ -147,7 +148,7 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
             HumanMessage(content=insights_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["insights"] = response.content
         
         state.workflow_steps.append({
@@ -158,11 +159,11 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_recommendations(self, state: AgentState) -> AgentState:
+    async def _create_recommendations(self, state: AgentState) -> AgentState:
         """Create specific recommendations for improvement"""
         recommendations_prompt = f"""
         Create specific recommendations:
-        Insights: {state.metadata.get('insights', '')}
+        Insights: {self._context(state, 'insights')}
         Context: Multi-grade classroom, Grades {state.grades}
         
         Recommendation Categories:
@@ -181,7 +182,7 @@ class ClassroomAnalyticsAgent(BaseEducationalAgent):
             HumanMessage(content=recommendations_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         # Compile comprehensive analytics report
         final_analytics_report = f"""
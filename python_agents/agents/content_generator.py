@@ -30,13 +30,14 @@ class ContentGeneratorAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the content generation workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         # Define workflow nodes
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
         workflow.add_node("analyze_context", self._analyze_context)
-        workflow.add_node("analyze_cultural_context", self._analyze_cultural_context)
+        workflow.add_node("analyze_cultural_context", self._analyze_cultural_context,
+                          memo_key=("prompt", "grades", "languages", "content_source"))
         workflow.add_node("generate_content_outline", self._generate_content_outline)
         workflow.add_node("create_multilingual_content", self._create_multilingual_content)
         workflow.add_node("adapt_grade_levels", self._adapt_grade_levels)
@@ -57,7 +58,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _analyze_cultural_context(self, state: AgentState) -> AgentState:
+    async def _analyze_cultural_context(self, state: AgentState) -> AgentState:
         """Analyze cultural and regional context for content generation"""
         cultural_prompt = f"""
         Analyze the cultural context for educational content generation:
@@ -80,7 +81,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
             HumanMessage(content=cultural_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["cultural_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -91,7 +92,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         
         return state
 
-    def _generate_content_outline(self, state: AgentState) -> AgentState:
+    async def _generate_content_outline(self, state: AgentState) -> AgentState:
         """Generate structured content outline"""
         outline_prompt = f"""
         Create a comprehensive content outline for:
@@ -100,7 +101,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         Languages: {state.languages}
         Content Source: {state.content_source}
         
-        Cultural Context: {state.metadata.get('cultural_analysis', '')}
+        Cultural Context: {self._context(state, 'cultural_analysis')}
         
         Generate a structured outline including:
         1. Learning objectives
@@ -118,7 +119,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
             HumanMessage(content=outline_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["content_outline"] = response.content
         
         state.workflow_steps.append({
@@ -129,15 +130,13 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_multilingual_content(self, state: AgentState) -> AgentState:
+    async def _create_multilingual_content(self, state: AgentState) -> AgentState:
         """Create content in specified languages"""
-        multilingual_content = {}
-        
-        for language in state.languages:
+        async def generate_for_language(language: str) -> str:
             language_prompt = f"""
             Based on the content outline, create detailed educational content in {language}:
             
-            Outline: {state.metadata.get('content_outline', '')}
+            Outline: {self._context(state, 'content_outline')}
             
             Requirements:
             - Use appropriate {language} vocabulary for grades {state.grades}
@@ -154,8 +153,12 @@ class ContentGeneratorAgent(BaseEducationalAgent):
                 HumanMessage(content=language_prompt)
             ]
             
-            response = self.llm.invoke(messages)
-            multilingual_content[language] = response.content
+            response = await self._invoke_llm(messages)
+            return response.content
+        
+        # Fan out one call per language and merge in request order
+        results = await self._gather_bounded(state.languages, generate_for_language)
+        multilingual_content = dict(zip(state.languages, results))
         
         state.metadata["multilingual_content"] = multilingual_content
         
@@ -167,15 +170,13 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         
         return state
 
-    def _adapt_grade_levels(self, state: AgentState) -> AgentState:
+    async def _adapt_grade_levels(self, state: AgentState) -> AgentState:
         """Adapt content for different grade levels"""
-        grade_adapted_content = {}
-        
-        for grade in state.grades:
+        async def adapt_for_grade(grade: int) -> str:
             adaptation_prompt = f"""
             Adapt the following content for Grade {grade} students:
             
-            Original Content: {state.metadata.get('multilingual_content', {})}
+            Original Content: {self._context(state, 'multilingual_content')}
             
             Adaptation requirements for Grade {grade}:
             - Adjust vocabulary and complexity level
@@ -192,8 +193,12 @@ class ContentGeneratorAgent(BaseEducationalAgent):
                 HumanMessage(content=adaptation_prompt)
             ]
             
-            response = self.llm.invoke(messages)
-            grade_adapted_content[f"grade_{grade}"] = response.content
+            response = await self._invoke_llm(messages)
+            return response.content
+        
+        # Fan out one call per grade and merge in request order
+        results = await self._gather_bounded(state.grades, adapt_for_grade)
+        grade_adapted_content = {f"grade_{grade}": content for grade, content in zip(state.grades, results)}
         
         state.metadata["grade_adapted_content"] = grade_adapted_content
         
@@ -205,13 +210,13 @@ class ContentGeneratorAgent(BaseEducationalAgent):
         
         return state
 
-    def _integrate_cultural_elements(self, state: AgentState) -> AgentState:
+    async def _integrate_cultural_elements(self, state: AgentState) -> AgentState:
         """Integrate cultural elements and finalize content"""
         integration_prompt = f"""
         Finalize the educational content by integrating cultural elements:
         
-        Grade-Adapted Content: {state.metadata.get('grade_adapted_content', {})}
-        Cultural Analysis: {state.metadata.get('cultural_analysis', '')}
+        Grade-Adapted Content: {self._context(state, 'grade_adapted_content')}
+        Cultural Analysis: {self._context(state, 'cultural_analysis')}
         
         Integration tasks:
         1. Add relevant cultural stories and examples
@@ -229,7 +234,7 @@ class ContentGeneratorAgent(BaseEducationalAgent):
             HumanMessage(content=integration_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         state.result = {
             "content": response.content,
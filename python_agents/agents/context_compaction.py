@@ -0,0 +1,88 @@
+"""
+Context Compaction for EduAI Platform
+Shrinks upstream node outputs to a token budget before they are pasted into downstream prompts
+"""
+import os
+import re
+import json
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Tuple
+from .metrics import estimate_tokens
+
+# Default budget for each upstream output interpolated into a prompt (0 disables compaction)
+DEFAULT_CONTEXT_TOKENS = int(os.getenv("AGENT_CONTEXT_TOKENS", "512"))
+
+# Budget of the node currently executing in this context, when it overrides the default
+current_context_budget: ContextVar[Optional[int]] = ContextVar("current_context_budget", default=None)
+
+# Headings, list items and "Label:" lines carry the key fields of a section
+KEY_LINE = re.compile(r"^(#{1,6}\s|[-*•]\s|\d{1,2}[.)]\s|\*\*[^*]+\*\*|[A-Z][\w /&()-]{1,60}:)")
+MAX_LINE_CHARS = 240
+ELISION = "[...]"
+
+def _split_units(line: str) -> List[str]:
+    """Split a long line into sentences, hard-wrapping any sentence over MAX_LINE_CHARS"""
+    if len(line) <= MAX_LINE_CHARS:
+        return [line]
+    units = []
+    for sentence in re.split(r"(?<=[.!?])\s+", line):
+        while len(sentence) > MAX_LINE_CHARS:
+            cut = sentence[:MAX_LINE_CHARS].rfind(" ")
+            cut = cut if cut > 0 else MAX_LINE_CHARS
+            units.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            units.append(sentence)
+    return units
+
+def compact_text(text: str, max_tokens: int) -> str:
+    """Extract the key lines and sentences of text until it fits max_tokens, keeping their order"""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Units are (line, sentence) positions; the opening sentence of a key line is itself key
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    key_units, other_units = [], []
+    for line_index, line in enumerate(lines):
+        is_key = bool(KEY_LINE.match(line))
+        for unit_index, unit in enumerate(_split_units(line)):
+            (key_units if is_key and unit_index == 0 else other_units).append((line_index, unit_index, unit))
+
+    # Reserve room for the elision marker in the character budget
+    budget = max_tokens * 4 - len(ELISION) - 1
+    selected: Dict[Tuple[int, int], str] = {}
+    for line_index, unit_index, unit in key_units + other_units:
+        if len(unit) + 1 > budget:
+            continue
+        selected[(line_index, unit_index)] = unit
+        budget -= len(unit) + 1
+
+    compacted_lines: Dict[int, List[str]] = {}
+    for line_index, unit_index in sorted(selected):
+        compacted_lines.setdefault(line_index, []).append(selected[(line_index, unit_index)])
+    return "\n".join(" ".join(units) for units in compacted_lines.values()) + "\n" + ELISION
+
+def render_value(value: Any) -> str:
+    """Render a metadata value the way it would appear interpolated into a prompt"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+def compact_sections(sections: Dict[str, Any], max_tokens: int,
+                     exclude: Optional[List[str]] = None) -> str:
+    """Render several metadata fields as labelled sections sharing one token budget"""
+    rendered = {
+        key: render_value(value) for key, value in sections.items()
+        if value not in (None, "", {}, []) and key not in (exclude or [])
+    }
+    if not rendered:
+        return ""
+
+    # Split the budget evenly, handing what short sections leave unused to the longer ones
+    remaining = max_tokens
+    compacted: Dict[str, str] = {}
+    for position, key in enumerate(sorted(rendered, key=lambda name: estimate_tokens(rendered[name]))):
+        share = remaining // (len(rendered) - position) if max_tokens > 0 else 0
+        compacted[key] = compact_text(rendered[key], share)
+        remaining -= estimate_tokens(compacted[key])
+    return "\n".join(f"{key}: {compacted[key]}" for key in rendered)
@@ -31,7 +31,7 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the differentiated materials workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -54,7 +54,7 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _analyze_content_complexity(self, state: AgentState) -> AgentState:
+    async def _analyze_content_complexity(self, state: AgentState) -> AgentState:
         """Analyze content complexity for differentiation"""
         complexity_prompt = f"""
         Analyze content complexity for differentiation:
@@ -77,7 +77,7 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
             HumanMessage(content=complexity_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["complexity_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -88,12 +88,12 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_base_content(self, state: AgentState) -> AgentState:
+    async def _create_base_content(self, state: AgentState) -> AgentState:
         """Create foundational content structure"""
         base_content_prompt = f"""
         Create foundational content structure:
         Topic: {state.prompt}
-        Complexity Analysis: {state.metadata.get('complexity_analysis', '')}
+        Complexity Analysis: {self._context(state, 'complexity_analysis')}
         
         Base Content Creation:
         1. Core concepts that remain consistent across grades
@@ -111,7 +111,7 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
             HumanMessage(content=base_content_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["base_content"] = response.content
         
         state.workflow_steps.append({
@@ -122,15 +122,13 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
         
         return state
 
-    def _differentiate_by_grade(self, state: AgentState) -> AgentState:
+    async def _differentiate_by_grade(self, state: AgentState) -> AgentState:
         """Create grade-specific differentiated versions"""
-        differentiated_content = {}
-        
-        for grade in state.grades:
+        async def differentiate_for_grade(grade: int) -> str:
             differentiation_prompt = f"""
             Create Grade {grade} differentiated version:
-            Base Content: {state.metadata.get('base_content', '')}
-            Complexity Analysis: {state.metadata.get('complexity_analysis', '')}
+            Base Content: {self._context(state, 'base_content')}
+            Complexity Analysis: {self._context(state, 'complexity_analysis')}
             
             Grade {grade} Differentiation:
             1. Adjust vocabulary to grade-appropriate level
@@ -148,8 +146,12 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
                 HumanMessage(content=differentiation_prompt)
             ]
             
-            response = self.llm.invoke(messages)
-            differentiated_content[f"grade_{grade}"] = response.content
+            response = await self._invoke_llm(messages)
+            return response.content
+        
+        # Fan out one call per grade and merge in request order
+        results = await self._gather_bounded(state.grades, differentiate_for_grade)
+        differentiated_content = {f"grade_{grade}": content for grade, content in zip(state.grades, results)}
         
         state.metadata["differentiated_content"] = differentiated_content
         
@@ -161,11 +163,11 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_scaffolding(self, state: AgentState) -> AgentState:
+    async def _create_scaffolding(self, state: AgentState) -> AgentState:
         """Create scaffolding and support materials"""
         scaffolding_prompt = f"""
         Create scaffolding and support materials:
-        Differentiated Content: {state.metadata.get('differentiated_content', {})}
+        Differentiated Content: {self._context(state, 'differentiated_content')}
         
         Scaffolding Creation:
         1. Bridge activities between grade levels
@@ -183,7 +185,7 @@ class DifferentiatedMaterialsAgent(BaseEducationalAgent):
             HumanMessage(content=scaffolding_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         # Compile comprehensive differentiated materials
         final_materials = f"""
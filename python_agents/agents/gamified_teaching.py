@@ -5,11 +5,19 @@ Creates educational games, badges, and interactive learning experiences
 from typing import Dict, List, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from .base_agent import BaseEducationalAgent, AgentState
+from .base_agent import BaseEducationalAgent, FusedExecutionMixin, AgentState
 
-class GamifiedTeachingAgent(BaseEducationalAgent):
+class GamifiedTeachingAgent(FusedExecutionMixin, BaseEducationalAgent):
     """Agent for creating gamified educational experiences"""
     
+    # Sections produced in one call when execution_mode is "fast"
+    fused_sections = [
+        ("gamification_analysis", "Gamification strategy: learning objectives suited to game elements, student motivation factors, age-appropriate game types and cultural considerations"),
+        ("game_mechanics", "Core game mechanics: rules, progression, levels, feedback loops and collaborative or competitive elements"),
+        ("challenges", "Educational challenges: quests, puzzles and activities tied to the learning objectives at graded difficulty"),
+        ("reward_system", "Reward and recognition system: badges and achievements, progress visualization, leaderboards, tokens, unlockable content and celebrations")
+    ]
+    
     def __init__(self):
         super().__init__("Gamified Teaching Designer")
 
@@ -31,7 +39,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the gamified teaching workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -45,7 +53,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         workflow.set_entry_point("initialize")
         workflow.add_edge("initialize", "validate")
         workflow.add_edge("validate", "analyze_context")
-        workflow.add_edge("analyze_context", "analyze_gamification_needs")
+        self._add_execution_modes(workflow, first_step="analyze_gamification_needs")
         workflow.add_edge("analyze_gamification_needs", "design_game_mechanics")
         workflow.add_edge("design_game_mechanics", "create_challenges")
         workflow.add_edge("create_challenges", "design_reward_system")
@@ -54,7 +62,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _analyze_gamification_needs(self, state: AgentState) -> AgentState:
+    async def _analyze_gamification_needs(self, state: AgentState) -> AgentState:
         """Analyze gamification needs and opportunities"""
         gamification_prompt = f"""
         Analyze gamification needs:
@@ -77,7 +85,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
             HumanMessage(content=gamification_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["gamification_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -88,11 +96,11 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         
         return state
 
-    def _design_game_mechanics(self, state: AgentState) -> AgentState:
+    async def _design_game_mechanics(self, state: AgentState) -> AgentState:
         """Design core game mechanics"""
         mechanics_prompt = f"""
         Design game mechanics:
-        Gamification Analysis: {state.metadata.get('gamification_analysis', '')}
+        Gamification Analysis: {self._context(state, 'gamification_analysis')}
         Educational Content: {state.prompt}
         Target Grades: {state.grades}
         
@@ -112,7 +120,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
             HumanMessage(content=mechanics_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["game_mechanics"] = response.content
         
         state.workflow_steps.append({
@@ -123,11 +131,11 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_challenges(self, state: AgentState) -> AgentState:
+    async def _create_challenges(self, state: AgentState) -> AgentState:
         """Create specific educational challenges and activities"""
         challenges_prompt = f"""
         Create educational challenges:
-        Game Mechanics: {state.metadata.get('game_mechanics', '')}
+        Game Mechanics: {self._context(state, 'game_mechanics')}
         Educational Content: {state.prompt}
         Grades: {state.grades}
         
@@ -147,7 +155,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
             HumanMessage(content=challenges_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["challenges"] = response.content
         
         state.workflow_steps.append({
@@ -158,12 +166,12 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         
         return state
 
-    def _design_reward_system(self, state: AgentState) -> AgentState:
+    async def _design_reward_system(self, state: AgentState) -> AgentState:
         """Design comprehensive reward and recognition system"""
         rewards_prompt = f"""
         Design reward and recognition system:
-        Game Mechanics: {state.metadata.get('game_mechanics', '')}
-        Challenges: {state.metadata.get('challenges', '')}
+        Game Mechanics: {self._context(state, 'game_mechanics')}
+        Challenges: {self._context(state, 'challenges')}
         Target Grades: {state.grades}
         
         Reward System Design:
@@ -182,8 +190,19 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
             HumanMessage(content=rewards_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
+        self._compile_result(state, response.content)
+        
+        state.workflow_steps.append({
+            "step": "reward_system_design",
+            "status": "completed",
+            "message": "Complete gamified teaching system created"
+        })
         
+        return state
+
+    def _compile_result(self, state: AgentState, final_section: str) -> None:
+        """Assemble the final package from the earlier sections and the last one"""
         # Compile comprehensive gamified teaching system
         final_game_system = f"""
         GAMIFIED TEACHING SYSTEM
@@ -202,7 +221,7 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
         {state.metadata.get('challenges', '')}
         
         REWARD AND RECOGNITION SYSTEM:
-        {response.content}
+        {final_section}
         
         IMPLEMENTATION GUIDELINES:
         1. Start with simple mechanics and gradually add complexity
@@ -230,11 +249,3 @@ class GamifiedTeachingAgent(BaseEducationalAgent):
                 "culturally_appropriate": True
             }
         }
-        
-        state.workflow_steps.append({
-            "step": "reward_system_design",
-            "status": "completed",
-            "message": "Complete gamified teaching system created"
-        })
-        
-        return state
\ No newline at end of file
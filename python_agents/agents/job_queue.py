@@ -0,0 +1,305 @@
+"""
+Asynchronous Job Queue for EduAI Platform
+Persists long-running agent jobs in SQLite and runs them on a local worker pool
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+DEFAULT_JOB_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "jobs.sqlite3"
+)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+JobHandler = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class JobStore:
+    """SQLite-backed job records that survive restarts"""
+
+    def __init__(self, path: str = DEFAULT_JOB_STORE_PATH, ttl_seconds: float = 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    agent_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL
+                )
+            """)
+            # Stores created before heartbeats were tracked
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+            self._local.connection = connection
+        return connection
+
+    def _row_to_job(self, row: tuple) -> Dict[str, Any]:
+        job_id, agent_type, payload, status, result, error, attempts, created_at, started_at, finished_at = row
+        return {
+            "job_id": job_id,
+            "agent_type": agent_type,
+            "status": status,
+            "request": json.loads(payload),
+            "result": json.loads(result) if result else None,
+            "error": json.loads(error) if error else None,
+            "attempts": attempts,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at
+        }
+
+    def create(self, agent_type: str, payload: Dict[str, Any]) -> str:
+        """Insert a queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, agent_type, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, agent_type, json.dumps(payload, default=str), JOB_QUEUED, time.time())
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None"""
+        row = self._connect().execute(
+            "SELECT id, agent_type, payload, status, result, error, attempts, created_at, started_at, finished_at "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        """Move a queued job to running; False if another worker got it or it was cancelled"""
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+            "WHERE id = ? AND status = ?",
+            (JOB_RUNNING, now, now, job_id, JOB_QUEUED)
+        )
+        return cursor.rowcount == 1
+
+    def claim_next(self) -> Optional[str]:
+        """Claim the oldest queued job, whichever process submitted it"""
+        now = time.time()
+        row = self._connect().execute(
+            "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+            "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) AND status = ? "
+            "RETURNING id",
+            (JOB_RUNNING, now, now, JOB_QUEUED, JOB_QUEUED)
+        ).fetchone()
+        return row[0] if row else None
+
+    def heartbeat(self, job_ids: List[str]) -> List[str]:
+        """Renew the lease on running jobs and return those that are still running"""
+        if not job_ids:
+            return []
+        connection = self._connect()
+        placeholders = ", ".join("?" * len(job_ids))
+        connection.execute(
+            f"UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND id IN ({placeholders})",
+            (time.time(), JOB_RUNNING, *job_ids)
+        )
+        rows = connection.execute(
+            f"SELECT id FROM jobs WHERE status = ? AND id IN ({placeholders})", (JOB_RUNNING, *job_ids)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+               error: Optional[Dict[str, Any]] = None) -> bool:
+        """Record the outcome of a running job; a job cancelled meanwhile keeps its status"""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+            (status, json.dumps(result, default=str) if result is not None else None,
+             json.dumps(error, default=str) if error is not None else None,
+             time.time(), job_id, JOB_RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def cancel(self, job_id: str) -> bool:
+        """Mark a queued or running job cancelled; False if it already finished"""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+            (JOB_CANCELLED, time.time(), job_id, JOB_QUEUED, JOB_RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def recover(self, lease_seconds: float) -> List[str]:
+        """Requeue running jobs whose worker stopped renewing its lease and return every queued job id"""
+        connection = self._connect()
+        connection.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ? AND COALESCE(heartbeat_at, 0) < ?",
+            (JOB_QUEUED, JOB_RUNNING, time.time() - lease_seconds)
+        )
+        rows = connection.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at",
+                                  (JOB_QUEUED,)).fetchall()
+        return [row[0] for row in rows]
+
+    def purge(self) -> int:
+        """Delete finished jobs older than the retention window"""
+        cursor = self._connect().execute(
+            f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATES))}) AND finished_at < ?",
+            (*FINISHED_STATES, time.time() - self.ttl_seconds)
+        )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts by status"""
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"path": self.path, "by_status": {status: count for status, count in rows}}
+
+class JobQueue:
+    """Local asyncio worker pool that runs persisted jobs off the request path
+
+    Several processes can share one store: each claims jobs atomically, renews a lease on
+    the jobs it runs, and requeues jobs whose worker stopped renewing theirs.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 2, lease_seconds: float = 60.0,
+                 poll_interval: float = 2.0):
+        self.store = store
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._handler: Optional[JobHandler] = None
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelling: set = set()
+
+    async def start(self, handler: JobHandler) -> int:
+        """Start the workers and re-enqueue jobs left over from a previous run"""
+        self._handler = handler
+        # A fresh queue binds to the serving event loop
+        self._queue = asyncio.Queue()
+        await asyncio.to_thread(self.store.purge)
+        pending = await asyncio.to_thread(self.store.recover, self.lease_seconds)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._workers.append(asyncio.create_task(self._maintain()))
+        return len(pending)
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs are requeued on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, agent_type: str, payload: Dict[str, Any]) -> str:
+        """Persist a new job and hand it to the workers"""
+        job_id = await asyncio.to_thread(self.store.create, agent_type, payload)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a job, interrupting it if it is running in this process"""
+        cancelled = await asyncio.to_thread(self.store.cancel, job_id)
+        task = self._running.get(job_id)
+        if cancelled and task is not None:
+            self._cancelling.add(job_id)
+            task.cancel()
+        return cancelled
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job_id = await asyncio.wait_for(self._queue.get(), self.poll_interval)
+            except asyncio.TimeoutError:
+                # Idle: pick up jobs submitted to or requeued by other processes
+                job_id = await asyncio.to_thread(self.store.claim_next)
+                if job_id is not None:
+                    await self._run(job_id, claimed=True)
+                continue
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _maintain(self) -> None:
+        """Renew leases, stop jobs cancelled from another process and requeue abandoned jobs"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            still_running = set(await asyncio.to_thread(self.store.heartbeat, list(self._running)))
+            for job_id, task in list(self._running.items()):
+                if job_id not in still_running:
+                    self._cancelling.add(job_id)
+                    task.cancel()
+            await asyncio.to_thread(self.store.recover, self.lease_seconds)
+
+    async def _run(self, job_id: str, claimed: bool = False) -> None:
+        # Claiming is atomic so cancelled jobs and jobs taken by another process are skipped
+        if not claimed and not await asyncio.to_thread(self.store.claim, job_id):
+            return
+        job = await asyncio.to_thread(self.store.get, job_id)
+
+        task = asyncio.ensure_future(self._handler(job["agent_type"], job["request"]))
+        self._running[job_id] = task
+        try:
+            result = await task
+            await asyncio.to_thread(self.store.finish, job_id, JOB_SUCCEEDED, result)
+        except asyncio.CancelledError:
+            if job_id not in self._cancelling:
+                # The worker itself is shutting down; leave the job running so recover() requeues it
+                task.cancel()
+                raise
+        except Exception as e:
+            error = {"detail": str(e), "type": type(e).__name__}
+            await asyncio.to_thread(self.store.finish, job_id, JOB_FAILED, None, error)
+            print(f"❌ Job {job_id} ({job['agent_type']}) failed: {e}")
+        finally:
+            self._running.pop(job_id, None)
+            self._cancelling.discard(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued_locally": self._queue.qsize(),
+            "running": len(self._running),
+            "lease_seconds": self.lease_seconds
+        }
+
+# Global job queue instance
+job_queue = JobQueue(
+    JobStore(
+        path=os.getenv("AGENT_JOB_STORE_PATH", DEFAULT_JOB_STORE_PATH),
+        ttl_seconds=float(os.getenv("AGENT_JOB_TTL_HOURS", "24")) * 3600
+    ),
+    workers=int(os.getenv("AGENT_JOB_WORKERS", "2")),
+    lease_seconds=float(os.getenv("AGENT_JOB_LEASE_SECONDS", "60")),
+    poll_interval=float(os.getenv("AGENT_JOB_POLL_SECONDS", "2"))
+)
+
+def get_job_queue() -> JobQueue:
+    """Helper function to get the global job queue"""
+    return job_queue
@@ -3,10 +3,13 @@ Enhanced Instant Knowledge Base Agent
 Comprehensive Q&A system integrating NCERT textbooks and external educational sources
 Provides bilingual responses with analogies, follow-up questions, and source citations
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 from .base_agent import BaseEducationalAgent, AgentState
+from .semantic_cache import get_semantic_cache
+from .metrics import record_cache_lookup
+from .llm_scheduler import RateLimitExceeded
 import json
 import requests
 
@@ -37,7 +40,7 @@ class KnowledgeBaseAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the enhanced knowledge base workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -64,47 +67,141 @@ class KnowledgeBaseAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    async def process_comprehensive_query(self, question: str, grades: List[int], languages: List[str], context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _build_query_state(self, question: str, grades: List[int], languages: List[str],
+                           context: Dict[str, Any], content_source: str) -> AgentState:
+        """Create the starting state for a knowledge query"""
+        return AgentState(
+            messages=[HumanMessage(content=question)],
+            prompt=question,
+            grades=grades,
+            languages=languages,
+            content_source=content_source,
+            metadata={
+                "question": question,
+                "grades": grades,
+                "languages": languages,
+                "context": context or {},
+                "workflow_steps": [],
+                "ncert_sources": [],
+                "external_sources": [],
+                "analogies": [],
+                "followup_questions": [],
+                "confidence_score": 0.0
+            }
+        )
+
+    def _format_query_response(self, result: AgentState) -> Dict[str, Any]:
+        """Shape the final query state into the agent response"""
+        query_steps = [
+            {"step": step, "status": "failed" if step.endswith("_failed") else "completed"}
+            for step in result["metadata"].get("workflow_steps", [])
+        ]
+        return {
+            "content": result["messages"][-1].content if result["messages"] else "No response generated",
+            "metadata": result["metadata"],
+            "workflow_steps": result["workflow_steps"] + query_steps
+        }
+
+    def _query_error_response(self, error: Exception) -> Dict[str, Any]:
+        """Build the apology response returned when a query fails"""
+        return {
+            "content": f"I apologize, but I encountered an error while processing your question: {str(error)}",
+            "metadata": {
+                "error": str(error),
+                "workflow_steps": ["error_occurred"],
+                "ncert_sources": [],
+                "external_sources": [],
+                "analogies": [],
+                "followup_questions": []
+            },
+            "workflow_steps": [{"step": "error_occurred", "status": "failed"}]
+        }
+
+    async def process(self, prompt: str, grades: List[int], languages: List[str] = ["English"],
+                      content_source: str = "prebook", metadata: Dict[str, Any] = {},
+                      bypass_cache: bool = False) -> Dict[str, Any]:
+        """Route generic agent requests through the comprehensive query workflow"""
+        return await self.process_comprehensive_query(
+            prompt, grades, languages, {**(metadata or {}), "content_source": content_source}, bypass_cache
+        )
+
+    def stream_process(self, prompt: str, grades: List[int], languages: List[str] = ["English"],
+                       content_source: str = "prebook", metadata: Dict[str, Any] = {},
+                       bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Route generic streaming requests through the comprehensive query workflow"""
+        return self.stream_comprehensive_query(
+            prompt, grades, languages, {**(metadata or {}), "content_source": content_source}, bypass_cache
+        )
+
+    async def process_comprehensive_query(self, question: str, grades: List[int], languages: List[str], context: Dict[str, Any] = None,
+                                          bypass_cache: bool = False) -> Dict[str, Any]:
         """Process a comprehensive knowledge query with NCERT and external source integration"""
+        # Near-duplicate questions are answered from the semantic cache without an LLM call
+        content_source = (context or {}).get("content_source", "prebook")
+        if not bypass_cache:
+            cached = get_semantic_cache().lookup(question, grades, languages, content_source)
+            record_cache_lookup("semantic", self.agent_name, cached is not None)
+            if cached is not None:
+                return cached
+        
         try:
-            initial_state = {
-                "messages": [HumanMessage(content=question)],
-                "metadata": {
-                    "question": question,
-                    "grades": grades,
-                    "languages": languages,
-                    "context": context or {},
-                    "workflow_steps": [],
-                    "ncert_sources": [],
-                    "external_sources": [],
-                    "analogies": [],
-                    "followup_questions": [],
-                    "confidence_score": 0.0
-                }
-            }
+            initial_state = self._build_query_state(question, grades, languages, context, content_source)
             
-            result = await self.graph.ainvoke(initial_state)
+            result = await self._run_graph(initial_state, resume=not bypass_cache)
+            response = self._format_query_response(result)
             
-            return {
-                "content": result["messages"][-1].content if result["messages"] else "No response generated",
-                "metadata": result["metadata"],
-                "workflow_steps": result["metadata"].get("workflow_steps", [])
-            }
+            # Only cache answers that were actually synthesized
+            if "answer_synthesized" in response["metadata"]["workflow_steps"]:
+                get_semantic_cache().store(question, grades, languages, response, content_source)
+            return response
             
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"❌ Knowledge Base processing error: {str(e)}")
-            return {
-                "content": f"I apologize, but I encountered an error while processing your question: {str(e)}",
-                "metadata": {
-                    "error": str(e),
-                    "workflow_steps": ["error_occurred"],
-                    "ncert_sources": [],
-                    "external_sources": [],
-                    "analogies": [],
-                    "followup_questions": []
-                },
-                "workflow_steps": ["error_occurred"]
-            }
+            return self._query_error_response(e)
+
+    async def stream_comprehensive_query(self, question: str, grades: List[int], languages: List[str],
+                                         context: Dict[str, Any] = None,
+                                         bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a knowledge query's workflow steps and tokens, ending with the full response"""
+        content_source = (context or {}).get("content_source", "prebook")
+        if not bypass_cache:
+            cached = get_semantic_cache().lookup(question, grades, languages, content_source)
+            record_cache_lookup("semantic", self.agent_name, cached is not None)
+            if cached is not None:
+                yield {"event": "result", "data": cached}
+                return
+        
+        try:
+            initial_state = self._build_query_state(question, grades, languages, context, content_source)
+            
+            response = None
+            async for event in self._stream_graph(initial_state, resume=not bypass_cache):
+                if event["event"] == "final_state":
+                    response = self._format_query_response(event["data"])
+                else:
+                    yield event
+            
+            if "answer_synthesized" in response["metadata"]["workflow_steps"]:
+                get_semantic_cache().store(question, grades, languages, response, content_source)
+            
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"❌ Knowledge Base processing error: {str(e)}")
+            response = self._query_error_response(e)
+        
+        yield {"event": "result", "data": response}
+
+    async def _generate_response(self, prompt: str, state: AgentState) -> Any:
+        """Generate an answer for the prompt using the shared LLM call path"""
+        content_source = state["metadata"]["context"].get("content_source", "prebook")
+        messages = [
+            SystemMessage(content=self.get_indian_context_prompt(content_source)),
+            HumanMessage(content=prompt)
+        ]
+        return await self._invoke_llm(messages)
 
     async def _search_ncert_sources(self, state: AgentState) -> AgentState:
         """Search NCERT textbooks for relevant information"""
@@ -207,6 +304,8 @@ Answer in {language} language."""
             
             return state
             
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"❌ Answer synthesis error: {str(e)}")
             state["metadata"]["workflow_steps"].append("synthesis_failed")
@@ -268,156 +367,3 @@ Answer in {language} language."""
             print(f"❌ Response formatting error: {str(e)}")
             state["metadata"]["workflow_steps"].append("formatting_failed")
             return state
-
-    def _analyze_question(self, state: AgentState) -> AgentState:
-        """Analyze the question to understand learning needs"""
-        question_prompt = f"""
-        Analyze the educational question:
-        Question: {state.prompt}
-        Grade Levels: {state.grades}
-        Languages: {state.languages}
-        
-        Question Analysis:
-        1. Identify the core concept being asked about
-        2. Determine the complexity level needed
-        3. Assess prior knowledge assumptions
-        4. Identify potential misconceptions
-        5. Note cultural context considerations
-        6. Suggest analogy opportunities
-        
-        Provide comprehensive question analysis.
-        """
-        
-        messages = [
-            SystemMessage(content="You are an expert educational analyst specializing in question comprehension and learning needs assessment."),
-            HumanMessage(content=question_prompt)
-        ]
-        
-        response = self.llm.invoke(messages)
-        state.metadata["question_analysis"] = response.content
-        
-        state.workflow_steps.append({
-            "step": "question_analysis",
-            "status": "completed",
-            "message": "Question analyzed for learning needs"
-        })
-        
-        return state
-
-    def _research_answer(self, state: AgentState) -> AgentState:
-        """Research comprehensive answer to the question"""
-        research_prompt = f"""
-        Research comprehensive answer:
-        Question: {state.prompt}
-        Question Analysis: {state.metadata.get('question_analysis', '')}
-        Grade Levels: {state.grades}
-        
-        Research Requirements:
-        1. Provide accurate, factual information
-        2. Include grade-appropriate depth
-        3. Cover key concepts thoroughly
-        4. Address common misconceptions
-        5. Include relevant examples
-        6. Consider multiple perspectives
-        
-        Provide comprehensive, accurate answer.
-        """
-        
-        messages = [
-            SystemMessage(content=self.get_indian_context_prompt(state.content_source)),
-            HumanMessage(content=research_prompt)
-        ]
-        
-        response = self.llm.invoke(messages)
-        state.metadata["researched_answer"] = response.content
-        
-        state.workflow_steps.append({
-            "step": "answer_research",
-            "status": "completed",
-            "message": "Comprehensive answer researched"
-        })
-        
-        return state
-
-    def _create_analogies(self, state: AgentState) -> AgentState:
-        """Create culturally relevant analogies for explanation"""
-        analogy_prompt = f"""
-        Create powerful analogies for explanation:
-        Question: {state.prompt}
-        Answer Content: {state.metadata.get('researched_answer', '')}
-        Grade Levels: {state.grades}
-        Languages: {state.languages}
-        
-        Analogy Creation:
-        1. Identify complex concepts needing analogies
-        2. Create culturally relevant comparisons
-        3. Use familiar Indian contexts and experiences
-        4. Ensure age-appropriate analogies
-        5. Make abstract concepts concrete
-        6. Include multiple analogies for different learning styles
-        
-        Create engaging, culturally relevant analogies.
-        """
-        
-        messages = [
-            SystemMessage(content="You are an expert in creating educational analogies and metaphors, specializing in Indian cultural contexts."),
-            HumanMessage(content=analogy_prompt)
-        ]
-        
-        response = self.llm.invoke(messages)
-        state.metadata["analogies"] = response.content
-        
-        state.workflow_steps.append({
-            "step": "analogy_creation",
-            "status": "completed",
-            "message": "Cultural analogies created for explanation"
-        })
-        
-        return state
-
-    def _format_response(self, state: AgentState) -> AgentState:
-        """Format comprehensive response with analogies"""
-        formatting_prompt = f"""
-        Format comprehensive educational response:
-        Original Question: {state.prompt}
-        Researched Answer: {state.metadata.get('researched_answer', '')}
-        Analogies: {state.metadata.get('analogies', '')}
-        Target Grades: {state.grades}
-        Languages: {state.languages}
-        
-        Response Formatting:
-        1. Clear, direct answer to the question
-        2. Integration of relevant analogies
-        3. Grade-appropriate language and examples
-        4. Multilingual elements if requested
-        5. Interactive elements and follow-up questions
-        6. Additional resources and exploration suggestions
-        
-        Create engaging, comprehensive educational response.
-        """
-        
-        messages = [
-            SystemMessage(content="You are an expert educational communicator specializing in clear, engaging explanations with analogies."),
-            HumanMessage(content=formatting_prompt)
-        ]
-        
-        response = self.llm.invoke(messages)
-        
-        state.result = {
-            "content": response.content,
-            "metadata": {
-                "response_type": "knowledge_base_answer_with_analogies",
-                "includes_analogies": True,
-                "cultural_context": "indian_educational_context",
-                "grade_appropriate": True,
-                "multilingual_support": len(state.languages) > 1
-            }
-        }
-        
-        state.workflow_steps.append({
-            "step": "response_formatting",
-            "status": "completed",
-            "message": "Comprehensive response formatted with analogies"
-        })
-        
-        return state
\ No newline at end of file
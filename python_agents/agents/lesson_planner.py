@@ -2,7 +2,7 @@
 AI Lesson Planner Agent
 Creates comprehensive, adaptive lesson plans for multi-grade classrooms
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 from .base_agent import BaseEducationalAgent, AgentState
@@ -10,6 +10,9 @@ from .base_agent import BaseEducationalAgent, AgentState
 class LessonPlannerAgent(BaseEducationalAgent):
     """Agent for creating comprehensive lesson plans with multi-grade support"""
     
+    # The timeline pulls in three upstream plans, so each gets a smaller share
+    context_budgets = {"timeline_creation": 256}
+    
     def __init__(self):
         super().__init__("AI Lesson Planner")
 
@@ -32,19 +35,15 @@ class LessonPlannerAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the lesson planning workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         # Define workflow nodes
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
         workflow.add_node("analyze_context", self._analyze_context)
-        workflow.add_node("curriculum_analysis", self._analyze_curriculum_alignment)
+        workflow.add_node("curriculum_analysis", self._analyze_curriculum_alignment,
+                          memo_key=("metadata.topic", "grades", "content_source"))
         workflow.add_node("learning_objectives", self._define_learning_objectives)
-        workflow.add_node("differentiation_strategy", self._plan_differentiation_strategy)
-        workflow.add_node("activity_sequencing", self._sequence_activities)
-        workflow.add_node("assessment_planning", self._plan_assessments)
-        workflow.add_node("resource_planning", self._plan_resources)
-        workflow.add_node("timeline_creation", self._create_timeline)
         workflow.add_node("finalize", self._finalize_result)
         
         # Define workflow edges
@@ -53,24 +52,36 @@ class LessonPlannerAgent(BaseEducationalAgent):
         workflow.add_edge("validate", "analyze_context")
         workflow.add_edge("analyze_context", "curriculum_analysis")
         workflow.add_edge("curriculum_analysis", "learning_objectives")
-        workflow.add_edge("learning_objectives", "differentiation_strategy")
-        workflow.add_edge("differentiation_strategy", "activity_sequencing")
-        workflow.add_edge("activity_sequencing", "assessment_planning")
-        workflow.add_edge("assessment_planning", "resource_planning")
-        workflow.add_edge("resource_planning", "timeline_creation")
-        workflow.add_edge("timeline_creation", "finalize")
+        
+        # Planning steps that only need the objectives run as parallel branches
+        # and join before the timeline is compiled
+        self._add_dependency_graph(
+            workflow,
+            nodes={
+                "differentiation_strategy": self._plan_differentiation_strategy,
+                "activity_sequencing": self._sequence_activities,
+                "assessment_planning": self._plan_assessments,
+                "resource_planning": self._plan_resources,
+                "timeline_creation": self._create_timeline,
+            },
+            dependencies={
+                "activity_sequencing": ["differentiation_strategy"],
+                "timeline_creation": ["activity_sequencing", "assessment_planning", "resource_planning"],
+            },
+            start="learning_objectives",
+            end="finalize"
+        )
         workflow.add_edge("finalize", END)
         
         return workflow.compile()
 
-    def _analyze_curriculum_alignment(self, state: AgentState) -> AgentState:
+    async def _analyze_curriculum_alignment(self, state: AgentState) -> AgentState:
         """Analyze curriculum alignment and standards"""
         curriculum_prompt = f"""
         Analyze curriculum alignment for lesson planning:
-        Topic: {state.prompt}
+        Topic: {state.metadata["topic"]}
         Grades: {state.grades}
         Content Source: {state.content_source}
-        Languages: {state.languages}
         
         Analysis requirements:
         1. Identify relevant curriculum standards for each grade
@@ -88,7 +99,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=curriculum_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["curriculum_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -99,13 +110,13 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _define_learning_objectives(self, state: AgentState) -> AgentState:
+    async def _define_learning_objectives(self, state: AgentState) -> AgentState:
         """Define clear learning objectives for all grade levels"""
         objectives_prompt = f"""
         Define comprehensive learning objectives:
         Topic: {state.prompt}
         Grades: {state.grades}
-        Curriculum Analysis: {state.metadata.get('curriculum_analysis', '')}
+        Curriculum Analysis: {self._context(state, 'curriculum_analysis')}
         
         Create learning objectives that are:
         1. Specific and measurable
@@ -123,7 +134,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=objectives_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["learning_objectives"] = response.content
         
         state.workflow_steps.append({
@@ -134,12 +145,12 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _plan_differentiation_strategy(self, state: AgentState) -> AgentState:
+    async def _plan_differentiation_strategy(self, state: AgentState) -> AgentState:
         """Plan differentiated instruction strategies"""
         differentiation_prompt = f"""
         Plan differentiation strategies for multi-grade classroom:
         Grades: {state.grades}
-        Learning Objectives: {state.metadata.get('learning_objectives', '')}
+        Learning Objectives: {self._context(state, 'learning_objectives')}
         
         Differentiation planning:
         1. Content differentiation by grade level
@@ -157,7 +168,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=differentiation_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["differentiation_strategy"] = response.content
         
         state.workflow_steps.append({
@@ -168,13 +179,13 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _sequence_activities(self, state: AgentState) -> AgentState:
+    async def _sequence_activities(self, state: AgentState) -> AgentState:
         """Sequence learning activities optimally"""
         sequencing_prompt = f"""
         Sequence learning activities for the lesson:
         Topic: {state.prompt}
-        Learning Objectives: {state.metadata.get('learning_objectives', '')}
-        Differentiation Strategy: {state.metadata.get('differentiation_strategy', '')}
+        Learning Objectives: {self._context(state, 'learning_objectives')}
+        Differentiation Strategy: {self._context(state, 'differentiation_strategy')}
         
         Activity sequencing:
         1. Opening/engagement activities
@@ -192,7 +203,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=sequencing_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["activity_sequence"] = response.content
         
         state.workflow_steps.append({
@@ -203,12 +214,12 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _plan_assessments(self, state: AgentState) -> AgentState:
+    async def _plan_assessments(self, state: AgentState) -> AgentState:
         """Plan formative and summative assessments"""
         assessment_prompt = f"""
         Plan comprehensive assessments:
-        Learning Objectives: {state.metadata.get('learning_objectives', '')}
-        Activity Sequence: {state.metadata.get('activity_sequence', '')}
+        Topic: {state.prompt}
+        Learning Objectives: {self._context(state, 'learning_objectives')}
         Grades: {state.grades}
         
         Assessment planning:
@@ -227,7 +238,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=assessment_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["assessment_plan"] = response.content
         
         state.workflow_steps.append({
@@ -238,12 +249,12 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _plan_resources(self, state: AgentState) -> AgentState:
+    async def _plan_resources(self, state: AgentState) -> AgentState:
         """Plan required resources and materials"""
         resource_prompt = f"""
         Plan resources and materials needed:
-        Activity Sequence: {state.metadata.get('activity_sequence', '')}
-        Assessment Plan: {state.metadata.get('assessment_plan', '')}
+        Topic: {state.prompt}
+        Learning Objectives: {self._context(state, 'learning_objectives')}
         Grades: {state.grades}
         Languages: {state.languages}
         
@@ -263,7 +274,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=resource_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["resource_plan"] = response.content
         
         state.workflow_steps.append({
@@ -274,12 +285,13 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_timeline(self, state: AgentState) -> AgentState:
+    async def _create_timeline(self, state: AgentState) -> AgentState:
         """Create detailed lesson timeline and pacing guide"""
         timeline_prompt = f"""
         Create detailed lesson timeline:
-        Activity Sequence: {state.metadata.get('activity_sequence', '')}
-        Resource Plan: {state.metadata.get('resource_plan', '')}
+        Activity Sequence: {self._context(state, 'activity_sequence')}
+        Assessment Plan: {self._context(state, 'assessment_plan')}
+        Resource Plan: {self._context(state, 'resource_plan')}
         
         Timeline creation:
         1. Detailed minute-by-minute schedule
@@ -297,7 +309,7 @@ class LessonPlannerAgent(BaseEducationalAgent):
             HumanMessage(content=timeline_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         # Compile final lesson plan
         final_plan = f"""
@@ -345,14 +357,39 @@ class LessonPlannerAgent(BaseEducationalAgent):
         
         return state
 
+    def _lesson_plan_inputs(self, topic: str, grades: List[int], duration: str,
+                            languages: List[str], content_source: str) -> Dict[str, Any]:
+        """Map lesson plan parameters onto the workflow inputs"""
+        return {
+            "prompt": f"Create a comprehensive lesson plan for: {topic} (Duration: {duration})",
+            "grades": grades,
+            "languages": languages,
+            "content_source": content_source,
+            "metadata": {"topic": topic, "duration": duration}
+        }
+
+    def _build_initial_state(self, prompt: str, grades: List[int], languages: List[str],
+                             content_source: str, metadata: Dict[str, Any]) -> AgentState:
+        """Create the starting state; requests without a separate topic use the whole prompt"""
+        return super()._build_initial_state(prompt, grades, languages, content_source,
+                                            {"topic": prompt, **metadata})
+
     async def create_lesson_plan(self, topic: str, grades: List[int], duration: str, 
                                languages: List[str] = ["English"], 
-                               content_source: str = "prebook") -> Dict[str, Any]:
+                               content_source: str = "prebook",
+                               bypass_cache: bool = False) -> Dict[str, Any]:
         """Create a comprehensive lesson plan"""
         return await self.process(
-            prompt=f"Create a comprehensive lesson plan for: {topic} (Duration: {duration})",
-            grades=grades,
-            languages=languages,
-            content_source=content_source,
-            metadata={"duration": duration}
+            **self._lesson_plan_inputs(topic, grades, duration, languages, content_source),
+            bypass_cache=bypass_cache
+        )
+
+    def stream_lesson_plan(self, topic: str, grades: List[int], duration: str,
+                           languages: List[str] = ["English"],
+                           content_source: str = "prebook",
+                           bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Stream lesson plan creation as each workflow node completes"""
+        return self.stream_process(
+            **self._lesson_plan_inputs(topic, grades, duration, languages, content_source),
+            bypass_cache=bypass_cache
         )
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Offline LLM Backends for EduAI Platform
+Record, replay and synthetic chat models so agents can run and be load-tested without Gemini
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+from typing import Dict, List, Any, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+DEFAULT_FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "llm"
+)
+
+# Vocabulary used to assemble synthetic completions
+SYNTHETIC_VOCABULARY = (
+    "students learn concept example activity lesson teacher classroom grade chapter "
+    "explain observe discuss practice question answer village farm river market festival "
+    "science mathematics language story picture group worksheet review assessment"
+).split()
+
+def make_fixture_key(model: str, messages: List[BaseMessage]) -> str:
+    """Hash the model name and prompt messages into a fixture key"""
+    payload = {
+        "model": model,
+        "messages": [[message.type, message.content] for message in messages]
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text or "") // 4)
+
+def _chat_result(messages: List[BaseMessage], content: str) -> ChatResult:
+    """Wrap completion text in a ChatResult with estimated usage metadata"""
+    prompt_tokens = sum(_estimate_tokens(str(message.content)) for message in messages)
+    completion_tokens = _estimate_tokens(content)
+    message = AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    )
+    return ChatResult(generations=[ChatGeneration(message=message)])
+
+class FixtureNotFoundError(LookupError):
+    """Raised in replay mode when no recorded completion matches a prompt"""
+    pass
+
+class FixtureStore:
+    """Directory of recorded completions, one JSON file per prompt hash"""
+
+    def __init__(self, directory: str = DEFAULT_FIXTURES_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[str]:
+        """Return the recorded completion for key, or None"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fixture:
+                return json.load(fixture)["completion"]
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, model: str, messages: List[BaseMessage], completion: str) -> None:
+        """Write a fixture atomically so concurrent recorders never leave partial files"""
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {
+            "model": model,
+            "messages": [{"type": message.type, "content": message.content} for message in messages],
+            "completion": completion,
+            "recorded_at": time.time()
+        }
+        temp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as output:
+            json.dump(fixture, output, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self._path(key))
+
+class SyntheticChatModel(BaseChatModel):
+    """Returns deterministic filler text with log-normal latency and normal length distributions"""
+
+    model_name: str = "synthetic"
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.5
+    words_mean: float = 250.0
+    words_stddev: float = 80.0
+    seed: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "synthetic"
+
+    def _rng(self, messages: List[BaseMessage]) -> random.Random:
+        # Seeding from the prompt makes identical prompts produce identical output
+        key = make_fixture_key(self.model_name, messages)
+        return random.Random(int(key[:16], 16) ^ self.seed)
+
+    def _sample(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        rng = self._rng(messages)
+        delay = rng.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000 if self.latency_ms > 0 else 0.0
+        word_count = max(1, int(rng.gauss(self.words_mean, self.words_stddev)))
+        words = [rng.choice(SYNTHETIC_VOCABULARY) for _ in range(word_count)]
+        return {"delay": delay, "content": " ".join(words).capitalize() + "."}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        sample = self._sample(messages)
+        time.sleep(sample["delay"])
+        return _chat_result(messages, sample["content"])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        sample = self._sample(messages)
+        await asyncio.sleep(sample["delay"])
+        return _chat_result(messages, sample["content"])
+
+class ReplayChatModel(BaseChatModel):
+    """Serves recorded completions by prompt hash, optionally falling back to synthetic text"""
+
+    model_name: str
+    store: FixtureStore
+    fallback: Optional[BaseChatModel] = None
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _lookup(self, messages: List[BaseMessage]) -> Optional[str]:
+        completion = self.store.load(make_fixture_key(self.model_name, messages))
+        if completion is None and self.fallback is None:
+            raise FixtureNotFoundError(f"No recorded completion for this prompt in {self.store.directory}")
+        return completion
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        completion = self._lookup(messages)
+        if completion is None:
+            return self.fallback._generate(messages, stop=stop, **kwargs)
+        return _chat_result(messages, completion)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        completion = await asyncio.to_thread(self._lookup, messages)
+        if completion is None:
+            return await self.fallback._agenerate(messages, stop=stop, **kwargs)
+        return _chat_result(messages, completion)
+
+class RecordingChatModel(BaseChatModel):
+    """Calls a real model and saves every completion as a replayable fixture"""
+
+    model_name: str
+    delegate: BaseChatModel
+    store: FixtureStore
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def _record(self, messages: List[BaseMessage], result: ChatResult) -> None:
+        content = result.generations[0].message.content
+        if isinstance(content, str):
+            self.store.save(make_fixture_key(self.model_name, messages), self.model_name, messages, content)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        result = self.delegate._generate(messages, stop=stop, **kwargs)
+        self._record(messages, result)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        result = await self.delegate._agenerate(messages, stop=stop, **kwargs)
+        await asyncio.to_thread(self._record, messages, result)
+        return result
+
+def synthetic_from_env(model: str) -> SyntheticChatModel:
+    """Build a synthetic model configured from LLM_SYNTHETIC_* environment variables"""
+    return SyntheticChatModel(
+        model_name=model,
+        latency_ms=float(os.getenv("LLM_SYNTHETIC_LATENCY_MS", "800")),
+        latency_sigma=float(os.getenv("LLM_SYNTHETIC_LATENCY_SIGMA", "0.5")),
+        words_mean=float(os.getenv("LLM_SYNTHETIC_WORDS", "250")),
+        words_stddev=float(os.getenv("LLM_SYNTHETIC_WORDS_STDDEV", "80")),
+        seed=int(os.getenv("LLM_SYNTHETIC_SEED", "0"))
+    )
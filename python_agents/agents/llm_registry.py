@@ -0,0 +1,114 @@
+"""
+Shared LLM Client Registry for EduAI Platform
+Pools Gemini clients across all educational agents with per-agent overrides
+"""
+import os
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from langchain_core.runnables import Runnable
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_google_genai import ChatGoogleGenerativeAI
+from .llm_backends import (
+    DEFAULT_FIXTURES_DIR, FixtureStore, RecordingChatModel, ReplayChatModel, synthetic_from_env
+)
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_MAX_TOKENS = 4000
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Model id and generation limits declared for a workflow node"""
+    model: str = DEFAULT_MODEL
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    temperature: float = DEFAULT_TEMPERATURE
+
+# Intent classification and assessment steps: smaller model, tight output cap
+LIGHT_PROFILE = ModelProfile(
+    model=os.getenv("LLM_LIGHT_MODEL", "gemini-2.5-flash-lite"),
+    max_tokens=int(os.getenv("LLM_LIGHT_MAX_TOKENS", "1024")),
+    temperature=0.3
+)
+
+# Profile of the workflow node running in this context, if it declared one
+current_model_profile: ContextVar[Optional[ModelProfile]] = ContextVar("current_model_profile", default=None)
+
+# Only gemini and record call the real API; replay and synthetic run fully offline
+LLM_BACKENDS = ("gemini", "record", "replay", "synthetic")
+
+class LLMClientRegistry:
+    """Process-wide registry that shares one pooled client per model"""
+
+    def __init__(self, api_key: Optional[str] = None, transport: Optional[str] = None,
+                 backend: Optional[str] = None, fixtures_dir: Optional[str] = None):
+        self.api_key = api_key
+        self.transport = transport
+        self.backend = (backend or os.getenv("LLM_BACKEND") or "gemini").lower()
+        if self.backend not in LLM_BACKENDS:
+            raise ValueError(f"Unknown LLM_BACKEND {self.backend!r}, expected one of {', '.join(LLM_BACKENDS)}")
+        self.fixtures = FixtureStore(fixtures_dir or os.getenv("LLM_FIXTURES_DIR") or DEFAULT_FIXTURES_DIR)
+        self._clients: Dict[str, BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    def _create_gemini_client(self, model: str) -> ChatGoogleGenerativeAI:
+        # One client per model keeps a single keep-alive channel
+        # (and TLS session) that every agent multiplexes over
+        return ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=self.api_key or os.getenv("GEMINI_API_KEY"),
+            temperature=DEFAULT_TEMPERATURE,
+            max_tokens=DEFAULT_MAX_TOKENS,
+            transport=self.transport or os.getenv("GEMINI_TRANSPORT") or None
+        )
+
+    def _create_client(self, model: str) -> BaseChatModel:
+        """Build the chat model for the configured backend"""
+        if self.backend == "synthetic":
+            return synthetic_from_env(model)
+        if self.backend == "replay":
+            # LLM_REPLAY_FALLBACK=synthetic answers unrecorded prompts instead of failing
+            fallback = None
+            if os.getenv("LLM_REPLAY_FALLBACK", "").lower() == "synthetic":
+                fallback = synthetic_from_env(model)
+            return ReplayChatModel(model_name=model, store=self.fixtures, fallback=fallback)
+        if self.backend == "record":
+            return RecordingChatModel(model_name=model, delegate=self._create_gemini_client(model),
+                                      store=self.fixtures)
+        return self._create_gemini_client(model)
+
+    def get_base_client(self, model: str = DEFAULT_MODEL) -> BaseChatModel:
+        """Return the shared client for a model, creating it on first use"""
+        with self._lock:
+            if model not in self._clients:
+                self._clients[model] = self._create_client(model)
+            return self._clients[model]
+
+    def get_client(self, model: str = DEFAULT_MODEL, temperature: Optional[float] = None,
+                   max_tokens: Optional[int] = None) -> Runnable:
+        """Return the shared client with per-agent generation overrides layered on top"""
+        client = self.get_base_client(model)
+
+        overrides: Dict[str, Any] = {}
+        if temperature is not None:
+            overrides["temperature"] = temperature
+        if max_tokens is not None:
+            overrides["max_output_tokens"] = max_tokens
+
+        if not overrides:
+            return client
+        return client.bind(generation_config=overrides)
+
+    def reset(self) -> None:
+        """Drop all pooled clients so they are rebuilt on next use"""
+        with self._lock:
+            self._clients.clear()
+
+# Global LLM client registry instance
+llm_registry = LLMClientRegistry()
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: Optional[float] = None,
+            max_tokens: Optional[int] = None) -> Runnable:
+    """Helper function to get a shared LLM client for any agent"""
+    return llm_registry.get_client(model, temperature, max_tokens)
@@ -0,0 +1,214 @@
+"""
+LLM Retry and Hedging Policy for EduAI Platform
+Retries transient Gemini failures with jittered backoff and hedges slow calls within a spend budget
+"""
+import os
+import re
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Callable, Awaitable, TypeVar, Optional
+from .llm_scheduler import RateLimitExceeded
+from .metrics import record_llm_retry, record_llm_hedge
+
+T = TypeVar("T")
+
+# Runs an upstream call once local capacity is granted, e.g. lambda upstream: scheduler.run(upstream, tokens)
+Admission = Callable[[Callable[[], Awaitable[T]]], Awaitable[T]]
+
+# Exception class names, HTTP statuses and message patterns that mark a failure as worth retrying
+TRANSIENT_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "TimeoutError", "ConnectionError", "ServerError"
+}
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Status codes only count as whole words, so "max_output_tokens 1500" is not a 500
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"\b(?:408|429|500|502|503|504)\b|unavailable|deadline exceeded|timed out|connection reset|resource_exhausted"
+)
+
+def error_status_code(error: BaseException) -> Optional[int]:
+    """Return the HTTP status a client exception carries, if it exposes one"""
+    for attribute in ("status_code", "code", "status"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_transient_error(error: BaseException) -> bool:
+    """Return True for failures a retry can fix; local capacity rejections are not retried"""
+    if isinstance(error, RateLimitExceeded):
+        return error.upstream
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if type(error).__name__ in TRANSIENT_ERROR_NAMES:
+        return True
+    status = error_status_code(error)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    return TRANSIENT_ERROR_PATTERN.search(str(error).lower()) is not None
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def count(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+class HedgeBudget:
+    """Caps hedged calls at a fraction of primary calls so hedging cannot double spend"""
+
+    def __init__(self, ratio: float = 0.1, window: int = 1000):
+        self.ratio = ratio
+        self._calls: "deque[bool]" = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._calls.append(False)
+
+    def try_acquire(self) -> bool:
+        """Spend one hedge if the recent hedge rate is under the ratio"""
+        with self._lock:
+            hedges = sum(self._calls)
+            if hedges + 1 > self.ratio * len(self._calls):
+                return False
+            self._calls.append(True)
+            return True
+
+class LLMCallPolicy:
+    """Retry and hedging wrapper around a single logical LLM call"""
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8.0,
+                 attempt_timeout: float = 0.0, hedge_enabled: bool = False,
+                 hedge_percentile: float = 0.95, hedge_budget: float = 0.1, hedge_min_samples: int = 20):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.budget = HedgeBudget(hedge_budget)
+        self._latencies: Dict[str, LatencyTracker] = {}
+
+    def _tracker(self, key: str) -> LatencyTracker:
+        tracker = self._latencies.get(key)
+        if tracker is None:
+            tracker = self._latencies.setdefault(key, LatencyTracker())
+        return tracker
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than a server Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if isinstance(error, RateLimitExceeded):
+            delay = max(delay, min(error.retry_after, self.max_delay))
+        return delay
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]], tracker: LatencyTracker,
+                       admit: Optional[Admission] = None, admitted: Optional[asyncio.Event] = None) -> T:
+        """Run one attempt; latency and the timeout cover only the call made once admit grants a slot"""
+        async def upstream() -> T:
+            if admitted is not None:
+                admitted.set()
+            started = time.monotonic()
+            if self.attempt_timeout:
+                result = await asyncio.wait_for(call(), self.attempt_timeout)
+            else:
+                result = await call()
+            tracker.record(time.monotonic() - started)
+            return result
+
+        return await (admit(upstream) if admit is not None else upstream())
+
+    async def _hedged(self, call: Callable[[], Awaitable[T]], key: str, admit: Optional[Admission] = None) -> T:
+        """Fire a duplicate once the primary passes the latency percentile; first success wins"""
+        tracker = self._tracker(key)
+        self.budget.record_call()
+        if not self.hedge_enabled or tracker.count() < self.hedge_min_samples:
+            return await self._attempt(call, tracker, admit)
+
+        admitted = asyncio.Event()
+        primary = asyncio.ensure_future(self._attempt(call, tracker, admit, admitted))
+        hedge = None
+        try:
+            # The hedge timer starts once the primary holds a slot, so local queueing never triggers a hedge
+            admission = asyncio.ensure_future(admitted.wait())
+            try:
+                await asyncio.wait({primary, admission}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                admission.cancel()
+            done, _ = await asyncio.wait({primary}, timeout=tracker.percentile(self.hedge_percentile))
+            if done or not self.budget.try_acquire():
+                return await primary
+
+            # The hedge waits for its own slot like any other call
+            hedge = asyncio.ensure_future(self._attempt(call, tracker, admit))
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        record_llm_hedge("won" if task is hedge else "lost")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The losing call is cancelled, which also frees its scheduler slot
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def call(self, call: Callable[[], Awaitable[T]], key: str = "default",
+                   admit: Optional[Admission] = None) -> T:
+        """Run call with retries on transient errors, hedging each attempt when enabled
+
+        admit runs each attempt under local admission control, e.g. an LLM scheduler slot;
+        every retry and hedge is admitted separately and holds no slot while backing off.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(call, key, admit)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                record_llm_retry(type(e).__name__)
+                print(f"⚠️ Transient LLM error ({type(e).__name__}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+# Global LLM call policy instance
+llm_call_policy = LLMCallPolicy(
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+    base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "0.5")),
+    max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "8")),
+    attempt_timeout=float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", "0")),
+    hedge_enabled=os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes"),
+    hedge_percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95")),
+    hedge_budget=float(os.getenv("LLM_HEDGE_BUDGET", "0.1")),
+    hedge_min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+)
+
+def get_llm_call_policy() -> LLMCallPolicy:
+    """Helper function to get the shared retry and hedging policy"""
+    return llm_call_policy
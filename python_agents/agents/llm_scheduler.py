@@ -0,0 +1,309 @@
+"""
+LLM Call Scheduler for EduAI Platform
+Enforces Gemini request and token budgets, adapts concurrency to throttling, and serves interactive calls first
+"""
+import os
+import re
+import time
+import heapq
+import asyncio
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Iterator
+from .shared_state import SharedStateBackend, get_shared_backend
+
+# Lower values are scheduled first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 1
+PRIORITY_BULK = 2
+
+# Priority of the request running in this context
+request_priority: ContextVar[int] = ContextVar("request_priority", default=PRIORITY_STANDARD)
+
+@contextmanager
+def prioritized(priority: int) -> Iterator[None]:
+    """Run LLM calls made inside the block at the given priority"""
+    token = request_priority.set(priority)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+class RateLimitExceeded(Exception):
+    """Raised when an LLM call cannot be admitted or Gemini itself throttles it"""
+
+    def __init__(self, message: str, retry_after: float = 1.0, upstream: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        # True when Gemini returned the 429, False when the local scheduler refused the call
+        self.upstream = upstream
+
+# "429" only counts as a whole word, so token counts such as 14290 are not throttling
+RATE_LIMIT_PATTERN = re.compile(r"\b429\b|resource_exhausted|rate limit")
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Recognise Gemini 429 / RESOURCE_EXHAUSTED errors however the client wraps them"""
+    if isinstance(error, RateLimitExceeded):
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and not isinstance(status, bool):
+        return status == 429
+    return RATE_LIMIT_PATTERN.search(str(error).lower()) is not None
+
+class _Waiter:
+    """A queued call waiting for a concurrency slot and budget"""
+
+    def __init__(self, future: "asyncio.Future[List[float]]", tokens: int):
+        self.future = future
+        self.tokens = tokens
+
+class SharedBudget:
+    """Per-minute request and token counters in the shared backend, so worker processes split one quota"""
+
+    def __init__(self, backend: SharedStateBackend, requests_per_minute: int, tokens_per_minute: int):
+        self.backend = backend
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.waits = 0
+
+    def _try_reserve(self, tokens: int) -> float:
+        """Charge one call to the current window; return 0 or the seconds until the next window"""
+        now = time.time()
+        window = int(now // 60)
+        requests = self.backend.incr(f"llm_budget:rpm:{window}", 1, 120)
+        used = self.backend.incr(f"llm_budget:tpm:{window}", tokens, 120)
+        # A call larger than the whole token budget runs alone in an empty window rather than never
+        over_tokens = self.tokens_per_minute and used > self.tokens_per_minute and used != tokens
+        if (self.requests_per_minute and requests > self.requests_per_minute) or over_tokens:
+            self.backend.incr(f"llm_budget:rpm:{window}", -1, 120)
+            self.backend.incr(f"llm_budget:tpm:{window}", -tokens, 120)
+            return (window + 1) * 60 - now
+        return 0.0
+
+    async def reserve(self, tokens: int, max_wait: float) -> int:
+        """Wait for room in the shared budget; return the minute window that was charged"""
+        deadline = time.monotonic() + max_wait if max_wait else None
+        while True:
+            delay = await asyncio.to_thread(self._try_reserve, tokens)
+            if delay == 0:
+                return int(time.time() // 60)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise RateLimitExceeded("Shared LLM budget exhausted", retry_after=delay)
+            self.waits += 1
+            await asyncio.sleep(delay)
+
+    async def adjust(self, window: int, token_delta: int) -> None:
+        """Correct a window's token count once real usage is known"""
+        if token_delta:
+            await asyncio.to_thread(self.backend.incr, f"llm_budget:tpm:{window}", token_delta, 120)
+
+    def stats(self) -> Dict[str, Any]:
+        window = int(time.time() // 60)
+        return {
+            "backend": self.backend.name,
+            "requests_this_minute": int(self.backend.get(f"llm_budget:rpm:{window}") or 0),
+            "tokens_this_minute": int(self.backend.get(f"llm_budget:tpm:{window}") or 0),
+            "waits": self.waits
+        }
+
+class LLMScheduler:
+    """Priority queue in front of the LLM with RPM/TPM budgets and AIMD concurrency control"""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 initial_concurrency: int = 8, min_concurrency: int = 1, max_concurrency: int = 64,
+                 target_latency: float = 30.0, max_queue_wait: float = 60.0, max_queue_size: int = 1000,
+                 shared_budget: Optional[SharedBudget] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.target_latency = target_latency
+        self.max_queue_wait = max_queue_wait
+        self.max_queue_size = max_queue_size
+        self.in_flight = 0
+        self._queue: List[Any] = []
+        self._sequence = itertools.count()
+        # [admitted_at, tokens] for every call admitted in the last minute
+        self._window: "deque[List[float]]" = deque()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        # Set when several worker processes must share the per-minute budgets
+        self.shared_budget = shared_budget
+        self.completed = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    def _prune(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - 60:
+            self._window.popleft()
+
+    def _budget_delay(self, tokens: int, now: float) -> float:
+        """Seconds until a call of this size fits both per-minute budgets"""
+        self._prune(now)
+        delay = 0.0
+        if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+            oldest = self._window[len(self._window) - self.requests_per_minute]
+            delay = max(delay, oldest[0] + 60 - now)
+
+        if self.tokens_per_minute:
+            # A call larger than the whole budget runs alone rather than never
+            tokens = min(tokens, self.tokens_per_minute)
+            used = sum(entry[1] for entry in self._window)
+            for entry in self._window:
+                if used + tokens <= self.tokens_per_minute:
+                    break
+                used -= entry[1]
+                delay = max(delay, entry[0] + 60 - now)
+        return delay
+
+    def _admit(self, tokens: int, now: float) -> List[float]:
+        self.in_flight += 1
+        entry = [now, float(tokens)]
+        self._window.append(entry)
+        return entry
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(self.min_concurrency, int(self.limit))
+
+    def _dispatch(self) -> None:
+        """Admit queued calls in priority order while slots and budget allow"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        now = time.monotonic()
+        while self._queue:
+            waiter = self._queue[0][2]
+            if waiter.future.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if not self._has_capacity():
+                return
+            delay = self._budget_delay(waiter.tokens, now)
+            if delay > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            waiter.future.set_result(self._admit(waiter.tokens, now))
+
+    async def acquire(self, tokens: int) -> List[float]:
+        """Wait for a concurrency slot and budget, highest priority first"""
+        now = time.monotonic()
+        if not self._queue and self._has_capacity() and self._budget_delay(tokens, now) == 0:
+            return self._admit(tokens, now)
+
+        if len(self._queue) >= self.max_queue_size:
+            self.rejected += 1
+            raise RateLimitExceeded("LLM request queue is full", retry_after=5.0)
+
+        future: "asyncio.Future[List[float]]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (request_priority.get(), next(self._sequence), _Waiter(future, tokens)))
+        self._dispatch()
+
+        try:
+            return await asyncio.wait_for(future, self.max_queue_wait or None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # The slot may have been granted just as the wait ended
+            if future.done() and not future.cancelled():
+                self._release(future.result())
+            if isinstance(e, asyncio.CancelledError):
+                self.cancelled += 1
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected += 1
+                raise RateLimitExceeded("Timed out waiting for LLM capacity", retry_after=5.0) from e
+            raise
+
+    def _release(self, entry: List[float], actual_tokens: Optional[int] = None) -> None:
+        self.in_flight -= 1
+        if actual_tokens is not None:
+            entry[1] = float(actual_tokens)
+        self._dispatch()
+
+    def _on_success(self, latency: float) -> None:
+        """Additive increase while latency is healthy, gentle decrease when it is not"""
+        self.completed += 1
+        if latency > self.target_latency:
+            self.limit = max(float(self.min_concurrency), self.limit * 0.9)
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def _on_throttled(self) -> None:
+        """Multiplicative decrease when Gemini answers with a 429"""
+        self.throttled += 1
+        self.limit = max(float(self.min_concurrency), self.limit * 0.5)
+
+    async def run(self, call: Callable[[], Awaitable[Any]], estimated_tokens: int) -> Any:
+        """Run one LLM call under the scheduler's budgets and concurrency limit"""
+        entry = await self.acquire(estimated_tokens)
+        window = None
+        if self.shared_budget is not None:
+            try:
+                window = await self.shared_budget.reserve(estimated_tokens, self.max_queue_wait)
+            except BaseException:
+                self._release(entry)
+                raise
+
+        started = time.monotonic()
+        try:
+            response = await call()
+        except BaseException as e:
+            self._release(entry)
+            if isinstance(e, asyncio.CancelledError):
+                self.cancelled += 1
+            if isinstance(e, Exception) and is_rate_limit_error(e):
+                self._on_throttled()
+                raise RateLimitExceeded("Gemini rate limit reached", retry_after=10.0, upstream=True) from e
+            raise
+
+        # Charge the budget with real usage instead of the estimate when it is reported
+        usage = getattr(response, "usage_metadata", None) or {}
+        self._release(entry, usage.get("total_tokens"))
+        if window is not None and usage.get("total_tokens"):
+            await self.shared_budget.adjust(window, usage["total_tokens"] - estimated_tokens)
+        self._on_success(time.monotonic() - started)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._prune(now)
+        return {
+            "concurrency_limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for item in self._queue if not item[2].future.done()),
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": int(sum(entry[1] for entry in self._window)),
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "shared_budget": self.shared_budget.stats() if self.shared_budget is not None else None
+        }
+
+# Global LLM scheduler instance (0 disables a per-minute budget)
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+llm_scheduler = LLMScheduler(
+    requests_per_minute=LLM_RPM_LIMIT,
+    tokens_per_minute=LLM_TPM_LIMIT,
+    initial_concurrency=int(os.getenv("LLM_INITIAL_CONCURRENCY", "8")),
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "64")),
+    target_latency=float(os.getenv("LLM_TARGET_LATENCY_SECONDS", "30")),
+    max_queue_wait=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "60")),
+    max_queue_size=int(os.getenv("LLM_MAX_QUEUE", "1000")),
+    shared_budget=(
+        SharedBudget(get_shared_backend(), LLM_RPM_LIMIT, LLM_TPM_LIMIT)
+        if get_shared_backend().is_shared() and (LLM_RPM_LIMIT or LLM_TPM_LIMIT) else None
+    )
+)
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Helper function to get the shared LLM scheduler"""
+    return llm_scheduler
@@ -0,0 +1,176 @@
+"""
+Persistent LLM Response Store for EduAI Platform
+Keeps prompt to completion pairs on disk so warm results survive restarts
+"""
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "llm_store.sqlite3"
+)
+
+# Set while a request asked to bypass caches; reads are skipped but fresh results are still stored
+bypass_llm_store: ContextVar[bool] = ContextVar("bypass_llm_store", default=False)
+
+def make_store_key(model: str, temperature: float, max_tokens: int, messages: List[Any]) -> str:
+    """Build a stable key from the model settings and the full message list"""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [
+            [getattr(message, "type", type(message).__name__), getattr(message, "content", str(message))]
+            for message in messages
+        ]
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class LLMResponseStore:
+    """SQLite-backed completion store shared by all worker processes on a host"""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_bytes: int = 256 * 1024 * 1024,
+                 compact_every: int = 100, ttl_seconds: float = 86400.0, touch_interval: float = 300.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self.ttl_seconds = ttl_seconds
+        # Hits refresh last_access at most this often, so reads rarely become writes
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            # auto_vacuum only changes on an existing file after a VACUUM; 2 is INCREMENTAL
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                connection.execute("VACUUM")
+            # WAL lets several uvicorn workers read while one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    completion TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_completions_last_access ON completions(last_access)")
+            self._local.connection = connection
+        return connection
+
+    def _expired_before(self, now: float) -> float:
+        return now - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored completion for key, or None when it is missing or older than the TTL"""
+        connection = self._connect()
+        now = time.time()
+        row = connection.execute(
+            "SELECT completion, last_access FROM completions WHERE key = ? AND created_at > ?",
+            (key, self._expired_before(now))
+        ).fetchone()
+        if row is None:
+            return None
+        completion, last_access = row
+        if now - last_access > self.touch_interval:
+            connection.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+        return completion
+
+    def put(self, key: str, model: str, completion: str) -> None:
+        """Store a completion, compacting the store periodically"""
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO completions (key, model, completion, size, created_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, completion, len(completion.encode("utf-8")), now, now)
+        )
+
+        with self._lock:
+            self._writes += 1
+            should_compact = self._writes % self.compact_every == 0
+        if should_compact:
+            self.compact()
+
+    def compact(self) -> int:
+        """Drop expired completions, then evict least recently used ones until the store fits in max_bytes"""
+        connection = self._connect()
+        removed = connection.execute(
+            "DELETE FROM completions WHERE created_at <= ?", (self._expired_before(time.time()),)
+        ).rowcount
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            if removed:
+                connection.execute("PRAGMA incremental_vacuum")
+            return removed
+
+        # Shrink to 80% of the budget so compaction does not run on every write
+        target = int(self.max_bytes * 0.8)
+        rows = connection.execute("SELECT key, size FROM completions ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= target:
+                break
+            connection.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+
+        connection.execute("PRAGMA incremental_vacuum")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def clear(self) -> int:
+        """Remove every stored completion"""
+        connection = self._connect()
+        removed = connection.execute("DELETE FROM completions").rowcount
+        connection.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count and stored bytes"""
+        entries, total = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Async wrapper for get that keeps disk I/O off the event loop"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, model: str, completion: str) -> None:
+        """Async wrapper for put that keeps disk I/O off the event loop"""
+        await asyncio.to_thread(self.put, key, model, completion)
+
+# Global LLM response store instance (disabled with LLM_STORE_ENABLED=false)
+llm_store: Optional[LLMResponseStore] = None
+if os.getenv("LLM_STORE_ENABLED", "true").lower() not in ("0", "false", "no"):
+    llm_store = LLMResponseStore(
+        path=os.getenv("LLM_STORE_PATH", DEFAULT_STORE_PATH),
+        max_bytes=int(os.getenv("LLM_STORE_MAX_MB", "256")) * 1024 * 1024,
+        ttl_seconds=float(os.getenv("LLM_STORE_TTL_HOURS", "24")) * 3600
+    )
+
+def get_llm_store() -> Optional[LLMResponseStore]:
+    """Helper function to get the persistent LLM store, if enabled"""
+    return llm_store
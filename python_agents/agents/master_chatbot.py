@@ -2,10 +2,11 @@
 Master Agent Chatbot
 Central routing and context management for all educational agents
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 from .base_agent import BaseEducationalAgent, AgentState
+from .llm_registry import LIGHT_PROFILE
 
 class MasterChatbotAgent(BaseEducationalAgent):
     """Master agent for routing requests and managing context across all educational agents"""
@@ -43,13 +44,13 @@ class MasterChatbotAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the master chatbot workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         # Define workflow nodes
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
         workflow.add_node("analyze_context", self._analyze_context)
-        workflow.add_node("classify_intent", self._classify_intent)
+        workflow.add_node("classify_intent", self._classify_intent, profile=LIGHT_PROFILE)
         workflow.add_node("route_to_agent", self._route_to_agent)
         workflow.add_node("generate_response", self._generate_response)
         workflow.add_node("finalize", self._finalize_result)
@@ -66,7 +67,7 @@ class MasterChatbotAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _classify_intent(self, state: AgentState) -> AgentState:
+    async def _classify_intent(self, state: AgentState) -> AgentState:
         """Classify user intent and determine appropriate agent routing"""
         classification_prompt = f"""
         Classify the educational intent and recommend appropriate agent(s):
@@ -92,7 +93,7 @@ class MasterChatbotAgent(BaseEducationalAgent):
             HumanMessage(content=classification_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["intent_classification"] = response.content
         
         state.workflow_steps.append({
@@ -103,11 +104,11 @@ class MasterChatbotAgent(BaseEducationalAgent):
         
         return state
 
-    def _route_to_agent(self, state: AgentState) -> AgentState:
+    async def _route_to_agent(self, state: AgentState) -> AgentState:
         """Route to appropriate agent(s) based on classification"""
         routing_prompt = f"""
         Based on the intent classification, provide specific routing guidance:
-        Intent Analysis: {state.metadata.get('intent_classification', '')}
+        Intent Analysis: {self._context(state, 'intent_classification')}
         User Request: {state.prompt}
         
         Routing Decision:
@@ -125,7 +126,7 @@ class MasterChatbotAgent(BaseEducationalAgent):
             HumanMessage(content=routing_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["routing_decision"] = response.content
         
         state.workflow_steps.append({
@@ -136,13 +137,13 @@ class MasterChatbotAgent(BaseEducationalAgent):
         
         return state
 
-    def _generate_response(self, state: AgentState) -> AgentState:
+    async def _generate_response(self, state: AgentState) -> AgentState:
         """Generate comprehensive response with guidance"""
         response_prompt = f"""
         Generate a comprehensive educational response:
         User Request: {state.prompt}
-        Intent Classification: {state.metadata.get('intent_classification', '')}
-        Routing Decision: {state.metadata.get('routing_decision', '')}
+        Intent Classification: {self._context(state, 'intent_classification')}
+        Routing Decision: {self._context(state, 'routing_decision')}
         
         Response should include:
         1. Direct answer to the user's question
@@ -160,7 +161,7 @@ class MasterChatbotAgent(BaseEducationalAgent):
             HumanMessage(content=response_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         state.result = {
             "content": response.content,
@@ -183,12 +184,28 @@ class MasterChatbotAgent(BaseEducationalAgent):
 
     async def route_and_process(self, message: str, grades: List[int], 
                               languages: List[str] = ["English"], 
-                              context: Dict[str, Any] = {}) -> Dict[str, Any]:
+                              context: Dict[str, Any] = {},
+                              bypass_cache: bool = False) -> Dict[str, Any]:
         """Route message and provide educational guidance"""
         return await self.process(
             prompt=message,
             grades=grades,
             languages=languages,
             content_source=context.get("content_source", "prebook"),
-            metadata=context
+            metadata=context,
+            bypass_cache=bypass_cache
+        )
+
+    def stream_route_and_process(self, message: str, grades: List[int],
+                                 languages: List[str] = ["English"],
+                                 context: Dict[str, Any] = {},
+                                 bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the routed educational guidance as each workflow node completes"""
+        return self.stream_process(
+            prompt=message,
+            grades=grades,
+            languages=languages,
+            content_source=context.get("content_source", "prebook"),
+            metadata=context,
+            bypass_cache=bypass_cache
         )
\ No newline at end of file
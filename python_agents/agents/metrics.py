@@ -0,0 +1,253 @@
+"""
+Metrics and Instrumentation for EduAI Platform
+Per-node latency, token and cache statistics exposed in Prometheus text format
+"""
+import math
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+DURATION_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 120.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...],
+                   extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+class Counter:
+    """Monotonically increasing counter with labels"""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative bucket histogram with labels"""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+@dataclass
+class NodeStats:
+    """LLM usage collected while a single workflow node runs"""
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    context_tokens_saved: int = 0
+
+    def as_step_fields(self, duration_seconds: float) -> Dict[str, Any]:
+        """Return the fields recorded on the node's workflow_steps entry"""
+        return {
+            "duration_ms": round(duration_seconds * 1000, 2),
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "context_tokens_saved": self.context_tokens_saved
+        }
+
+# Stats for the node currently executing in this context
+current_node_stats: ContextVar[Optional[NodeStats]] = ContextVar("current_node_stats", default=None)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate used when the model does not report usage"""
+    return max(1, len(text or "") // 4)
+
+def record_llm_call(messages: List[Any], response: Any, cache_hit: Optional[bool] = None) -> None:
+    """Add one LLM call's token usage and cache outcome to the current node's stats"""
+    stats = current_node_stats.get()
+    if stats is None:
+        return
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    if cache_hit:
+        prompt_tokens = completion_tokens = 0
+    elif usage:
+        prompt_tokens = usage.get("input_tokens", 0)
+        completion_tokens = usage.get("output_tokens", 0)
+    else:
+        prompt_tokens = sum(estimate_tokens(str(getattr(message, "content", message))) for message in messages)
+        completion_tokens = estimate_tokens(str(getattr(response, "content", "")))
+
+    stats.llm_calls += 1
+    stats.prompt_tokens += prompt_tokens
+    stats.completion_tokens += completion_tokens
+    if cache_hit is True:
+        stats.cache_hits += 1
+    elif cache_hit is False:
+        stats.cache_misses += 1
+
+def record_context_compaction(tokens_saved: int) -> None:
+    """Add prompt tokens removed by context compaction to the current node's stats"""
+    stats = current_node_stats.get()
+    if stats is not None and tokens_saved > 0:
+        stats.context_tokens_saved += tokens_saved
+
+# Global metrics registry and instruments
+metrics_registry = MetricsRegistry()
+
+node_duration_seconds = metrics_registry.histogram(
+    "agent_node_duration_seconds", "Wall-clock time spent in each workflow node",
+    ("agent", "node", "status")
+)
+node_prompt_tokens = metrics_registry.histogram(
+    "agent_node_prompt_tokens", "Prompt tokens sent to the LLM per workflow node",
+    ("agent", "node"), TOKEN_BUCKETS
+)
+node_completion_tokens = metrics_registry.histogram(
+    "agent_node_completion_tokens", "Completion tokens received from the LLM per workflow node",
+    ("agent", "node"), TOKEN_BUCKETS
+)
+llm_calls_total = metrics_registry.counter(
+    "agent_llm_calls_total", "LLM calls made by workflow nodes", ("agent", "node")
+)
+cache_lookups_total = metrics_registry.counter(
+    "agent_cache_lookups_total", "Cache lookups by cache layer and outcome", ("cache", "agent", "result")
+)
+llm_retries_total = metrics_registry.counter(
+    "agent_llm_retries_total", "LLM calls retried after a transient failure", ("error",)
+)
+llm_hedges_total = metrics_registry.counter(
+    "agent_llm_hedges_total", "Hedged LLM calls by which request finished first", ("winner",)
+)
+
+context_tokens_saved_total = metrics_registry.counter(
+    "agent_context_tokens_saved_total", "Prompt tokens removed by compacting upstream node outputs",
+    ("agent", "node")
+)
+requests_cancelled_total = metrics_registry.counter(
+    "agent_requests_cancelled_total", "Agent requests cancelled because the client disconnected", ("endpoint",)
+)
+agent_load_seconds = metrics_registry.histogram(
+    "agent_load_seconds", "Time spent importing and building each agent on first use", ("agent", "phase")
+)
+
+def record_node_metrics(agent: str, node: str, duration_seconds: float, stats: NodeStats, status: str) -> None:
+    """Fold one node execution into the aggregated histograms"""
+    node_duration_seconds.observe(duration_seconds, agent=agent, node=node, status=status)
+    if stats.llm_calls:
+        llm_calls_total.inc(stats.llm_calls, agent=agent, node=node)
+        node_prompt_tokens.observe(stats.prompt_tokens, agent=agent, node=node)
+        node_completion_tokens.observe(stats.completion_tokens, agent=agent, node=node)
+    if stats.context_tokens_saved:
+        context_tokens_saved_total.inc(stats.context_tokens_saved, agent=agent, node=node)
+    if stats.cache_hits:
+        cache_lookups_total.inc(stats.cache_hits, cache="llm_store", agent=agent, result="hit")
+    if stats.cache_misses:
+        cache_lookups_total.inc(stats.cache_misses, cache="llm_store", agent=agent, result="miss")
+
+def record_cache_lookup(cache: str, agent: str, hit: bool) -> None:
+    """Count a response-level cache lookup"""
+    cache_lookups_total.inc(1, cache=cache, agent=agent, result="hit" if hit else "miss")
+
+def record_llm_retry(error: str) -> None:
+    """Count one retried LLM call"""
+    llm_retries_total.inc(1, error=error)
+
+def record_llm_hedge(winner: str) -> None:
+    """Count one hedged LLM call, labelled won when the hedge beat the primary"""
+    llm_hedges_total.inc(1, winner=winner)
+
+def record_request_cancelled(endpoint: str) -> None:
+    """Count one request whose agent work was cancelled after the client disconnected"""
+    requests_cancelled_total.inc(1, endpoint=endpoint)
+
+def record_agent_load(agent: str, import_seconds: float, build_seconds: float) -> None:
+    """Record how long an agent took to import and to build"""
+    agent_load_seconds.observe(import_seconds, agent=agent, phase="import")
+    agent_load_seconds.observe(build_seconds, agent=agent, phase="build")
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Helper function to get the global metrics registry"""
+    return metrics_registry
@@ -2,7 +2,7 @@
 Performance Analysis Agent
 Provides personalized learning path recommendations and performance insights
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
 from .base_agent import BaseEducationalAgent, AgentState
@@ -31,7 +31,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the performance analysis workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -56,13 +56,15 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _process_performance_data(self, state: AgentState) -> AgentState:
+    async def _process_performance_data(self, state: AgentState) -> AgentState:
         """Process student performance data comprehensively"""
+        # student_data already reaches the prompt in full through state.prompt
         data_processing_prompt = f"""
         Process comprehensive performance data:
         Student Data: {state.prompt}
         Grade Levels: {state.grades}
-        Analysis Context: {state.metadata}
+        Request Details: {self._request_input(state, exclude=["student_data"])}
+        Analysis Context: {self._context(state)}
         
         Data Processing Tasks:
         1. Analyze academic achievement patterns
@@ -80,7 +82,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
             HumanMessage(content=data_processing_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["performance_data_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -91,11 +93,11 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return state
 
-    def _identify_learning_patterns(self, state: AgentState) -> AgentState:
+    async def _identify_learning_patterns(self, state: AgentState) -> AgentState:
         """Identify individual learning patterns and preferences"""
         pattern_identification_prompt = f"""
         Identify learning patterns and preferences:
-        Performance Analysis: {state.metadata.get('performance_data_analysis', '')}
+        Performance Analysis: {self._context(state, 'performance_data_analysis')}
         Student Context: {state.prompt}
         Grade Levels: {state.grades}
         
@@ -115,7 +117,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
             HumanMessage(content=pattern_identification_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["learning_patterns"] = response.content
         
         state.workflow_steps.append({
@@ -126,12 +128,12 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return state
 
-    def _analyze_strengths_weaknesses(self, state: AgentState) -> AgentState:
+    async def _analyze_strengths_weaknesses(self, state: AgentState) -> AgentState:
         """Analyze student strengths and areas for improvement"""
         strength_analysis_prompt = f"""
         Analyze strengths and areas for improvement:
-        Performance Data: {state.metadata.get('performance_data_analysis', '')}
-        Learning Patterns: {state.metadata.get('learning_patterns', '')}
+        Performance Data: {self._context(state, 'performance_data_analysis')}
+        Learning Patterns: {self._context(state, 'learning_patterns')}
         
         Strengths and Weaknesses Analysis:
         1. Identify academic strengths and talents
@@ -149,7 +151,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
             HumanMessage(content=strength_analysis_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["strengths_weaknesses"] = response.content
         
         state.workflow_steps.append({
@@ -160,12 +162,12 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_personalized_recommendations(self, state: AgentState) -> AgentState:
+    async def _create_personalized_recommendations(self, state: AgentState) -> AgentState:
         """Create personalized intervention and support recommendations"""
         recommendations_prompt = f"""
         Create personalized recommendations:
-        Strengths/Weaknesses: {state.metadata.get('strengths_weaknesses', '')}
-        Learning Patterns: {state.metadata.get('learning_patterns', '')}
+        Strengths/Weaknesses: {self._context(state, 'strengths_weaknesses')}
+        Learning Patterns: {self._context(state, 'learning_patterns')}
         Grade Levels: {state.grades}
         
         Personalized Recommendations:
@@ -184,7 +186,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
             HumanMessage(content=recommendations_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["personalized_recommendations"] = response.content
         
         state.workflow_steps.append({
@@ -195,11 +197,11 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return state
 
-    def _design_learning_path(self, state: AgentState) -> AgentState:
+    async def _design_learning_path(self, state: AgentState) -> AgentState:
         """Design comprehensive personalized learning path"""
         learning_path_prompt = f"""
         Design personalized learning path:
-        Recommendations: {state.metadata.get('personalized_recommendations', '')}
+        Recommendations: {self._context(state, 'personalized_recommendations')}
         Student Context: {state.prompt}
         Grade Levels: {state.grades}
         Languages: {state.languages}
@@ -220,7 +222,7 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
             HumanMessage(content=learning_path_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         
         # Compile comprehensive performance analysis report
         final_analysis_report = f"""
@@ -282,13 +284,29 @@ class PerformanceAnalysisAgent(BaseEducationalAgent):
         
         return state
 
+    def _performance_inputs(self, student_data: Dict[str, Any], grades: List[int],
+                            subject: str) -> Dict[str, Any]:
+        """Map performance analysis parameters onto the workflow inputs"""
+        return {
+            "prompt": f"Analyze performance data for {subject}: {student_data}",
+            "grades": grades,
+            "languages": ["English"],
+            "content_source": "prebook",
+            "metadata": {"subject": subject, "student_data": student_data}
+        }
+
     async def analyze_performance(self, student_data: Dict[str, Any], grades: List[int], 
-                                 subject: str) -> Dict[str, Any]:
+                                 subject: str, bypass_cache: bool = False) -> Dict[str, Any]:
         """Analyze student performance and create recommendations"""
         return await self.process(
-            prompt=f"Analyze performance data for {subject}: {student_data}",
-            grades=grades,
-            languages=["English"],
-            content_source="prebook",
-            metadata={"subject": subject, "student_data": student_data}
+            **self._performance_inputs(student_data, grades, subject),
+            bypass_cache=bypass_cache
+        )
+
+    def stream_performance_analysis(self, student_data: Dict[str, Any], grades: List[int],
+                                    subject: str, bypass_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Stream performance analysis as each workflow node completes"""
+        return self.stream_process(
+            **self._performance_inputs(student_data, grades, subject),
+            bypass_cache=bypass_cache
         )
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Agent Response Cache for EduAI Platform
+Serves repeated teacher requests from memory with LRU and TTL eviction
+"""
+import os
+import re
+import copy
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from .shared_state import SharedStateBackend, get_shared_backend
+
+# Metadata keys that identify a caller or request but never change the generated content
+IGNORED_METADATA_KEYS = {"bypass_cache", "request_id", "user_id", "session_id", "timestamp"}
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize prompt text so trivially different spellings share a cache entry"""
+    return re.sub(r"\s+", " ", (prompt or "").strip().lower())
+
+def make_cache_key(agent_type: str, prompt: str, grades: List[int], languages: List[str],
+                   content_source: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable cache key from the normalized request parameters"""
+    relevant_metadata = {
+        key: value for key, value in (metadata or {}).items()
+        if key not in IGNORED_METADATA_KEYS
+    }
+    payload = {
+        "agent_type": agent_type,
+        "prompt": normalize_prompt(prompt),
+        "grades": sorted(set(grades or [])),
+        "languages": sorted(set(languages or [])),
+        "content_source": (content_source or "").lower(),
+        "metadata": relevant_metadata
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+def make_node_memo_key(agent_type: str, node: str, inputs: Dict[str, Any]) -> str:
+    """Build a memo key for one workflow node from only the inputs it declared"""
+    normalized = {}
+    for name, value in inputs.items():
+        if name == "prompt":
+            value = normalize_prompt(value)
+        elif name in ("grades", "languages"):
+            value = sorted(set(value or []))
+        elif name == "content_source":
+            value = (value or "").lower()
+        normalized[name] = value
+    serialized = json.dumps([agent_type, node, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class BaseResponseCache(ABC):
+    """Interface for pluggable agent response caches"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response under key"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        pass
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() for the event loop; caches that do I/O run it in a worker thread"""
+        return self.get(key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """set() for the event loop; caches that do I/O run it in a worker thread"""
+        self.set(key, value)
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy"""
+        pass
+
+class InMemoryResponseCache(BaseResponseCache):
+    """Process-local response cache with LRU size eviction and TTL expiry"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Callers may mutate the response, so never hand out the stored object
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+class SharedResponseCache(BaseResponseCache):
+    """Response cache kept in the shared state backend so every worker process sees one copy
+
+    A recency index in the backend bounds the cache to max_entries across all workers.
+    """
+
+    def __init__(self, backend: SharedStateBackend, namespace: str, max_entries: int = 512,
+                 ttl_seconds: float = 3600.0, touch_interval: float = 60.0):
+        self.backend = backend
+        self.namespace = namespace
+        self.index = namespace + "lru"
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Hits refresh an entry's recency at most this often, so most reads stay reads
+        self.touch_interval = touch_interval
+        self._touched: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _should_touch(self, key: str, now: float) -> bool:
+        with self._lock:
+            if now - self._touched.get(key, 0.0) < self.touch_interval:
+                return False
+            self._touched[key] = now
+            self._touched.move_to_end(key)
+            while len(self._touched) > self.max_entries:
+                self._touched.popitem(last=False)
+            return True
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        stored = self.backend.get(self.namespace + key)
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        now = time.time()
+        if self._should_touch(key, now):
+            self.backend.touch(self.index, key, now)
+        # Decoding gives every caller a fresh copy
+        return json.loads(stored)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+
+        now = time.time()
+        self.backend.set(self.namespace + key, json.dumps(value, default=str), self.ttl_seconds or None)
+        self.backend.touch(self.index, key, now)
+        self._should_touch(key, now)
+        evicted = self.backend.trim(self.index, self.max_entries)
+        for member in evicted:
+            self.backend.delete(self.namespace + member)
+        with self._lock:
+            self.evictions += len(evicted)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        self.backend.clear(self.namespace)
+        with self._lock:
+            self._touched.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        # Entries may include ones whose TTL lapsed but were not evicted yet
+        entries = self.backend.index_size(self.index)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                # Counters are per worker; entries and max_entries are shared
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def create_cache(namespace: str, max_entries: int, ttl_seconds: float) -> BaseResponseCache:
+    """Build a cache in the shared backend when one is configured, else in this process"""
+    backend = get_shared_backend()
+    if backend.is_shared():
+        return SharedResponseCache(backend, namespace, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    return InMemoryResponseCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+# Global response cache instance
+response_cache: BaseResponseCache = create_cache(
+    "response:",
+    max_entries=int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("AGENT_CACHE_TTL_SECONDS", "3600"))
+)
+
+# Global memo of individual node outputs, shared by requests that differ only downstream
+node_memo: BaseResponseCache = create_cache(
+    "node_memo:",
+    max_entries=int(os.getenv("AGENT_NODE_MEMO_MAX_ENTRIES", "2048")),
+    ttl_seconds=float(os.getenv("AGENT_NODE_MEMO_TTL_SECONDS", "3600"))
+)
+
+def get_response_cache() -> BaseResponseCache:
+    """Helper function to get the active response cache"""
+    return response_cache
+
+def set_response_cache(cache: BaseResponseCache) -> None:
+    """Helper function to plug in a different response cache implementation"""
+    global response_cache
+    response_cache = cache
+
+def get_node_memo() -> BaseResponseCache:
+    """Helper function to get the node output memo"""
+    return node_memo
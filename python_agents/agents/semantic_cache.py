@@ -0,0 +1,223 @@
+"""
+Semantic Question Cache for EduAI Platform
+Answers near-duplicate knowledge-base questions from cache using local hashed n-gram vectors
+"""
+import os
+import re
+import copy
+import json
+import time
+import zlib
+import threading
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple
+
+# Words that frame a question without changing what is being asked
+QUESTION_FRAMING_WORDS = {
+    "what", "is", "are", "was", "were", "explain", "describe", "define", "tell", "me", "us",
+    "about", "the", "a", "an", "please", "can", "could", "you", "give", "meaning", "of"
+}
+
+# Common words that carry no topic, ignored when comparing the key terms of two questions
+COMMON_WORDS = {
+    "how", "why", "when", "where", "which", "who", "whom", "whose", "do", "does", "did", "many",
+    "much", "there", "in", "on", "at", "to", "for", "from", "by", "with", "and", "or", "it", "its",
+    "this", "that", "these", "those", "be", "been", "has", "have", "had", "some", "any", "all",
+    "into", "between", "our", "we", "i", "my", "your", "they", "their", "them"
+}
+
+class HashedNgramVectorizer:
+    """CPU-only text vectorizer using signed feature hashing of word and character n-grams"""
+
+    def __init__(self, n_features: int = 4096, char_ngrams: Tuple[int, int] = (3, 5)):
+        self.n_features = n_features
+        self.char_ngrams = char_ngrams
+
+    def normalize(self, text: str) -> str:
+        """Lowercase, strip punctuation and drop question-framing words"""
+        words = re.findall(r"\w+", (text or "").lower())
+        content_words = [word for word in words if word not in QUESTION_FRAMING_WORDS]
+        return " ".join(content_words or words)
+
+    def key_terms(self, text: str) -> Tuple[frozenset, frozenset]:
+        """Return the numbers and topic words of text; near neighbours must agree on both
+
+        Character n-grams score "World War 1" and "World War 2" as near identical, so a
+        cache hit additionally requires the same numbers and the same topic words.
+        """
+        words = re.findall(r"\w+", (text or "").lower())
+        numbers = frozenset(word for word in words if word.isdigit())
+        topic_words = frozenset(
+            word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+            for word in words
+            if not word.isdigit() and word not in QUESTION_FRAMING_WORDS and word not in COMMON_WORDS
+        )
+        return numbers, topic_words
+
+    def _features(self, text: str) -> List[str]:
+        normalized = self.normalize(text)
+        features = [f"w:{word}" for word in normalized.split()]
+        padded = f" {normalized} "
+        low, high = self.char_ngrams
+        for n in range(low, high + 1):
+            features.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        return features
+
+    def transform(self, text: str) -> np.ndarray:
+        """Return an L2-normalized float32 vector for text"""
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for feature in self._features(text):
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.n_features] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+class _Partition:
+    """Fixed-capacity vector matrix for one grade/language/source combination"""
+
+    def __init__(self, capacity: int, n_features: int):
+        self.matrix = np.zeros((capacity, n_features), dtype=np.float32)
+        self.entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+class SemanticCache:
+    """Nearest-neighbour answer cache with per grade/language similarity thresholds"""
+
+    def __init__(self, default_threshold: float = 0.95, thresholds: Optional[Dict[str, float]] = None,
+                 capacity_per_partition: int = 256, ttl_seconds: float = 86400.0,
+                 vectorizer: Optional[HashedNgramVectorizer] = None):
+        self.default_threshold = default_threshold
+        self.thresholds = thresholds or {}
+        self.capacity_per_partition = capacity_per_partition
+        self.ttl_seconds = ttl_seconds
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self._partitions: Dict[str, _Partition] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def threshold_for(self, grade: Any, language: str) -> float:
+        """Resolve the similarity threshold, most specific setting first
+
+        Threshold keys look like "8:Hindi", "8:*" or "*:Hindi".
+        """
+        for key in (f"{grade}:{language}", f"{grade}:*", f"*:{language}"):
+            if key in self.thresholds:
+                return self.thresholds[key]
+        return self.default_threshold
+
+    def _partition_key(self, grades: List[int], languages: List[str], content_source: str) -> str:
+        # Grades keep their order: answers are written for grades[0] and echo the full list
+        return json.dumps([list(grades or []), (languages or ["English"])[0], content_source])
+
+    def lookup(self, question: str, grades: List[int], languages: List[str],
+               content_source: str = "prebook") -> Optional[Dict[str, Any]]:
+        """Return a cached response for a near-duplicate question, or None"""
+        vector = self.vectorizer.transform(question)
+        terms = self.vectorizer.key_terms(question)
+        grade = grades[0] if grades else "*"
+        language = (languages or ["English"])[0]
+        threshold = self.threshold_for(grade, language)
+
+        with self._lock:
+            partition = self._partitions.get(self._partition_key(grades, languages, content_source))
+            if partition is None or partition.size == 0:
+                self.misses += 1
+                return None
+
+            similarities = partition.matrix[:partition.size] @ vector
+            now = time.time()
+            best = None
+            # Closest first, skipping neighbours that differ in a number or topic word
+            for candidate in np.argsort(-similarities):
+                similarity = float(similarities[candidate])
+                if similarity < threshold:
+                    break
+                entry = partition.entries[candidate]
+                if entry is None or (self.ttl_seconds and now - entry["stored_at"] > self.ttl_seconds):
+                    continue
+                if entry["terms"] == terms:
+                    best = int(candidate)
+                    break
+
+            if best is None:
+                self.misses += 1
+                return None
+
+            partition.last_used[best] = now
+            self.hits += 1
+            response = copy.deepcopy(entry["response"])
+
+        response.setdefault("metadata", {})["semantic_cache"] = {
+            "hit": True,
+            "similarity": round(similarity, 4),
+            "matched_question": entry["question"]
+        }
+        return response
+
+    def store(self, question: str, grades: List[int], languages: List[str],
+              response: Dict[str, Any], content_source: str = "prebook") -> None:
+        """Cache a response, evicting the least recently used entry when the partition is full"""
+        if self.capacity_per_partition <= 0:
+            return
+
+        vector = self.vectorizer.transform(question)
+        entry = {
+            "question": question,
+            "terms": self.vectorizer.key_terms(question),
+            "response": copy.deepcopy(response),
+            "stored_at": time.time()
+        }
+
+        with self._lock:
+            key = self._partition_key(grades, languages, content_source)
+            partition = self._partitions.get(key)
+            if partition is None:
+                partition = _Partition(self.capacity_per_partition, self.vectorizer.n_features)
+                self._partitions[key] = partition
+
+            if partition.size < self.capacity_per_partition:
+                slot = partition.size
+                partition.size += 1
+            else:
+                slot = int(np.argmin(partition.last_used))
+                self.evictions += 1
+
+            partition.matrix[slot] = vector
+            partition.entries[slot] = entry
+            partition.last_used[slot] = entry["stored_at"]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "partitions": len(self._partitions),
+                "entries": sum(partition.size for partition in self._partitions.values()),
+                "default_threshold": self.default_threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+# Global semantic cache instance
+semantic_cache = SemanticCache(
+    default_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    thresholds=json.loads(os.getenv("SEMANTIC_CACHE_THRESHOLDS", "{}")),
+    capacity_per_partition=int(os.getenv("SEMANTIC_CACHE_CAPACITY", "256")),
+    ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400"))
+)
+
+def get_semantic_cache() -> SemanticCache:
+    """Helper function to get the semantic question cache"""
+    return semantic_cache
@@ -0,0 +1,314 @@
+"""
+Shared State Backend for EduAI Platform
+Key-value store with expiry and counters that every worker process sees, so caches and LLM budgets are not multiplied
+"""
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SHARED_STATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "shared_state.sqlite3"
+)
+
+class SharedStateBackend(ABC):
+    """Interface for the key-value store shared by worker processes"""
+
+    name: str = "abstract"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the value for key, or None when it is missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        """Store value under key, expiring after ttl_seconds when given"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        """Atomically add amount to an integer counter, creating it with ttl_seconds; return the new value"""
+        pass
+
+    @abstractmethod
+    def clear(self, prefix: str) -> int:
+        """Delete every key and recency index starting with prefix and return how many keys were removed"""
+        pass
+
+    @abstractmethod
+    def touch(self, index: str, member: str, score: float) -> None:
+        """Record member in a recency index, replacing its previous score"""
+        pass
+
+    @abstractmethod
+    def trim(self, index: str, max_members: int) -> List[str]:
+        """Drop the lowest-scored members beyond max_members from index and return them"""
+        pass
+
+    @abstractmethod
+    def index_size(self, index: str) -> int:
+        """Return the number of members in a recency index"""
+        pass
+
+    def is_shared(self) -> bool:
+        """True when other processes see the same state"""
+        return True
+
+class InProcessBackend(SharedStateBackend):
+    """Dictionary stand-in for a single worker process"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._indexes: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str, now: float) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= now:
+            del self._entries[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(key, time.time())
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl_seconds if ttl_seconds else None)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        with self._lock:
+            now = time.time()
+            current = self._live(key, now)
+            if current is None:
+                value, expires_at = amount, now + ttl_seconds
+            else:
+                value, expires_at = int(current) + amount, self._entries[key][1]
+            self._entries[key] = (str(value), expires_at)
+            return value
+
+    def clear(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            for index in [index for index in self._indexes if index.startswith(prefix)]:
+                del self._indexes[index]
+            return len(keys)
+
+    def touch(self, index: str, member: str, score: float) -> None:
+        with self._lock:
+            self._indexes.setdefault(index, {})[member] = score
+
+    def trim(self, index: str, max_members: int) -> List[str]:
+        with self._lock:
+            members = self._indexes.get(index, {})
+            excess = len(members) - max_members
+            if excess <= 0:
+                return []
+            evicted = sorted(members, key=members.get)[:excess]
+            for member in evicted:
+                del members[member]
+            return evicted
+
+    def index_size(self, index: str) -> int:
+        with self._lock:
+            return len(self._indexes.get(index, {}))
+
+    def is_shared(self) -> bool:
+        return False
+
+class SqliteBackend(SharedStateBackend):
+    """SQLite file shared by the worker processes on one host"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DEFAULT_SHARED_STATE_PATH, purge_every: int = 500):
+        self.path = path
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS shared_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_shared_state_expires ON shared_state(expires_at)")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS shared_index (
+                    name TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (name, member)
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_shared_index_score ON shared_index(name, score)")
+            self._local.connection = connection
+        return connection
+
+    def _after_write(self) -> None:
+        """Drop expired rows every purge_every writes"""
+        with self._lock:
+            self._writes += 1
+            should_purge = self._writes % self.purge_every == 0
+        if should_purge:
+            self._connect().execute("DELETE FROM shared_state WHERE expires_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl_seconds if ttl_seconds else None)
+        )
+        self._after_write()
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM shared_state WHERE key = ?", (key,))
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        now = time.time()
+        # A single upsert is atomic across processes; an expired counter restarts from amount
+        row = self._connect().execute(
+            "INSERT INTO shared_state (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN expires_at IS NOT NULL AND expires_at <= ? THEN excluded.value "
+            "ELSE CAST(value AS INTEGER) + ? END, "
+            "expires_at = CASE WHEN expires_at IS NOT NULL AND expires_at <= ? THEN excluded.expires_at "
+            "ELSE expires_at END "
+            "RETURNING value",
+            (key, str(amount), now + ttl_seconds, now, amount, now)
+        ).fetchone()
+        self._after_write()
+        return int(row[0])
+
+    def clear(self, prefix: str) -> int:
+        connection = self._connect()
+        cursor = connection.execute(
+            "DELETE FROM shared_state WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        connection.execute("DELETE FROM shared_index WHERE substr(name, 1, ?) = ?", (len(prefix), prefix))
+        return cursor.rowcount
+
+    def touch(self, index: str, member: str, score: float) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO shared_index (name, member, score) VALUES (?, ?, ?)", (index, member, score)
+        )
+
+    def trim(self, index: str, max_members: int) -> List[str]:
+        # One statement, so two workers trimming at once cannot both evict the same members
+        rows = self._connect().execute(
+            "DELETE FROM shared_index WHERE name = ? AND member IN ("
+            "SELECT member FROM shared_index WHERE name = ? ORDER BY score DESC LIMIT -1 OFFSET ?"
+            ") RETURNING member",
+            (index, index, max_members)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def index_size(self, index: str) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM shared_index WHERE name = ?", (index,)).fetchone()[0]
+
+class RedisBackend(SharedStateBackend):
+    """Any server speaking the Redis protocol (Redis, Valkey, KeyDB, Dragonfly)"""
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", namespace: str = "eduai:"):
+        # Imported here so servers on the other backends do not pay for the client at startup
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("AGENT_SHARED_BACKEND=redis requires the redis package")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.namespace = namespace
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(self.namespace + key)
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        self.client.set(self.namespace + key, value, px=int(ttl_seconds * 1000) if ttl_seconds else None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.namespace + key)
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        pipeline = self.client.pipeline()
+        pipeline.incrby(self.namespace + key, amount)
+        pipeline.pttl(self.namespace + key)
+        value, ttl = pipeline.execute()
+        # Only a counter without expiry gets one, so an existing window is not extended
+        if ttl == -1:
+            self.client.pexpire(self.namespace + key, int(ttl_seconds * 1000))
+        return int(value)
+
+    def clear(self, prefix: str) -> int:
+        # Recency indexes are sorted sets under the same prefix, so they go too
+        keys = list(self.client.scan_iter(match=f"{self.namespace}{prefix}*", count=500))
+        return self.client.delete(*keys) if keys else 0
+
+    def touch(self, index: str, member: str, score: float) -> None:
+        self.client.zadd(self.namespace + index, {member: score})
+
+    def trim(self, index: str, max_members: int) -> List[str]:
+        excess = self.client.zcard(self.namespace + index) - max_members
+        if excess <= 0:
+            return []
+        evicted = self.client.zrange(self.namespace + index, 0, excess - 1)
+        # Only members this call actually removed count, so concurrent trims do not double-evict
+        return [member for member in evicted if self.client.zrem(self.namespace + index, member)]
+
+    def index_size(self, index: str) -> int:
+        return self.client.zcard(self.namespace + index)
+
+def create_shared_backend(kind: str, url: Optional[str] = None) -> SharedStateBackend:
+    """Build the backend named by AGENT_SHARED_BACKEND"""
+    if kind == "sqlite":
+        return SqliteBackend(url or DEFAULT_SHARED_STATE_PATH)
+    if kind == "redis":
+        return RedisBackend(url or "redis://localhost:6379/0")
+    if kind == "memory":
+        return InProcessBackend()
+    raise ValueError(f"Unknown shared backend: {kind}")
+
+# Global shared state backend ("memory" keeps everything inside this process)
+shared_backend = create_shared_backend(
+    os.getenv("AGENT_SHARED_BACKEND", "memory").lower(), os.getenv("AGENT_SHARED_BACKEND_URL") or None
+)
+
+def get_shared_backend() -> SharedStateBackend:
+    """Helper function to get the shared state backend"""
+    return shared_backend
@@ -0,0 +1,76 @@
+"""
+Request Coalescing for EduAI Platform
+Lets identical concurrent requests share a single in-flight agent execution
+"""
+import copy
+import json
+import asyncio
+import hashlib
+from typing import Dict, Any, Callable, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+def make_flight_key(route: str, payload: Dict[str, Any]) -> str:
+    """Build a coalescing key from the route and the full request payload"""
+    serialized = json.dumps([route, payload], sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class _Flight:
+    """A shared execution and the number of callers waiting on it"""
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces identical concurrent calls onto one in-flight execution"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run factory once per key; concurrent callers with the same key share its result"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task, key=key, flight=flight: self._forget(key, flight))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # Shield so one caller going away does not cancel the others' work
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Forget the flight now so a caller arriving before the task unwinds starts fresh work
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+        # Every caller gets its own copy of the shared result
+        return copy.deepcopy(result)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
+
+# Global request coalescer instance
+request_coalescer = SingleFlight()
+
+def get_request_coalescer() -> SingleFlight:
+    """Helper function to get the shared request coalescer"""
+    return request_coalescer
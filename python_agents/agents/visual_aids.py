@@ -5,11 +5,19 @@ Creates diagrams, flowcharts, and visual learning materials
 from typing import Dict, List, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from .base_agent import BaseEducationalAgent, AgentState
+from .base_agent import BaseEducationalAgent, FusedExecutionMixin, AgentState
 
-class VisualAidsAgent(BaseEducationalAgent):
+class VisualAidsAgent(FusedExecutionMixin, BaseEducationalAgent):
     """Agent for creating visual learning aids and diagrams"""
     
+    # Sections produced in one call when execution_mode is "fast"
+    fused_sections = [
+        ("visual_analysis", "Visual learning needs: concepts that benefit from visualization, suitable representation types, age-appropriate complexity, cognitive load, visual hierarchy and accessibility"),
+        ("visual_structure", "Visual structure and layout: overall organization, information hierarchy, visual flow, colour coding and cues, layouts for different screen sizes, interactive elements"),
+        ("visual_content", "Detailed visual content specifications: diagram specifications, SVG code for simple graphics, colour schemes, typography, icons and symbols, animation suggestions"),
+        ("grade_optimizations", "Grade-level optimizations: complexity, colours, text size and examples adapted for each target grade, plus implementation guidelines for teachers")
+    ]
+    
     def __init__(self):
         super().__init__("Visual Aids Designer")
 
@@ -31,7 +39,7 @@ class VisualAidsAgent(BaseEducationalAgent):
 
     def _build_graph(self) -> StateGraph:
         """Build the visual aids workflow"""
-        workflow = StateGraph(AgentState)
+        workflow = self._create_workflow()
         
         workflow.add_node("initialize", self._initialize_state)
         workflow.add_node("validate", self._validate_input)
@@ -45,7 +53,7 @@ class VisualAidsAgent(BaseEducationalAgent):
         workflow.set_entry_point("initialize")
         workflow.add_edge("initialize", "validate")
         workflow.add_edge("validate", "analyze_context")
-        workflow.add_edge("analyze_context", "analyze_visual_needs")
+        self._add_execution_modes(workflow, first_step="analyze_visual_needs")
         workflow.add_edge("analyze_visual_needs", "design_visual_structure")
         workflow.add_edge("design_visual_structure", "create_visual_content")
         workflow.add_edge("create_visual_content", "optimize_for_grades")
@@ -54,7 +62,7 @@ class VisualAidsAgent(BaseEducationalAgent):
         
         return workflow.compile()
 
-    def _analyze_visual_needs(self, state: AgentState) -> AgentState:
+    async def _analyze_visual_needs(self, state: AgentState) -> AgentState:
         """Analyze visual learning needs"""
         visual_analysis_prompt = f"""
         Analyze visual learning needs:
@@ -77,7 +85,7 @@ class VisualAidsAgent(BaseEducationalAgent):
             HumanMessage(content=visual_analysis_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["visual_analysis"] = response.content
         
         state.workflow_steps.append({
@@ -88,11 +96,11 @@ class VisualAidsAgent(BaseEducationalAgent):
         
         return state
 
-    def _design_visual_structure(self, state: AgentState) -> AgentState:
+    async def _design_visual_structure(self, state: AgentState) -> AgentState:
         """Design the visual structure and layout"""
         structure_prompt = f"""
         Design visual structure and layout:
-        Visual Analysis: {state.metadata.get('visual_analysis', '')}
+        Visual Analysis: {self._context(state, 'visual_analysis')}
         Content: {state.prompt}
         
         Structure Design:
@@ -111,7 +119,7 @@ class VisualAidsAgent(BaseEducationalAgent):
             HumanMessage(content=structure_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["visual_structure"] = response.content
         
         state.workflow_steps.append({
@@ -122,11 +130,11 @@ class VisualAidsAgent(BaseEducationalAgent):
         
         return state
 
-    def _create_visual_content(self, state: AgentState) -> AgentState:
+    async def _create_visual_content(self, state: AgentState) -> AgentState:
         """Create detailed visual content specifications"""
         content_creation_prompt = f"""
         Create detailed visual content specifications:
-        Visual Structure: {state.metadata.get('visual_structure', '')}
+        Visual Structure: {self._context(state, 'visual_structure')}
         Topic: {state.prompt}
         Grades: {state.grades}
         
@@ -146,7 +154,7 @@ class VisualAidsAgent(BaseEducationalAgent):
             HumanMessage(content=content_creation_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
         state.metadata["visual_content"] = response.content
         
         state.workflow_steps.append({
@@ -157,11 +165,11 @@ class VisualAidsAgent(BaseEducationalAgent):
         
         return state
 
-    def _optimize_for_grades(self, state: AgentState) -> AgentState:
+    async def _optimize_for_grades(self, state: AgentState) -> AgentState:
         """Optimize visuals for different grade levels"""
         optimization_prompt = f"""
         Optimize visuals for grade levels:
-        Visual Content: {state.metadata.get('visual_content', '')}
+        Visual Content: {self._context(state, 'visual_content')}
         Target Grades: {state.grades}
         
         Grade Optimization:
@@ -180,8 +188,19 @@ class VisualAidsAgent(BaseEducationalAgent):
             HumanMessage(content=optimization_prompt)
         ]
         
-        response = self.llm.invoke(messages)
+        response = await self._invoke_llm(messages)
+        self._compile_result(state, response.content)
+        
+        state.workflow_steps.append({
+            "step": "grade_optimization",
+            "status": "completed",
+            "message": "Visual aids optimized for all grade levels"
+        })
         
+        return state
+
+    def _compile_result(self, state: AgentState, final_section: str) -> None:
+        """Assemble the final package from the earlier sections and the last one"""
         # Compile comprehensive visual aids package
         final_visuals = f"""
         VISUAL AIDS DESIGN PACKAGE
@@ -199,7 +218,7 @@ class VisualAidsAgent(BaseEducationalAgent):
         {state.metadata.get('visual_content', '')}
         
         GRADE-LEVEL OPTIMIZATIONS:
-        {response.content}
+        {final_section}
         
         IMPLEMENTATION GUIDE:
         - Use high contrast colors for better visibility
@@ -219,11 +238,3 @@ class VisualAidsAgent(BaseEducationalAgent):
                 "implementation_ready": True
             }
         }
-        
-        state.workflow_steps.append({
-            "step": "grade_optimization",
-            "status": "completed",
-            "message": "Visual aids optimized for all grade levels"
-        })
-        
-        return state
\ No newline at end of file
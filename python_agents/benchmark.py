@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for EduAI Platform LangGraph Agent Server
+Drives every agent endpoint in-process against a synthetic LLM and reports latency and throughput
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import resource
+from typing import Dict, List, Any, Callable
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark all EduAI agent endpoints")
+    parser.add_argument("--concurrency", default="1,8,32",
+                        help="Comma-separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--requests", type=int, default=32,
+                        help="Requests per target at each concurrency level (default: 32)")
+    parser.add_argument("--targets", default="",
+                        help="Comma-separated target names to run (default: all)")
+    parser.add_argument("--latency-ms", type=float, default=800.0,
+                        help="Median synthetic LLM latency in milliseconds (default: 800)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Log-normal sigma of synthetic LLM latency (default: 0.5)")
+    parser.add_argument("--words", type=float, default=250.0,
+                        help="Mean synthetic completion length in words (default: 250)")
+    parser.add_argument("--execution-mode", choices=["quality", "fast"], default="quality",
+                        help="Execution mode sent to the generic agent endpoints (default: quality)")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Let repeated prompts hit the response caches instead of bypassing them")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="Where to write machine-readable results (default: benchmark_results.json)")
+    return parser.parse_args()
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Point the agents at the synthetic LLM before main is imported"""
+    os.environ.setdefault("LLM_BACKEND", "synthetic")
+    os.environ["LLM_SYNTHETIC_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["LLM_SYNTHETIC_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["LLM_SYNTHETIC_WORDS"] = str(args.words)
+    # The on-disk store would turn every repeated run into cache hits
+    os.environ.setdefault("LLM_STORE_ENABLED", "false")
+
+def build_targets(agent_types: List[str], execution_mode: str = "quality") -> Dict[str, Dict[str, Any]]:
+    """Map each benchmark target to its endpoint and a payload factory"""
+    def agent_payload(index: int) -> Dict[str, Any]:
+        return {"prompt": f"Explain photosynthesis with a local example #{index}",
+                "grades": [6, 7], "languages": ["English", "Hindi"], "execution_mode": execution_mode}
+
+    targets: Dict[str, Dict[str, Any]] = {
+        agent_type: {"path": f"/agents/{agent_type}/generate", "payload": agent_payload}
+        for agent_type in agent_types
+    }
+    targets["lesson-planner:create-plan"] = {
+        "path": "/agents/lesson-planner/create-plan",
+        "payload": lambda index: {"topic": f"Fractions in the market #{index}", "grades": [5],
+                                  "duration": "45 minutes", "languages": ["English"]}
+    }
+    targets["performance-analysis:analyze"] = {
+        "path": "/agents/performance-analysis/analyze",
+        "payload": lambda index: {"student_data": {"student_id": index, "scores": [62, 71, 58, 80]},
+                                  "grades": [8], "subject": "Mathematics"}
+    }
+    targets["knowledge-base:query"] = {
+        "path": "/agents/knowledge-base/query",
+        "payload": lambda index: {"prompt": f"Why does the monsoon arrive in June? #{index}",
+                                  "grades": [7], "languages": ["English"]}
+    }
+    targets["master-chatbot:chat"] = {
+        "path": "/agents/master-chatbot/chat",
+        "payload": lambda index: {"prompt": f"Create a quiz on the water cycle #{index}",
+                                  "grades": [4], "languages": ["English"]}
+    }
+    return targets
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def process_peak_rss_mb() -> float:
+    """Peak resident set size over the whole process lifetime, not per target"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+def current_rss_mb() -> float:
+    """Current resident set size, or 0.0 where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0.0
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+
+class RssSampler:
+    """Samples current resident set size while one target runs"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self.samples.append(current_rss_mb())
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self.samples.append(current_rss_mb())
+        start = self.samples[0]
+        return {
+            "rss_start_mb": start,
+            "rss_peak_mb": max(self.samples),
+            "rss_growth_mb": round(max(self.samples) - start, 2),
+            "process_peak_rss_mb": process_peak_rss_mb()
+        }
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a periodic timer"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, float]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        lags = sorted(self.samples)
+        return {
+            "loop_lag_p99_ms": round(percentile(lags, 0.99) * 1000, 2),
+            "loop_lag_max_ms": round((lags[-1] if lags else 0.0) * 1000, 2)
+        }
+
+async def run_level(client: Any, name: str, target: Dict[str, Any], concurrency: int,
+                    total_requests: int, bypass_cache: bool, run_id: str) -> Dict[str, Any]:
+    """Send total_requests to one target with at most concurrency in flight"""
+    payload_factory: Callable[[int], Dict[str, Any]] = target["payload"]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(index: int) -> None:
+        payload = payload_factory(index)
+        payload["bypass_cache"] = bypass_cache
+        if bypass_cache:
+            # Unique prompts also keep identical requests from being coalesced
+            for field in ("prompt", "topic"):
+                if field in payload:
+                    payload[field] = f"{payload[field]} [{run_id}-c{concurrency}]"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post(target["path"], json=payload)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+
+    monitor = LoopLagMonitor()
+    rss = RssSampler()
+    monitor.start()
+    rss.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(send(index) for index in range(total_requests)))
+    elapsed = time.perf_counter() - started
+    lag = await monitor.stop()
+    memory = await rss.stop()
+
+    latencies.sort()
+    return {
+        "target": name,
+        "path": target["path"],
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "latency_p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "latency_max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+        **lag,
+        **memory
+    }
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from main import app, agents
+
+    # The in-process transport skips startup hooks, so build every agent before timing anything
+    started = time.perf_counter()
+    await agents.prewarm()
+    print(f"🧩 Prewarmed {len(agents.keys())} agents in {time.perf_counter() - started:.1f}s")
+
+    targets = build_targets(list(agents.keys()), args.execution_mode)
+    if args.targets:
+        selected = [name.strip() for name in args.targets.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in targets]
+        if unknown:
+            raise SystemExit(f"Unknown targets: {', '.join(unknown)}. Available: {', '.join(targets)}")
+        targets = {name: targets[name] for name in selected}
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    run_id = str(int(time.time()))
+    results: List[Dict[str, Any]] = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for name, target in targets.items():
+            for concurrency in levels:
+                result = await run_level(client, name, target, concurrency, args.requests,
+                                         not args.use_cache, run_id)
+                results.append(result)
+                print(f"{name:32} c={concurrency:<4} {result['requests_per_second']:>8.2f} req/s  "
+                      f"p50={result['latency_p50_ms']:>8.1f}ms  p95={result['latency_p95_ms']:>8.1f}ms  "
+                      f"p99={result['latency_p99_ms']:>8.1f}ms  lag_p99={result['loop_lag_p99_ms']:>6.1f}ms  "
+                      f"rss={result['rss_peak_mb']:.0f}MB (+{result['rss_growth_mb']:.1f})  errors={sum(result['errors'].values())}")
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "llm_backend": os.environ.get("LLM_BACKEND"),
+            "concurrency": levels,
+            "requests_per_level": args.requests,
+            "latency_ms": args.latency_ms,
+            "latency_sigma": args.latency_sigma,
+            "words": args.words,
+            "execution_mode": args.execution_mode,
+            "use_cache": args.use_cache
+        },
+        "results": results
+    }
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    print("📊 EduAI Platform - Agent Benchmark")
+    print(f"🤖 LLM backend: {os.environ['LLM_BACKEND']} ({arguments.latency_ms:.0f}ms median latency)")
+    print("=" * 60)
+
+    report = asyncio.run(run_benchmark(arguments))
+    with open(arguments.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"✅ Results written to {arguments.output}")
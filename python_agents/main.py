@@ -3,33 +3,86 @@ EduAI Platform - LangGraph Agent Server
 Multi-Grade Teaching Assistant with 11 Specialized AI Agents
 """
 import os
-from typing import Dict, List, Any, Optional
-from fastapi import FastAPI, HTTPException
+import json
+import time
+import asyncio
+
+# Wall-clock reference for the import-time profile printed at startup
+IMPORT_STARTED = time.perf_counter()
+
+from typing import Dict, List, Any, Optional, AsyncIterator, Awaitable, Literal
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from agents.content_generator import ContentGeneratorAgent
-from agents.differentiated_materials import DifferentiatedMaterialsAgent
-from agents.lesson_planner import LessonPlannerAgent
-from agents.knowledge_base import KnowledgeBaseAgent
-from agents.visual_aids import VisualAidsAgent
-from agents.gamified_teaching import GamifiedTeachingAgent
-from agents.classroom_analytics import ClassroomAnalyticsAgent
-from agents.audio_assessment import AudioAssessmentAgent
-from agents.master_chatbot import MasterChatbotAgent
-from agents.performance_analysis import PerformanceAnalysisAgent
-from agents.ar_integration import ARIntegrationAgent
+# orjson and brotli-asgi are optional speedups; the stdlib json encoder and gzip are the fallbacks
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
+from agents.agent_registry import AgentRegistry
+from agents.response_cache import get_response_cache, get_node_memo
+from agents.shared_state import get_shared_backend
+from agents.llm_store import get_llm_store
+from agents.single_flight import get_request_coalescer, make_flight_key
+from agents.metrics import get_metrics_registry, record_request_cancelled
+from agents.job_queue import get_job_queue
+from agents.llm_scheduler import (
+    get_llm_scheduler, prioritized, RateLimitExceeded, PRIORITY_INTERACTIVE, PRIORITY_STANDARD, PRIORITY_BULK
+)
 
 # Load environment variables
 load_dotenv()
 
+def dumps(value: Any) -> str:
+    """Serialize a payload to JSON text, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, default=str)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+class CompressionMiddleware:
+    """Brotli or gzip for large responses; event and NDJSON streams pass through unbuffered"""
+
+    STREAMING_PATHS = ("/stream", "/agents/batch")
+
+    def __init__(self, app: Any, minimum_size: int = 1024):
+        self.app = app
+        if BrotliMiddleware is not None:
+            self.compressed = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        else:
+            self.compressed = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http" and not scope["path"].endswith(self.STREAMING_PATHS):
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
 app = FastAPI(
     title="EduAI Platform API",
     description="LangGraph-powered AI agents for multi-grade Indian education",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("AGENT_COMPRESSION_MIN_BYTES", "1024")))
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -39,46 +92,252 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Report exhausted LLM capacity as 429 so clients can back off and retry"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"LLM capacity exhausted: {str(exc)}"},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))}
+    )
+
+class ClientDisconnected(Exception):
+    """The client went away before its agent request finished"""
+    pass
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request: Request, exc: ClientDisconnected):
+    """Nobody is listening any more; 499 only shows up in access logs"""
+    return JSONResponse(status_code=499, content={"detail": "Client closed request"})
+
 # Request/Response Models
-class AgentRequest(BaseModel):
+class ResponseOptions(BaseModel):
+    # "content" drops intermediate outputs, "selected" keeps only include_metadata, "full" keeps all
+    projection: Literal["content", "selected", "full"] = "full"
+    include_metadata: List[str] = []
+
+class AgentRequest(ResponseOptions):
     prompt: str
     grades: List[int]
     languages: Optional[List[str]] = ["English"]
     content_source: str = "prebook"  # "prebook" or "external"
     metadata: Optional[Dict[str, Any]] = {}
+    bypass_cache: bool = False
+    # "fast" generates every section in one LLM call on agents that support it
+    execution_mode: Literal["quality", "fast"] = "quality"
 
 class AgentResponse(BaseModel):
     agent_type: str
     content: str
     metadata: Dict[str, Any]
-    workflow_steps: List[Dict[str, str]]
+    workflow_steps: List[Dict[str, Any]]
 
-class LessonPlanRequest(BaseModel):
+class LessonPlanRequest(ResponseOptions):
     topic: str
     grades: List[int]
     duration: str
     languages: Optional[List[str]] = ["English"]
     content_source: str = "prebook"
+    bypass_cache: bool = False
 
-class PerformanceAnalysisRequest(BaseModel):
+class PerformanceAnalysisRequest(ResponseOptions):
     student_data: Dict[str, Any]
     grades: List[int]
     subject: str
+    bypass_cache: bool = False
+
+class BatchItem(AgentRequest):
+    agent_type: str
+    item_id: Optional[str] = None  # Echoed back so clients can match results to items
+
+class JobRequest(AgentRequest):
+    agent_type: str
 
-# Initialize all agents
-agents = {
-    "content-generation": ContentGeneratorAgent(),
-    "differentiated-materials": DifferentiatedMaterialsAgent(),
-    "lesson-planner": LessonPlannerAgent(),
-    "knowledge-base": KnowledgeBaseAgent(),
-    "visual-aids": VisualAidsAgent(),
-    "gamified-teaching": GamifiedTeachingAgent(),
-    "classroom-analytics": ClassroomAnalyticsAgent(),
-    "audio-assessment": AudioAssessmentAgent(),
-    "master-chatbot": MasterChatbotAgent(),
-    "performance-analysis": PerformanceAnalysisAgent(),
-    "ar-integration": ARIntegrationAgent(),
-}
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+    max_concurrency: Optional[int] = None
+
+# Upper bounds for a single batch request
+BATCH_MAX_ITEMS = int(os.getenv("AGENT_BATCH_MAX_ITEMS", "200"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("AGENT_BATCH_MAX_CONCURRENCY", "8"))
+
+def agent_metadata(request: AgentRequest) -> Dict[str, Any]:
+    """Request metadata plus the execution mode the agent workflow branches on"""
+    return {**(request.metadata or {}), "execution_mode": request.execution_mode}
+
+async def coalesce(route: str, request: BaseModel, factory):
+    """Attach identical concurrent requests to one in-flight agent execution"""
+    # Requests that differ only in how the response is projected share the execution
+    key = make_flight_key(route, request.model_dump(exclude=set(ResponseOptions.model_fields)))
+    return await get_request_coalescer().do(key, factory)
+
+# Response metadata that describes the request rather than an intermediate workflow output
+RESPONSE_METADATA_KEYS = ("agent_name", "grades", "languages", "content_source", "execution_mode")
+
+def project_response(result: Dict[str, Any], options: Optional[ResponseOptions]) -> Dict[str, Any]:
+    """Trim intermediate outputs from an agent result according to the requested projection"""
+    if options is None or options.projection == "full":
+        return result
+    
+    keep = set(RESPONSE_METADATA_KEYS)
+    if options.projection == "selected":
+        keep.update(options.include_metadata)
+    metadata = {key: value for key, value in result["metadata"].items() if key in keep}
+    return {**result, "metadata": metadata}
+
+def build_response(agent_type: str, result: Dict[str, Any],
+                   options: Optional[ResponseOptions] = None) -> AgentResponse:
+    """Shape an agent result into the API response, applying the projection"""
+    result = project_response(result, options)
+    return AgentResponse(
+        agent_type=agent_type,
+        content=result["content"],
+        metadata=result["metadata"],
+        workflow_steps=result["workflow_steps"]
+    )
+
+# How often a running request checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = float(os.getenv("AGENT_DISCONNECT_POLL_SECONDS", "0.5"))
+
+async def wait_for_disconnect(http_request: Request) -> None:
+    """Return once the client has closed the connection"""
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+async def cancel_on_disconnect(http_request: Request, work: Awaitable[Any]) -> Any:
+    """Await work, cancelling it and its pending LLM calls if the client disconnects first"""
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        
+        # Coalesced work keeps running while another identical request still waits on it
+        task.cancel()
+        record_request_cancelled(http_request.url.path)
+        raise ClientDisconnected()
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+
+async def stream_until_disconnected(http_request: Request,
+                                    events: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Relay a stream produced in its own task, cancelling that task once the client is gone"""
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    finished = object()
+    
+    async def produce():
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(finished)
+    
+    async def watch(producer: asyncio.Task):
+        await wait_for_disconnect(http_request)
+        if not producer.done():
+            producer.cancel()
+            record_request_cancelled(http_request.url.path)
+    
+    producer = asyncio.ensure_future(produce())
+    watcher = asyncio.ensure_future(watch(producer))
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        watcher.cancel()
+        # The server stopped reading (client gone or response aborted) before the stream ended
+        if not producer.done():
+            producer.cancel()
+            record_request_cancelled(http_request.url.path)
+
+def sse_response(agent_type: str, events: AsyncIterator[Dict[str, Any]],
+                 priority: int = PRIORITY_STANDARD,
+                 options: Optional[ResponseOptions] = None,
+                 http_request: Optional[Request] = None) -> StreamingResponse:
+    """Send agent workflow events to the client as Server-Sent Events"""
+    async def event_source():
+        try:
+            with prioritized(priority):
+                # Stop the workflow as soon as the client is gone, not at the next event
+                stream = events if http_request is None else stream_until_disconnected(http_request, events)
+                async for event in stream:
+                    data = event["data"]
+                    if event["event"] == "result":
+                        data = {"agent_type": agent_type, **project_response(data, options)}
+                    yield f"event: {event['event']}\ndata: {dumps(data)}\n\n"
+        except RateLimitExceeded as e:
+            error = {"detail": str(e), "status_code": 429, "retry_after": e.retry_after}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+        except Exception as e:
+            error = {"detail": f"Agent processing failed: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# All agents, each imported and built on first use (or by the startup prewarm)
+agents = AgentRegistry({
+    "content-generation": "agents.content_generator:ContentGeneratorAgent",
+    "differentiated-materials": "agents.differentiated_materials:DifferentiatedMaterialsAgent",
+    "lesson-planner": "agents.lesson_planner:LessonPlannerAgent",
+    "knowledge-base": "agents.knowledge_base:KnowledgeBaseAgent",
+    "visual-aids": "agents.visual_aids:VisualAidsAgent",
+    "gamified-teaching": "agents.gamified_teaching:GamifiedTeachingAgent",
+    "classroom-analytics": "agents.classroom_analytics:ClassroomAnalyticsAgent",
+    "audio-assessment": "agents.audio_assessment:AudioAssessmentAgent",
+    "master-chatbot": "agents.master_chatbot:MasterChatbotAgent",
+    "performance-analysis": "agents.performance_analysis:PerformanceAnalysisAgent",
+    "ar-integration": "agents.ar_integration:ARIntegrationAgent",
+})
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
+# Set AGENT_PREWARM=false to build agents only when a request first needs them
+PREWARM_AGENTS = os.getenv("AGENT_PREWARM", "true").lower() not in ("0", "false", "no")
+prewarm_task: Optional[asyncio.Task] = None
+
+async def run_job(agent_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: run a persisted generic agent request at bulk priority"""
+    with prioritized(PRIORITY_BULK):
+        response = await run_agent(agent_type, AgentRequest(**payload))
+    return response.model_dump()
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the job worker pool and resume jobs interrupted by the last shutdown"""
+    resumed = await get_job_queue().start(run_job)
+    if resumed:
+        print(f"🔁 Resumed {resumed} queued agent jobs")
+
+@app.on_event("startup")
+async def start_agent_prewarm():
+    """Report import time and build the agents in the background after startup"""
+    global prewarm_task
+    print(f"⏱️ Server modules imported in {IMPORT_SECONDS * 1000:.0f} ms")
+    if PREWARM_AGENTS:
+        prewarm_task = asyncio.create_task(agents.prewarm())
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+    await get_job_queue().stop()
+    # Imported here rather than at module level to keep server startup fast
+    from agents.checkpointing import get_checkpointer
+    if get_checkpointer() is not None:
+        await get_checkpointer().aclose()
 
 @app.get("/")
 async def root():
@@ -88,127 +347,299 @@ async def root():
         "version": "1.0.0"
     }
 
+async def run_agent(agent_type: str, request: AgentRequest) -> AgentResponse:
+    """Run one generic agent request, sharing in-flight work with identical requests"""
+    agent = await agents.load(agent_type)
+    result = await coalesce(
+        f"/agents/{agent_type}/generate", request,
+        lambda: agent.process(
+            prompt=request.prompt,
+            grades=request.grades,
+            languages=request.languages,
+            content_source=request.content_source,
+            metadata=agent_metadata(request),
+            bypass_cache=request.bypass_cache
+        )
+    )
+    
+    return build_response(agent_type, result, request)
+
 @app.post("/agents/{agent_type}/generate", response_model=AgentResponse)
-async def generate_content(agent_type: str, request: AgentRequest):
+async def generate_content(agent_type: str, request: AgentRequest, http_request: Request):
     """Generate content using specified agent"""
     if agent_type not in agents:
         raise HTTPException(status_code=404, detail=f"Agent {agent_type} not found")
     
     try:
-        agent = agents[agent_type]
-        result = await agent.process(
-            prompt=request.prompt,
-            grades=request.grades,
-            languages=request.languages,
-            content_source=request.content_source,
-            metadata=request.metadata
-        )
-        
-        return AgentResponse(
-            agent_type=agent_type,
-            content=result["content"],
-            metadata=result["metadata"],
-            workflow_steps=result["workflow_steps"]
-        )
+        return await cancel_on_disconnect(http_request, run_agent(agent_type, request))
     
+    except (RateLimitExceeded, ClientDisconnected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Agent processing failed: {str(e)}")
 
 @app.post("/agents/lesson-planner/create-plan")
-async def create_lesson_plan(request: LessonPlanRequest):
+async def create_lesson_plan(request: LessonPlanRequest, http_request: Request):
     """Create a comprehensive lesson plan"""
     try:
-        agent = agents["lesson-planner"]
-        result = await agent.create_lesson_plan(
-            topic=request.topic,
-            grades=request.grades,
-            duration=request.duration,
-            languages=request.languages,
-            content_source=request.content_source
-        )
+        agent = await agents.load("lesson-planner")
+        result = await cancel_on_disconnect(http_request, coalesce(
+            "/agents/lesson-planner/create-plan", request,
+            lambda: agent.create_lesson_plan(
+                topic=request.topic,
+                grades=request.grades,
+                duration=request.duration,
+                languages=request.languages,
+                content_source=request.content_source,
+                bypass_cache=request.bypass_cache
+            )
+        ))
         
-        return AgentResponse(
-            agent_type="lesson-planner",
-            content=result["content"],
-            metadata=result["metadata"],
-            workflow_steps=result["workflow_steps"]
-        )
+        return build_response("lesson-planner", result, request)
     
+    except (RateLimitExceeded, ClientDisconnected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Lesson planning failed: {str(e)}")
 
 @app.post("/agents/performance-analysis/analyze")
-async def analyze_performance(request: PerformanceAnalysisRequest):
+async def analyze_performance(request: PerformanceAnalysisRequest, http_request: Request):
     """Analyze student performance and provide recommendations"""
     try:
-        agent = agents["performance-analysis"]
-        result = await agent.analyze_performance(
-            student_data=request.student_data,
-            grades=request.grades,
-            subject=request.subject
-        )
+        agent = await agents.load("performance-analysis")
+        result = await cancel_on_disconnect(http_request, coalesce(
+            "/agents/performance-analysis/analyze", request,
+            lambda: agent.analyze_performance(
+                student_data=request.student_data,
+                grades=request.grades,
+                subject=request.subject,
+                bypass_cache=request.bypass_cache
+            )
+        ))
         
-        return AgentResponse(
-            agent_type="performance-analysis",
-            content=result["content"],
-            metadata=result["metadata"],
-            workflow_steps=result["workflow_steps"]
-        )
+        return build_response("performance-analysis", result, request)
     
+    except (RateLimitExceeded, ClientDisconnected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Performance analysis failed: {str(e)}")
 
 @app.post("/agents/knowledge-base/query")
-async def comprehensive_knowledge_query(request: AgentRequest):
+async def comprehensive_knowledge_query(request: AgentRequest, http_request: Request):
     """Comprehensive Q&A using NCERT textbooks and external sources"""
     try:
-        agent = agents["knowledge-base"]
-        result = await agent.process_comprehensive_query(
-            question=request.prompt,
-            grades=request.grades,
-            languages=request.languages,
-            context=request.metadata
-        )
+        agent = await agents.load("knowledge-base")
+        result = await cancel_on_disconnect(http_request, coalesce(
+            "/agents/knowledge-base/query", request,
+            lambda: agent.process_comprehensive_query(
+                question=request.prompt,
+                grades=request.grades,
+                languages=request.languages,
+                context=request.metadata,
+                bypass_cache=request.bypass_cache
+            )
+        ))
         
-        return AgentResponse(
-            agent_type="knowledge-base",
-            content=result["content"],
-            metadata=result["metadata"],
-            workflow_steps=result["workflow_steps"]
-        )
+        return build_response("knowledge-base", result, request)
     
+    except (RateLimitExceeded, ClientDisconnected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Knowledge base query failed: {str(e)}")
 
 @app.post("/agents/master-chatbot/chat")
-async def chat_with_master(request: AgentRequest):
+async def chat_with_master(request: AgentRequest, http_request: Request):
     """Chat with the master agent for routing and context management"""
     try:
-        agent = agents["master-chatbot"]
-        result = await agent.route_and_process(
-            message=request.prompt,
-            grades=request.grades,
-            languages=request.languages,
-            context=request.metadata
-        )
+        agent = await agents.load("master-chatbot")
+        # Chat is interactive, so its LLM calls jump ahead of bulk generation
+        with prioritized(PRIORITY_INTERACTIVE):
+            result = await cancel_on_disconnect(http_request, coalesce(
+                "/agents/master-chatbot/chat", request,
+                lambda: agent.route_and_process(
+                    message=request.prompt,
+                    grades=request.grades,
+                    languages=request.languages,
+                    context=request.metadata,
+                    bypass_cache=request.bypass_cache
+                )
+            ))
         
-        return AgentResponse(
-            agent_type="master-chatbot",
-            content=result["content"],
-            metadata=result["metadata"],
-            workflow_steps=result["workflow_steps"]
-        )
+        return build_response("master-chatbot", result, request)
     
+    except (RateLimitExceeded, ClientDisconnected):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Master chatbot failed: {str(e)}")
 
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a long-running agent request and return a job id to poll"""
+    if request.agent_type not in agents:
+        raise HTTPException(status_code=404, detail=f"Agent {request.agent_type} not found")
+    
+    payload = request.model_dump(include=set(AgentRequest.model_fields))
+    job_id = await get_job_queue().submit(request.agent_type, payload)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+@app.get("/jobs")
+async def get_job_stats():
+    """Get job counts by status and local worker pool usage"""
+    queue = get_job_queue()
+    return {**queue.stats(), **await asyncio.to_thread(queue.store.stats)}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Return the status of a job, with its result once it has finished"""
+    job = await get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    queue = get_job_queue()
+    if not await queue.cancel(job_id):
+        job = await queue.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        raise HTTPException(status_code=409, detail=f"Job {job_id} already {job['status']}")
+    return {"job_id": job_id, "status": "cancelled"}
+
+@app.post("/agents/batch")
+async def generate_batch(batch: BatchRequest, http_request: Request):
+    """Run many agent requests with bounded parallelism, streaming each result as NDJSON"""
+    if len(batch.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_ITEMS} items")
+    
+    concurrency = max(1, min(batch.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    
+    async def run_item(index: int, item: BatchItem, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        outcome = {"index": index, "item_id": item.item_id, "agent_type": item.agent_type}
+        if item.agent_type not in agents:
+            return {**outcome, "status": "failed",
+                    "error": {"status_code": 404, "detail": f"Agent {item.agent_type} not found"}}
+        
+        # Strip the batch-only fields so items coalesce with plain /generate requests
+        request = AgentRequest(**item.model_dump(include=set(AgentRequest.model_fields)))
+        started = time.perf_counter()
+        try:
+            async with semaphore:
+                response = await run_agent(item.agent_type, request)
+            return {**outcome, "status": "succeeded", "result": response.model_dump(),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+        except RateLimitExceeded as e:
+            error = {"status_code": 429, "detail": str(e), "retry_after": e.retry_after}
+        except Exception as e:
+            error = {"status_code": 500, "detail": f"Agent processing failed: {str(e)}"}
+        return {**outcome, "status": "failed", "error": error,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+    
+    async def results():
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+        succeeded = 0
+        # Batch work yields to interactive traffic in the LLM scheduler
+        with prioritized(PRIORITY_BULK):
+            tasks = [asyncio.ensure_future(run_item(index, item, semaphore))
+                     for index, item in enumerate(batch.items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                succeeded += outcome["status"] == "succeeded"
+                yield dumps(outcome) + "\n"
+        finally:
+            # The client went away: stop items that have not finished
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        summary = {
+            "summary": True,
+            "total": len(batch.items),
+            "succeeded": succeeded,
+            "failed": len(batch.items) - succeeded,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        yield dumps(summary) + "\n"
+    
+    return StreamingResponse(stream_until_disconnected(http_request, results()),
+                             media_type="application/x-ndjson")
+
+# Streaming variants: each workflow step, its partial content and model tokens
+# are sent as Server-Sent Events as soon as they are produced
+@app.post("/agents/{agent_type}/generate/stream")
+async def stream_generate_content(agent_type: str, request: AgentRequest, http_request: Request):
+    """Stream content generation using specified agent"""
+    if agent_type not in agents:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_type} not found")
+    
+    agent = await agents.load(agent_type)
+    return sse_response(agent_type, agent.stream_process(
+        prompt=request.prompt,
+        grades=request.grades,
+        languages=request.languages,
+        content_source=request.content_source,
+        metadata=agent_metadata(request),
+        bypass_cache=request.bypass_cache
+    ), options=request, http_request=http_request)
+
+@app.post("/agents/lesson-planner/create-plan/stream")
+async def stream_lesson_plan(request: LessonPlanRequest, http_request: Request):
+    """Stream creation of a comprehensive lesson plan"""
+    agent = await agents.load("lesson-planner")
+    return sse_response("lesson-planner", agent.stream_lesson_plan(
+        topic=request.topic,
+        grades=request.grades,
+        duration=request.duration,
+        languages=request.languages,
+        content_source=request.content_source,
+        bypass_cache=request.bypass_cache
+    ), options=request, http_request=http_request)
+
+@app.post("/agents/performance-analysis/analyze/stream")
+async def stream_performance_analysis(request: PerformanceAnalysisRequest, http_request: Request):
+    """Stream student performance analysis and recommendations"""
+    agent = await agents.load("performance-analysis")
+    return sse_response("performance-analysis", agent.stream_performance_analysis(
+        student_data=request.student_data,
+        grades=request.grades,
+        subject=request.subject,
+        bypass_cache=request.bypass_cache
+    ), options=request, http_request=http_request)
+
+@app.post("/agents/knowledge-base/query/stream")
+async def stream_knowledge_query(request: AgentRequest, http_request: Request):
+    """Stream a comprehensive Q&A answer"""
+    agent = await agents.load("knowledge-base")
+    return sse_response("knowledge-base", agent.stream_comprehensive_query(
+        question=request.prompt,
+        grades=request.grades,
+        languages=request.languages,
+        context=request.metadata,
+        bypass_cache=request.bypass_cache
+    ), options=request, http_request=http_request)
+
+@app.post("/agents/master-chatbot/chat/stream")
+async def stream_chat_with_master(request: AgentRequest, http_request: Request):
+    """Stream a chat response from the master agent"""
+    agent = await agents.load("master-chatbot")
+    return sse_response("master-chatbot", agent.stream_route_and_process(
+        message=request.prompt,
+        grades=request.grades,
+        languages=request.languages,
+        context=request.metadata,
+        bypass_cache=request.bypass_cache
+    ), priority=PRIORITY_INTERACTIVE, options=request, http_request=http_request)
+
 @app.get("/agents/{agent_type}/status")
 async def get_agent_status(agent_type: str):
     """Get agent status and capabilities"""
     if agent_type not in agents:
         raise HTTPException(status_code=404, detail=f"Agent {agent_type} not found")
     
-    agent = agents[agent_type]
+    agent = await agents.load(agent_type)
     return {
         "agent_type": agent_type,
         "status": "active",
@@ -217,6 +648,46 @@ async def get_agent_status(agent_type: str):
         "supported_grades": agent.supported_grades
     }
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get response, node memo and semantic cache hit/miss counters"""
+    # The semantic cache pulls in numpy, so it is only imported once a handler needs it
+    from agents.semantic_cache import get_semantic_cache
+    return {
+        "shared_backend": {"backend": get_shared_backend().name, "worker_pid": os.getpid()},
+        "response_cache": await asyncio.to_thread(get_response_cache().stats),
+        "node_memo": await asyncio.to_thread(get_node_memo().stats),
+        "semantic_cache": get_semantic_cache().stats(),
+        "request_coalescing": get_request_coalescer().stats(),
+        "llm_store": await asyncio.to_thread(get_llm_store().stats) if get_llm_store() else None
+    }
+
+@app.get("/agents/registry")
+async def get_agent_registry():
+    """Get which agents are built and how long each took to import and build"""
+    return {"import_ms": round(IMPORT_SECONDS * 1000, 2), **agents.stats()}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Expose per-node latency, token and cache metrics in Prometheus text format"""
+    return PlainTextResponse(get_metrics_registry().render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/llm/scheduler")
+async def get_scheduler_stats():
+    """Get LLM budget usage, adaptive concurrency limit and queue depth"""
+    return get_llm_scheduler().stats()
+
+@app.delete("/cache")
+async def clear_cache():
+    """Clear all cached agent responses, memoized node outputs and stored LLM completions"""
+    from agents.semantic_cache import get_semantic_cache
+    await asyncio.to_thread(get_response_cache().clear)
+    await asyncio.to_thread(get_node_memo().clear)
+    get_semantic_cache().clear()
+    if get_llm_store():
+        await asyncio.to_thread(get_llm_store().clear)
+    return {"status": "cleared"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
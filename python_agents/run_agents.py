@@ -2,21 +2,55 @@
 """
 Run script for EduAI Platform LangGraph Agent Server
 """
+import os
+import argparse
 import uvicorn
-from main import app
+
+def parse_args() -> argparse.Namespace:
+    """Command line options, each defaulting to its environment variable"""
+    parser = argparse.ArgumentParser(description="EduAI Platform - LangGraph Agent Server")
+    parser.add_argument("--host", default=os.getenv("AGENT_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("AGENT_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("AGENT_WORKERS", "1")),
+                        help="Number of worker processes (production mode)")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("AGENT_PRODUCTION", "false").lower() in ("1", "true", "yes"),
+                        help="Disable auto-reload and run the configured number of workers")
+    parser.add_argument("--shared-backend", choices=["memory", "sqlite", "redis"],
+                        default=os.getenv("AGENT_SHARED_BACKEND", "memory"),
+                        help="Where caches, LLM budgets and counters shared by workers live")
+    parser.add_argument("--shared-backend-url", default=os.getenv("AGENT_SHARED_BACKEND_URL"),
+                        help="SQLite file path or redis:// URL for the shared backend")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
+    production = args.production or args.workers > 1
+
+    # Separate processes cannot share an in-memory backend
+    if args.workers > 1 and args.shared_backend == "memory":
+        print("⚠️ In-memory state is per process; using the sqlite shared backend for multiple workers")
+        args.shared_backend = "sqlite"
+
+    # Workers import main themselves, so configuration travels through the environment
+    os.environ["AGENT_SHARED_BACKEND"] = args.shared_backend
+    if args.shared_backend_url:
+        os.environ["AGENT_SHARED_BACKEND_URL"] = args.shared_backend_url
+
     print("🚀 Starting EduAI Platform - LangGraph Agent Server")
     print("📚 11 Specialized Educational Agents Ready")
     print("🌍 Multi-language support: Hindi, English, Tamil, Telugu, and more")
     print("🎯 Grade levels: 1st-12th standard")
     print("📖 Content sources: NCERT and External materials")
+    if production:
+        print(f"🏭 Production mode: {args.workers} worker(s), shared backend: {args.shared_backend}")
     print("=" * 60)
     
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        reload=not production,
+        workers=args.workers if production else None,
         log_level="info"
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,21 @@
+"""
+Test configuration for the EduAI agent server
+Runs every agent offline against the synthetic LLM backend with throwaway stores
+"""
+import os
+import sys
+import tempfile
+
+# Environment must be in place before any agents module reads it at import time
+STATE_DIR = tempfile.mkdtemp(prefix="eduai-tests-")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ["LLM_BACKEND"] = "synthetic"
+os.environ["LLM_SYNTHETIC_LATENCY_MS"] = "1"
+os.environ["LLM_STORE_ENABLED"] = "false"
+os.environ["AGENT_PREWARM"] = "false"
+os.environ["AGENT_SHARED_BACKEND"] = "memory"
+os.environ["LLM_STORE_PATH"] = os.path.join(STATE_DIR, "llm_store.sqlite3")
+os.environ["AGENT_CHECKPOINT_PATH"] = os.path.join(STATE_DIR, "checkpoints.sqlite3")
+os.environ["AGENT_JOB_STORE_PATH"] = os.path.join(STATE_DIR, "jobs.sqlite3")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
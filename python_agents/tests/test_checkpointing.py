@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from agents.checkpointing import get_checkpointer
+from agents.shared_state import get_shared_backend
+from agents.visual_aids import VisualAidsAgent
+
+class FlakyVisualAidsAgent(VisualAidsAgent):
+    """Fails once in the second analysis node and counts runs of the first"""
+    
+    def __init__(self):
+        self.needs_runs = 0
+        self.failures_left = 1
+        super().__init__()
+    
+    async def _analyze_visual_needs(self, state):
+        self.needs_runs += 1
+        return await super()._analyze_visual_needs(state)
+    
+    async def _design_visual_structure(self, state):
+        if self.failures_left:
+            self.failures_left -= 1
+            raise RuntimeError("transient failure")
+        return await super()._design_visual_structure(state)
+
+def test_retry_resumes_from_the_failed_node():
+    agent = FlakyVisualAidsAgent()
+    
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await agent.process("Water cycle", grades=[5], metadata={"case": "resume"})
+        return await agent.process("Water cycle", grades=[5], metadata={"case": "resume"})
+    
+    result = asyncio.run(scenario())
+    
+    assert agent.needs_runs == 1
+    assert "VISUAL AIDS DESIGN PACKAGE" in result["content"]
+
+def test_request_leased_by_another_worker_does_not_resume_its_thread(monkeypatch):
+    agent = FlakyVisualAidsAgent()
+    backend = get_shared_backend()
+    
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await agent.process("Water cycle", grades=[6], metadata={"case": "lease"})
+        # Another worker now holds the lease on the same request's thread
+        incr = backend.incr
+        monkeypatch.setattr(backend, "incr", lambda key, amount, ttl: (
+            2 if key.startswith("checkpoint_lease:") else incr(key, amount, ttl)
+        ))
+        await agent.process("Water cycle", grades=[6], metadata={"case": "lease"})
+    
+    asyncio.run(scenario())
+    
+    assert agent.needs_runs == 2
+
+def test_purge_drops_abandoned_threads(monkeypatch):
+    agent = FlakyVisualAidsAgent()
+    checkpointer = get_checkpointer()
+    
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await agent.process("Water cycle", grades=[7], metadata={"case": "purge"})
+        saver = await checkpointer._ready()
+        before = await saver.conn.execute_fetchall("SELECT COUNT(*) FROM checkpoint_threads")
+        monkeypatch.setattr(checkpointer, "ttl_seconds", -1)
+        removed = await checkpointer.apurge()
+        after = await saver.conn.execute_fetchall("SELECT COUNT(*) FROM checkpoints")
+        await checkpointer.aclose()
+        return before[0][0], removed, after[0][0]
+    
+    before, removed, remaining = asyncio.run(scenario())
+    
+    assert before >= 1
+    assert removed == before
+    assert remaining == 0
@@ -0,0 +1,22 @@
+from agents.context_compaction import current_context_budget
+from agents.classroom_analytics import ClassroomAnalyticsAgent
+
+def test_request_input_is_passed_in_full_and_only_node_outputs_are_compacted():
+    agent = ClassroomAnalyticsAgent()
+    scores = {f"student_{index}": [60 + index % 40, 70, 80] for index in range(300)}
+    state = agent._build_initial_state("Analyze my class", [7], ["English"], "prebook",
+                                       {"class_data": scores, "execution_mode": "quality"})
+    state.metadata["context_analysis"] = "upstream analysis " * 2000
+    
+    token = current_context_budget.set(200)
+    try:
+        context = agent._context(state)
+        request_input = agent._request_input(state)
+    finally:
+        current_context_budget.reset(token)
+    
+    assert "class_data" not in context
+    assert context.startswith("context_analysis: ")
+    assert len(context) < len(state.metadata["context_analysis"])
+    assert "student_299" in request_input
+    assert "execution_mode" not in request_input
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from agents.content_generator import ContentGeneratorAgent
+
+def test_fanout_keeps_input_order_within_the_concurrency_bound():
+    async def scenario():
+        agent = ContentGeneratorAgent()
+        agent.fanout_concurrency = 2
+        running = []
+        peak = []
+        
+        async def worker(grade):
+            running.append(grade)
+            peak.append(len(running))
+            await asyncio.sleep(0.01 * (5 - grade))
+            running.remove(grade)
+            return f"grade_{grade}"
+        
+        results = await agent._gather_bounded([1, 2, 3, 4], worker)
+        assert results == ["grade_1", "grade_2", "grade_3", "grade_4"]
+        assert max(peak) == 2
+    
+    asyncio.run(scenario())
+
+def test_a_failed_item_cancels_its_siblings():
+    async def scenario():
+        agent = ContentGeneratorAgent()
+        agent.fanout_concurrency = 4
+        cancelled = []
+        
+        async def worker(grade):
+            if grade == 1:
+                await asyncio.sleep(0.01)
+                raise ValueError("grade 1 failed")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(grade)
+                raise
+        
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(agent._gather_bounded([1, 2, 3], worker), 1)
+        assert sorted(cancelled) == [2, 3]
+    
+    asyncio.run(scenario())
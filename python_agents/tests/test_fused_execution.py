@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+from agents.base_agent import BaseEducationalAgent, FusedExecutionMixin
+from agents.visual_aids import VisualAidsAgent
+
+def test_fast_mode_fills_every_section_from_one_call():
+    agent = VisualAidsAgent()
+    
+    result = asyncio.run(agent.process(
+        "Parts of a flower", grades=[5], metadata={"execution_mode": "fast"}, bypass_cache=True
+    ))
+    
+    steps = [step["step"] for step in result["workflow_steps"]]
+    assert "fused_generation" in steps
+    assert "visual_structure_design" not in steps
+    assert "VISUAL AIDS DESIGN PACKAGE" in result["content"]
+
+def test_fused_agents_must_compile_their_result():
+    class IncompleteAgent(FusedExecutionMixin, BaseEducationalAgent):
+        fused_sections = [("summary", "Summary")]
+        
+        def get_capabilities(self):
+            return {}
+        
+        def _build_graph(self):
+            return None
+    
+    with pytest.raises(TypeError, match="_compile_result"):
+        IncompleteAgent("Incomplete")
@@ -0,0 +1,46 @@
+import asyncio
+
+from agents.job_queue import JobQueue, JobStore, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED
+
+def test_recover_requeues_jobs_whose_lease_expired(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    now = [1000.0]
+    monkeypatch.setattr("agents.job_queue.time.time", lambda: now[0])
+    abandoned = store.create("visual-aids", {"prompt": "a"})
+    alive = store.create("visual-aids", {"prompt": "b"})
+    assert store.claim(abandoned) and store.claim(alive)
+    
+    now[0] += 50
+    store.heartbeat([alive])
+    now[0] += 20
+    pending = store.recover(lease_seconds=60)
+    
+    assert pending == [abandoned]
+    assert store.get(abandoned)["status"] == JOB_QUEUED
+    assert store.get(alive)["status"] == JOB_RUNNING
+
+def test_second_worker_finishes_a_job_abandoned_by_the_first(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("visual-aids", {"prompt": "Parts of a plant"})
+    # A worker claimed the job and then died without renewing its lease
+    assert store.claim_next() == job_id
+    
+    async def handler(agent_type, request):
+        return {"content": f"{agent_type}: {request['prompt']}"}
+    
+    async def scenario():
+        queue = JobQueue(store, workers=1, lease_seconds=0.3, poll_interval=0.05)
+        await queue.start(handler)
+        try:
+            for _ in range(100):
+                job = await queue.get(job_id)
+                if job["status"] == JOB_SUCCEEDED:
+                    return job
+                await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+    
+    job = asyncio.run(scenario())
+    
+    assert job["status"] == JOB_SUCCEEDED
+    assert job["attempts"] == 2
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from agents.llm_resilience import LLMCallPolicy, HedgeBudget, is_transient_error
+from agents.llm_scheduler import LLMScheduler, RateLimitExceeded
+
+class ServiceUnavailable(Exception):
+    pass
+
+class ClientError(Exception):
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+def test_transient_errors_are_retried():
+    async def scenario():
+        policy = LLMCallPolicy(max_retries=2, base_delay=0.001, max_delay=0.001)
+        calls = []
+        
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ServiceUnavailable("503 backend unavailable")
+            return "ok"
+        
+        assert await policy.call(flaky) == "ok"
+        assert len(calls) == 3
+    
+    asyncio.run(scenario())
+
+def test_non_transient_errors_are_not_retried():
+    async def scenario():
+        policy = LLMCallPolicy(max_retries=2, base_delay=0.001, max_delay=0.001)
+        calls = []
+        
+        async def invalid():
+            calls.append(1)
+            raise ClientError("max_output_tokens 1500 exceeds the model limit", code=400)
+        
+        with pytest.raises(ClientError):
+            await policy.call(invalid)
+        assert len(calls) == 1
+        # A local capacity rejection is not retried either
+        assert not is_transient_error(RateLimitExceeded("queue full"))
+    
+    asyncio.run(scenario())
+
+def test_status_codes_match_attributes_and_whole_words():
+    assert is_transient_error(ClientError("quota", code=429))
+    assert not is_transient_error(ClientError("503 in the message but 404 on the error", code=404))
+    assert is_transient_error(Exception("HTTP 502 Bad Gateway"))
+    assert not is_transient_error(Exception("prompt of 1500 tokens rejected"))
+    assert not is_transient_error(Exception("invalid field 4290"))
+
+def test_backoff_respects_retry_after():
+    policy = LLMCallPolicy(base_delay=0.01, max_delay=8.0)
+    throttled = RateLimitExceeded("429 from Gemini", retry_after=3.0, upstream=True)
+    assert all(policy._backoff(0, throttled) >= 3.0 for _ in range(20))
+    # Retry-After is still capped by max_delay
+    long_wait = RateLimitExceeded("429 from Gemini", retry_after=60.0, upstream=True)
+    assert policy._backoff(0, long_wait) == 8.0
+    assert all(policy._backoff(0, ServiceUnavailable()) <= 0.01 for _ in range(20))
+
+def test_hedge_fires_after_percentile_and_cancels_loser():
+    async def scenario():
+        policy = LLMCallPolicy(hedge_enabled=True, hedge_percentile=0.95, hedge_budget=1.0, hedge_min_samples=5)
+        for _ in range(10):
+            policy._tracker("model").record(0.01)
+        started = []
+        cancelled = []
+        
+        async def call():
+            index = len(started)
+            started.append(index)
+            try:
+                # The primary stalls; the hedge answers quickly
+                await asyncio.sleep(5 if index == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return f"call-{index}"
+        
+        assert await asyncio.wait_for(policy.call(call, "model"), 1) == "call-1"
+        await asyncio.sleep(0)
+        assert started == [0, 1]
+        assert cancelled == [0]
+    
+    asyncio.run(scenario())
+
+def test_hedge_budget_refuses_hedges_above_ratio():
+    budget = HedgeBudget(ratio=0.1)
+    for _ in range(10):
+        budget.record_call()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    for _ in range(10):
+        budget.record_call()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+def test_scheduler_queue_time_is_not_counted_as_latency():
+    async def scenario():
+        scheduler = LLMScheduler(initial_concurrency=1, max_concurrency=1)
+        policy = LLMCallPolicy()
+        held = await scheduler.acquire(10)
+        
+        async def fast():
+            return "ok"
+        
+        async def release_later():
+            await asyncio.sleep(0.2)
+            scheduler._release(held)
+        
+        releaser = asyncio.create_task(release_later())
+        assert await policy.call(fast, "model", admit=lambda upstream: scheduler.run(upstream, 10)) == "ok"
+        await releaser
+        assert policy._tracker("model").percentile(1.0) < 0.1
+    
+    asyncio.run(scenario())
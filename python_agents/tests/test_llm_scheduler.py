@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from agents.llm_scheduler import (
+    LLMScheduler, SharedBudget, RateLimitExceeded, prioritized, is_rate_limit_error,
+    PRIORITY_INTERACTIVE, PRIORITY_BULK
+)
+from agents.shared_state import InProcessBackend
+
+class Throttled(Exception):
+    pass
+
+def test_interactive_calls_are_admitted_before_bulk_calls():
+    async def scenario():
+        scheduler = LLMScheduler(initial_concurrency=1, max_concurrency=1)
+        held = await scheduler.acquire(10)
+        order = []
+        
+        async def queued(name, priority):
+            with prioritized(priority):
+                entry = await scheduler.acquire(10)
+            order.append(name)
+            scheduler._release(entry)
+        
+        bulk = asyncio.create_task(queued("bulk", PRIORITY_BULK))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(queued("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        scheduler._release(held)
+        await asyncio.gather(bulk, interactive)
+        return order
+    
+    assert asyncio.run(scenario()) == ["interactive", "bulk"]
+
+def test_throttling_halves_the_limit_and_success_grows_it_additively():
+    scheduler = LLMScheduler(initial_concurrency=8, min_concurrency=1, max_concurrency=64, target_latency=30)
+    
+    scheduler._on_throttled()
+    assert scheduler.limit == 4
+    scheduler._on_success(1.0)
+    assert scheduler.limit == pytest.approx(4.25)
+    # Slow answers back off gently instead of halving
+    scheduler._on_success(45.0)
+    assert scheduler.limit == pytest.approx(4.25 * 0.9)
+    
+    for _ in range(10):
+        scheduler._on_throttled()
+    assert scheduler.limit == 1
+
+def test_upstream_rate_limit_is_surfaced_and_counted():
+    async def scenario():
+        scheduler = LLMScheduler(initial_concurrency=4)
+        
+        async def call():
+            raise Throttled("429 RESOURCE_EXHAUSTED")
+        
+        with pytest.raises(RateLimitExceeded) as raised:
+            await scheduler.run(call, 10)
+        return scheduler, raised.value
+    
+    scheduler, error = asyncio.run(scenario())
+    
+    assert error.upstream
+    assert scheduler.limit == 2
+    assert scheduler.stats()["in_flight"] == 0
+
+def test_requests_over_the_rpm_budget_wait_then_time_out():
+    async def scenario():
+        scheduler = LLMScheduler(requests_per_minute=2, max_queue_wait=0.05)
+        for _ in range(2):
+            scheduler._release(await scheduler.acquire(10))
+        with pytest.raises(RateLimitExceeded):
+            await scheduler.acquire(10)
+        return scheduler.stats()
+    
+    stats = asyncio.run(scenario())
+    
+    assert stats["requests_last_minute"] == 2
+    assert stats["rejected"] == 1
+
+def test_shared_budget_refuses_calls_past_the_per_minute_limit():
+    budget = SharedBudget(InProcessBackend(), requests_per_minute=2, tokens_per_minute=0)
+    
+    assert budget._try_reserve(10) == 0
+    assert budget._try_reserve(10) == 0
+    assert budget._try_reserve(10) > 0
+    assert budget.stats()["requests_this_minute"] == 2
+
+def test_rate_limits_are_recognised_by_status_not_stray_digits():
+    class ClientError(Exception):
+        def __init__(self, message, code):
+            super().__init__(message)
+            self.code = code
+    
+    assert is_rate_limit_error(ClientError("quota exhausted", code=429))
+    assert not is_rate_limit_error(ClientError("429 quoted in a 400 response", code=400))
+    assert is_rate_limit_error(Exception("HTTP 429 Too Many Requests"))
+    assert not is_rate_limit_error(Exception("prompt of 14290 tokens is too long"))
@@ -0,0 +1,56 @@
+import sqlite3
+
+from agents import llm_store as store_module
+from agents.llm_store import LLMResponseStore
+
+def make_store(tmp_path, **kwargs):
+    return LLMResponseStore(path=str(tmp_path / "store.sqlite3"), **kwargs)
+
+def last_access(store, key):
+    return store._connect().execute("SELECT last_access FROM completions WHERE key = ?", (key,)).fetchone()[0]
+
+def test_expired_completions_are_not_served(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(store_module.time, "time", lambda: now[0])
+    store = make_store(tmp_path, ttl_seconds=60)
+    store.put("a", "model", "answer")
+    
+    now[0] += 59
+    assert store.get("a") == "answer"
+    now[0] += 2
+    assert store.get("a") is None
+    
+    assert store.compact() == 1
+    assert store.stats()["entries"] == 0
+
+def test_hits_only_refresh_last_access_after_touch_interval(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(store_module.time, "time", lambda: now[0])
+    store = make_store(tmp_path, ttl_seconds=0, touch_interval=300)
+    store.put("a", "model", "answer")
+    
+    now[0] += 100
+    store.get("a")
+    assert last_access(store, "a") == 1000.0
+    
+    now[0] += 250
+    store.get("a")
+    assert last_access(store, "a") == 1350.0
+
+def test_clear_removes_every_completion(tmp_path):
+    store = make_store(tmp_path)
+    store.put("a", "model", "one")
+    store.put("b", "model", "two")
+    
+    assert store.clear() == 2
+    assert store.get("a") is None
+
+def test_existing_database_is_converted_to_incremental_vacuum(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE placeholder (id INTEGER)")
+    connection.close()
+    
+    store = LLMResponseStore(path=str(path))
+    
+    assert store._connect().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+from agents.content_generator import ContentGeneratorAgent
+from agents.lesson_planner import LessonPlannerAgent
+from agents.response_cache import get_node_memo
+
+def memoized_steps(result):
+    return {step["step"] for step in result["workflow_steps"] if step.get("memoized")}
+
+def test_curriculum_analysis_is_reused_across_lesson_durations():
+    get_node_memo().clear()
+    agent = LessonPlannerAgent()
+    
+    async def scenario():
+        await agent.create_lesson_plan(topic="Photosynthesis", grades=[6], duration="40 minutes")
+        return await agent.create_lesson_plan(topic="Photosynthesis", grades=[6], duration="90 minutes")
+    
+    result = asyncio.run(scenario())
+    
+    assert memoized_steps(result) == {"curriculum_analysis"}
+    assert result["metadata"]["duration"] == "90 minutes"
+
+def test_curriculum_analysis_is_not_shared_between_free_form_prompts():
+    get_node_memo().clear()
+    agent = LessonPlannerAgent()
+    
+    async def scenario():
+        await agent.process("Plan a lesson on fractions", grades=[4])
+        return await agent.process("Plan a lesson on decimals", grades=[4])
+    
+    assert memoized_steps(asyncio.run(scenario())) == set()
+
+def test_cultural_analysis_is_not_shared_between_languages():
+    get_node_memo().clear()
+    agent = ContentGeneratorAgent()
+    
+    async def scenario():
+        await agent.process("Monsoon and farming", grades=[5], languages=["Hindi"])
+        return await agent.process("Monsoon and farming", grades=[5], languages=["Tamil"])
+    
+    assert memoized_steps(asyncio.run(scenario())) == set()
+
+def test_cultural_analysis_is_reused_across_downstream_parameters():
+    get_node_memo().clear()
+    agent = ContentGeneratorAgent()
+    
+    async def scenario():
+        await agent.process("Monsoon and farming", grades=[5], languages=["Hindi"], metadata={"tone": "story"})
+        return await agent.process("Monsoon and farming", grades=[5], languages=["Hindi"], metadata={"tone": "formal"})
+    
+    assert memoized_steps(asyncio.run(scenario())) == {"cultural_analysis"}
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from main import app, project_response, ResponseOptions, RESPONSE_METADATA_KEYS
+
+RESULT = {
+    "content": "Final answer",
+    "metadata": {"agent_name": "Visual Aids Designer", "grades": [5], "visual_analysis": "long", "visual_structure": "long"},
+    "workflow_steps": []
+}
+
+def test_full_projection_returns_the_result_unchanged():
+    assert project_response(RESULT, ResponseOptions()) is RESULT
+    assert project_response(RESULT, None) is RESULT
+
+def test_content_projection_keeps_only_request_metadata():
+    projected = project_response(RESULT, ResponseOptions(projection="content"))
+    
+    assert projected["metadata"] == {"agent_name": "Visual Aids Designer", "grades": [5]}
+    assert projected["content"] == "Final answer"
+    # The cached result itself is left intact
+    assert "visual_analysis" in RESULT["metadata"]
+
+def test_selected_projection_adds_requested_keys():
+    options = ResponseOptions(projection="selected", include_metadata=["visual_structure", "missing"])
+    
+    assert set(project_response(RESULT, options)["metadata"]) == {"agent_name", "grades", "visual_structure"}
+
+def test_generate_endpoint_applies_the_projection():
+    with TestClient(app) as client:
+        response = client.post("/agents/visual-aids/generate", json={
+            "prompt": "Parts of a plant", "grades": [4], "projection": "content"
+        })
+    
+    assert response.status_code == 200
+    assert set(response.json()["metadata"]) <= set(RESPONSE_METADATA_KEYS)
+    assert response.json()["content"]
@@ -0,0 +1,50 @@
+from agents import response_cache as cache_module
+from agents.response_cache import InMemoryResponseCache, make_cache_key
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = InMemoryResponseCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", {"content": "A"})
+    cache.set("b", {"content": "B"})
+    
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == {"content": "A"}
+    cache.set("c", {"content": "C"})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"content": "A"}
+    assert cache.get("c") == {"content": "C"}
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = InMemoryResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", {"content": "A"})
+    
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+    
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+def test_cached_responses_are_copies():
+    cache = InMemoryResponseCache()
+    cache.set("a", {"metadata": {"grades": [5]}})
+    
+    cache.get("a")["metadata"]["grades"].append(6)
+    
+    assert cache.get("a") == {"metadata": {"grades": [5]}}
+
+def test_cache_key_ignores_formatting_and_caller_metadata():
+    first = make_cache_key("content-generation", "  Water   Cycle ", [6, 5], ["Hindi", "English"], "prebook",
+                           {"request_id": "1"})
+    second = make_cache_key("content-generation", "water cycle", [5, 6], ["English", "Hindi"], "PREBOOK",
+                            {"request_id": "2"})
+    other = make_cache_key("content-generation", "water cycle", [5, 6], ["English", "Hindi"], "prebook",
+                           {"duration": "40 minutes"})
+    
+    assert first == second
+    assert first != other
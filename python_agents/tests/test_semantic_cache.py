@@ -0,0 +1,42 @@
+import pytest
+
+from agents.semantic_cache import SemanticCache
+
+def answer(text):
+    return {"content": text, "metadata": {}}
+
+def test_rephrased_question_is_a_hit():
+    cache = SemanticCache()
+    cache.store("What is photosynthesis?", [6], ["English"], answer("Plants make food"))
+    
+    cached = cache.lookup("Explain photosynthesis", [6], ["English"])
+    
+    assert cached["content"] == "Plants make food"
+    assert cached["metadata"]["semantic_cache"]["matched_question"] == "What is photosynthesis?"
+
+@pytest.mark.parametrize("stored, asked", [
+    ("Explain the causes of World War 1", "Explain the causes of World War 2"),
+    ("How many bones are there in the adult human body", "How many muscles are there in the adult human body"),
+])
+def test_near_miss_questions_are_not_served(stored, asked):
+    # A permissive threshold shows the key-term check, not the threshold, rejects these
+    cache = SemanticCache(default_threshold=0.5)
+    cache.store(stored, [8], ["English"], answer(stored))
+    
+    assert cache.lookup(asked, [8], ["English"]) is None
+    assert cache.stats()["misses"] == 1
+
+def test_near_miss_skips_to_matching_neighbour():
+    cache = SemanticCache(default_threshold=0.5)
+    cache.store("Explain the causes of World War 2", [8], ["English"], answer("WW2"))
+    cache.store("Explain the causes of World War 1", [8], ["English"], answer("WW1"))
+    
+    assert cache.lookup("What were the causes of World War 2?", [8], ["English"])["content"] == "WW2"
+
+def test_grade_order_selects_the_partition():
+    cache = SemanticCache()
+    cache.store("What is photosynthesis?", [5, 8], ["English"], answer("Grade 5 answer"))
+    
+    # Answers are written for the first grade, so [8, 5] must not reuse the grade 5 answer
+    assert cache.lookup("What is photosynthesis?", [8, 5], ["English"]) is None
+    assert cache.lookup("What is photosynthesis?", [5, 8], ["English"]) is not None
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from agents.response_cache import SharedResponseCache
+from agents.shared_state import InProcessBackend, SqliteBackend
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SqliteBackend(str(tmp_path / "shared.sqlite3"))
+    return InProcessBackend()
+
+def test_shared_cache_is_bounded_across_workers(backend):
+    # Two caches on one backend stand in for two worker processes
+    first = SharedResponseCache(backend, "response:", max_entries=3, touch_interval=0)
+    second = SharedResponseCache(backend, "response:", max_entries=3, touch_interval=0)
+    for index in range(3):
+        first.set(f"first-{index}", {"content": index})
+    first.get("first-0")
+    second.set("second-0", {"content": "s"})
+    
+    assert first.get("first-1") is None
+    assert first.get("first-0") == {"content": 0}
+    assert first.stats()["entries"] == 3
+    assert second.stats()["evictions"] == 1
+
+def test_hits_refresh_recency_only_after_touch_interval(backend):
+    cache = SharedResponseCache(backend, "memo:", max_entries=2, touch_interval=3600)
+    cache.set("a", {"content": "A"})
+    cache.set("b", {"content": "B"})
+    # Within the touch interval a hit does not write, so "a" stays the oldest entry
+    cache.get("a")
+    cache.set("c", {"content": "C"})
+    
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+def test_clear_drops_entries_and_the_recency_index(backend):
+    cache = SharedResponseCache(backend, "response:", max_entries=5)
+    cache.set("a", {"content": "A"})
+    other = SharedResponseCache(backend, "node_memo:", max_entries=5)
+    other.set("a", {"content": "memo"})
+    
+    cache.clear()
+    
+    assert cache.stats()["entries"] == 0
+    assert other.get("a") == {"content": "memo"}
+
+def test_async_access_runs_off_the_event_loop(backend, monkeypatch):
+    cache = SharedResponseCache(backend, "response:", max_entries=5)
+    offloaded = []
+    to_thread = asyncio.to_thread
+    
+    async def recording_to_thread(func, *args):
+        offloaded.append(func.__name__)
+        return await to_thread(func, *args)
+    
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    
+    async def scenario():
+        await cache.aset("a", {"content": "A"})
+        return await cache.aget("a")
+    
+    assert asyncio.run(scenario()) == {"content": "A"}
+    assert offloaded == ["set", "get"]
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from agents.single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"items": [1]}
+        
+        first, second = await asyncio.gather(flight.do("k", work), flight.do("k", work))
+        first["items"].append(2)
+        return calls, first, second, flight.stats()
+    
+    calls, first, second, stats = asyncio.run(scenario())
+    
+    assert len(calls) == 1
+    assert second == {"items": [1]}
+    assert stats == {"in_flight": 0, "executions": 1, "coalesced": 1}
+
+def test_cancelling_one_waiter_keeps_the_shared_work_running():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        
+        async def work():
+            await release.wait()
+            return "done"
+        
+        leaving = asyncio.create_task(flight.do("k", work))
+        staying = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leaving, await staying
+    
+    leaving, result = asyncio.run(scenario())
+    
+    assert leaving.cancelled()
+    assert result == "done"
+
+def test_cancelling_the_last_waiter_cancels_the_work():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = []
+        
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        
+        caller = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return cancelled, flight.stats()
+    
+    cancelled, stats = asyncio.run(scenario())
+    
+    assert cancelled == [True]
+    assert stats["in_flight"] == 0
+
+def test_a_new_caller_after_cancellation_starts_fresh_work():
+    async def scenario():
+        flight = SingleFlight()
+        runs = []
+        
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return len(runs)
+        
+        caller = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+        return await flight.do("k", work)
+    
+    assert asyncio.run(scenario()) == 2
@@ -0,0 +1,33 @@
+import asyncio
+
+from agents.base_agent import merge_workflow_steps
+from agents.lesson_planner import LessonPlannerAgent
+
+def test_merge_keeps_identical_steps_from_different_branches():
+    history = [{"id": "initialize:0", "step": "initialize", "status": "completed"}]
+    left = history + [{"id": "objectives:1", "step": "analysis", "status": "completed"}]
+    right = history + [{"id": "activities:1", "step": "analysis", "status": "completed"}]
+    
+    merged = merge_workflow_steps(left, right)
+    
+    assert [step["id"] for step in merged] == ["initialize:0", "objectives:1", "activities:1"]
+
+def test_merge_does_not_repeat_shared_history():
+    history = [{"id": f"node{index}:{index}", "step": "same"} for index in range(3)]
+    
+    assert merge_workflow_steps(history, list(history)) == history
+    assert merge_workflow_steps([], history) == history
+
+def test_parallel_lesson_plan_records_every_node_once():
+    agent = LessonPlannerAgent()
+    
+    result = asyncio.run(agent.create_lesson_plan(
+        topic="Fractions", grades=[4], duration="40 minutes", bypass_cache=True
+    ))
+    
+    ids = [step["id"] for step in result["workflow_steps"]]
+    assert len(ids) == len(set(ids))
+    # The three parallel branches all start from the same position
+    nodes = {step_id.split(":")[0]: int(step_id.split(":")[1]) for step_id in ids}
+    branches = ("assessment_planning", "differentiation_strategy", "resource_planning")
+    assert len({nodes[branch] for branch in branches}) == 1
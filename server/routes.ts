@@ -1,4 +1,4 @@
-import type { Express } from "express";
+import type { Express, Response as ExpressResponse } from "express";
 import { createServer, type Server } from "http";
 import { spawn } from "child_process";
 import multer from "multer";
@@ -22,16 +22,37 @@ import { NCERTScraper } from "./ncert-scraper";
 
 // Python LangGraph Agents API Configuration
 const PYTHON_AGENTS_URL = "http://localhost:8000";
+// Opt-in upstream timeout; unset or 0 waits as long as the agent takes, as before
+const PYTHON_AGENTS_TIMEOUT_MS = Number(process.env.PYTHON_AGENTS_TIMEOUT_MS || 0);
+
+// Abort the upstream request when our client goes away, so the Python agent stops its LLM work too
+function abortOnClientClose(res: ExpressResponse): AbortSignal {
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableFinished) {
+      controller.abort();
+    }
+  });
+  return controller.signal;
+}
 
 // Helper function to call Python agents
-async function callPythonAgent(endpoint: string, data: any) {
+async function callPythonAgent(endpoint: string, data: any, res?: ExpressResponse) {
   try {
+    const signals: AbortSignal[] = [];
+    if (PYTHON_AGENTS_TIMEOUT_MS > 0) {
+      signals.push(AbortSignal.timeout(PYTHON_AGENTS_TIMEOUT_MS));
+    }
+    if (res) {
+      signals.push(abortOnClientClose(res));
+    }
     const response = await fetch(`${PYTHON_AGENTS_URL}${endpoint}`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify(data)
+      body: JSON.stringify(data),
+      signal: signals.length ? AbortSignal.any(signals) : undefined
     });
     
     if (!response.ok) {
@@ -791,7 +812,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         metadata: metadata || {}
       };
 
-      const result = await callPythonAgent(`/agents/${agentType}/generate`, agentData);
+      const result = await callPythonAgent(`/agents/${agentType}/generate`, agentData, res);
       
       res.json(result);
     } catch (error) {
@@ -821,7 +842,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         content_source: contentSource || "prebook"
       };
 
-      const result = await callPythonAgent('/agents/lesson-planner/create-plan', planData);
+      const result = await callPythonAgent('/agents/lesson-planner/create-plan', planData, res);
       res.json(result);
     } catch (error) {
       console.error("Lesson planner error:", error);
@@ -848,7 +869,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         subject
       };
 
-      const result = await callPythonAgent('/agents/performance-analysis/analyze', analysisData);
+      const result = await callPythonAgent('/agents/performance-analysis/analyze', analysisData, res);
       res.json(result);
     } catch (error) {
       console.error("Performance analysis error:", error);
@@ -877,7 +898,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         metadata: metadata || {}
       };
 
-      const result = await callPythonAgent('/agents/master-chatbot/chat', chatData);
+      const result = await callPythonAgent('/agents/master-chatbot/chat', chatData, res);
       res.json(result);
     } catch (error) {
       console.error("Master chatbot error:", error);